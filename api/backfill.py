@@ -0,0 +1,262 @@
+# api/backfill.py
+"""
+TradeForge Historical Backfill
+------------------------------
+Downloads multi-year kline history by walking `startTime`/`endTime`
+windows of up to 1000 candles. Several windows are fetched at once on a
+thread pool that shares the request-weight budget, and every page is
+written straight to a columnar `.npz` chunk (int64 timestamps, float64
+OHLCV) without building per-candle dicts.
+
+A JSON checkpoint next to the chunks records finished windows by their
+(start, end) bounds, so an interrupted backfill resumes where it
+stopped. Windows reaching past the last closed candle (e.g. the tail of
+a run ending "now") are stored without their still-open candle and are
+not checkpointed; a later run refetches and overwrites them.
+
+Layout:
+    <out_dir>/<SYMBOL>_<interval>/<window_start_ms>.npz
+    <out_dir>/<SYMBOL>_<interval>/checkpoint.json
+
+Usage:
+    python -m api.backfill BTCUSDT 1h --start 2020-01-01 --end 2024-01-01
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from api import exchange_api
+from api.http_client import get_client
+from api.rate_limiter import WeightRateLimiter, klines_request_weight
+from utils.tradeforge_logger import setup_logger
+
+logger = setup_logger(__name__)
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_OUT_DIR = os.path.join(ROOT_DIR, "data", "backfill")
+DEFAULT_WORKERS = 4
+CHECKPOINT_FILE = "checkpoint.json"
+
+OHLCV_FIELDS = ("open", "high", "low", "close", "volume")
+
+INTERVAL_MS = {
+    "1m": 60_000, "3m": 180_000, "5m": 300_000, "15m": 900_000, "30m": 1_800_000,
+    "1h": 3_600_000, "2h": 7_200_000, "4h": 14_400_000, "6h": 21_600_000,
+    "8h": 28_800_000, "12h": 43_200_000, "1d": 86_400_000, "3d": 259_200_000,
+    "1w": 604_800_000,
+}
+
+# Shared by every backfill in this process
+rate_limiter = WeightRateLimiter()
+
+
+# -----------------------------------------------
+# Windows & Pages
+# -----------------------------------------------
+def to_epoch_ms(value) -> int:
+    """Accept epoch ms, datetime-like or date strings."""
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    return int(pd.Timestamp(value).as_unit("ms").value)
+
+
+def plan_windows(start_ms: int, end_ms: int, interval: str,
+                 limit: int = exchange_api.KLINES_MAX_LIMIT) -> list:
+    """Split [start_ms, end_ms) into (start, end) windows of `limit` candles each."""
+    step = INTERVAL_MS[interval]
+    span = step * limit
+    return [
+        (start, min(start + span, end_ms) - 1)
+        for start in range(start_ms, end_ms, span)
+    ]
+
+
+def fetch_klines_page(symbol: str, interval: str, start_ms: int, end_ms: int,
+                      limit: int = exchange_api.KLINES_MAX_LIMIT, client=None) -> dict:
+    """
+    Fetch one kline window and return it as typed column arrays.
+
+    Raises:
+        requests.exceptions.RequestException: On HTTP/network errors.
+    """
+    client = client or get_client()
+    response = client.get(
+        f"{exchange_api.BASE_URL}/api/v3/klines",
+        params={"symbol": symbol, "interval": interval, "limit": limit,
+                "startTime": start_ms, "endTime": end_ms},
+        timeout=10,
+    )
+    raw = response.json()
+
+    if not raw:
+        columns = {"timestamp": np.empty(0, dtype=np.int64)}
+        columns.update({f: np.empty(0, dtype=np.float64) for f in OHLCV_FIELDS})
+        return columns
+
+    # Kline rows: [open_time, "open", "high", "low", "close", "volume", ...]
+    timestamps = np.fromiter((row[0] for row in raw), dtype=np.int64, count=len(raw))
+    values = np.array([row[1:6] for row in raw]).astype(np.float64)
+    columns = {"timestamp": timestamps}
+    columns.update({f: values[:, i] for i, f in enumerate(OHLCV_FIELDS)})
+    return columns
+
+
+# -----------------------------------------------
+# Checkpoint & Storage
+# -----------------------------------------------
+def _series_dir(out_dir: str, symbol: str, interval: str) -> str:
+    return os.path.join(out_dir, f"{symbol.upper()}_{interval}")
+
+
+def load_checkpoint(series_dir: str) -> set:
+    """
+    Return the set of finished (start, end) windows.
+
+    Entries of the older start-only format are ignored (their end is
+    unknown), so those windows are fetched once more.
+    """
+    path = os.path.join(series_dir, CHECKPOINT_FILE)
+    if not os.path.exists(path):
+        return set()
+    with open(path, "r") as f:
+        return {tuple(w) for w in json.load(f).get("done", []) if isinstance(w, list) and len(w) == 2}
+
+
+def save_checkpoint(series_dir: str, done: set) -> None:
+    """Write the checkpoint atomically (temp file + rename)."""
+    path = os.path.join(series_dir, CHECKPOINT_FILE)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"done": [list(w) for w in sorted(done)]}, f)
+    os.replace(tmp, path)
+
+
+def _write_chunk(series_dir: str, window_start: int, columns: dict) -> None:
+    path = os.path.join(series_dir, f"{window_start}.npz")
+    tmp = path + ".tmp.npz"
+    np.savez(tmp, **columns)
+    os.replace(tmp, path)
+
+
+def load_backfill(symbol: str, interval: str, out_dir: str = DEFAULT_OUT_DIR) -> pd.DataFrame:
+    """Concatenate all chunks of a series into one DataFrame, sorted and de-duplicated."""
+    series_dir = _series_dir(out_dir, symbol, interval)
+    if not os.path.isdir(series_dir):
+        return pd.DataFrame()
+
+    chunks = []
+    for name in sorted(os.listdir(series_dir)):
+        if name.endswith(".npz") and not name.endswith(".tmp.npz"):
+            with np.load(os.path.join(series_dir, name)) as chunk:
+                chunks.append({k: chunk[k] for k in ("timestamp",) + OHLCV_FIELDS})
+    if not chunks:
+        return pd.DataFrame()
+
+    data = {k: np.concatenate([c[k] for c in chunks]) for k in ("timestamp",) + OHLCV_FIELDS}
+    order = np.argsort(data["timestamp"], kind="stable")
+    df = pd.DataFrame({k: v[order] for k, v in data.items()})
+    df = df.drop_duplicates("timestamp", keep="last").reset_index(drop=True)
+    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
+    return df
+
+
+# -----------------------------------------------
+# Backfill API
+# -----------------------------------------------
+def backfill_ohlcv(symbol: str, interval: str, start, end=None,
+                   out_dir: str = DEFAULT_OUT_DIR, max_workers: int = DEFAULT_WORKERS,
+                   limit: int = exchange_api.KLINES_MAX_LIMIT, limiter: WeightRateLimiter = None) -> dict:
+    """
+    Download [start, end) for one symbol/interval into columnar chunks.
+
+    Parameters:
+        start, end: Epoch ms or datetime-like (end defaults to now).
+        out_dir (str): Root folder for chunks and the checkpoint.
+        max_workers (int): Pages fetched concurrently.
+        limit (int): Candles per window (max 1000).
+        limiter (WeightRateLimiter): Weight budget (defaults to the module one).
+
+    Returns:
+        dict: {'windows', 'skipped', 'fetched', 'failed', 'candles'}
+    """
+    if interval not in INTERVAL_MS:
+        raise ValueError(f"Unsupported interval: {interval}")
+
+    limiter = limiter or rate_limiter
+    start_ms = to_epoch_ms(start)
+    end_ms = to_epoch_ms(end) if end is not None else int(time.time() * 1000)
+
+    series_dir = _series_dir(out_dir, symbol, interval)
+    os.makedirs(series_dir, exist_ok=True)
+
+    windows = plan_windows(start_ms, end_ms, interval, limit)
+    done = load_checkpoint(series_dir)
+    pending = [w for w in windows if w not in done]
+    # Open time of the first candle that has not closed yet
+    open_candle_ms = (int(time.time() * 1000) // INTERVAL_MS[interval]) * INTERVAL_MS[interval]
+    summary = {"windows": len(windows), "skipped": len(windows) - len(pending),
+               "fetched": 0, "failed": 0, "candles": 0}
+
+    weight = klines_request_weight(limit)
+
+    def fetch_window(window):
+        limiter.acquire(weight)
+        return fetch_klines_page(symbol, interval, window[0], window[1], limit)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        futures = {pool.submit(fetch_window, w): w for w in pending}
+        for future in as_completed(futures):
+            window = futures[future]
+            try:
+                columns = future.result()
+            except Exception as e:
+                summary["failed"] += 1
+                logger.error(f"Backfill page failed for {symbol} [{interval}] @ {window[0]}: {e}")
+                continue
+
+            closed = columns["timestamp"] < open_candle_ms
+            if not closed.all():
+                columns = {k: v[closed] for k, v in columns.items()}
+            if len(columns["timestamp"]):
+                _write_chunk(series_dir, window[0], columns)
+            if window[1] < open_candle_ms:
+                done.add(window)
+                save_checkpoint(series_dir, done)
+            summary["fetched"] += 1
+            summary["candles"] += len(columns["timestamp"])
+
+    logger.info(
+        f"Backfill {symbol} [{interval}]: {summary['fetched']} pages, "
+        f"{summary['candles']} candles, {summary['skipped']} resumed, {summary['failed']} failed"
+    )
+    return summary
+
+
+# -----------------------------------------------
+# CLI
+# -----------------------------------------------
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Backfill historical klines to columnar chunks.")
+    parser.add_argument("symbol")
+    parser.add_argument("interval", choices=sorted(INTERVAL_MS))
+    parser.add_argument("--start", required=True, help="Start date or epoch ms")
+    parser.add_argument("--end", default=None, help="End date or epoch ms (default: now)")
+    parser.add_argument("--out", default=DEFAULT_OUT_DIR)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    args = parser.parse_args(argv)
+
+    start = int(args.start) if args.start.isdigit() else args.start
+    end = int(args.end) if args.end and args.end.isdigit() else args.end
+    summary = backfill_ohlcv(args.symbol.upper(), args.interval, start, end,
+                             out_dir=args.out, max_workers=args.workers)
+    print(f"[✔] {summary}")
+
+
+if __name__ == "__main__":
+    main()
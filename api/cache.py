@@ -0,0 +1,178 @@
+# api/cache.py
+"""
+TradeForge Exchange Cache
+-------------------------
+Two-tier TTL cache for exchange REST responses:
+
+1. In-process LRU (bounded, per key TTL) - serves Streamlit reruns instantly.
+2. Optional on-disk JSON snapshot - survives restarts, so a fresh process
+   does not re-download `exchangeInfo` while the snapshot is still valid.
+
+TTLs per kind ("exchange_info", "ticker_price", "klines") come from
+DEFAULT_TTLS, overridable in config/cache.json, e.g. {"ticker_price": 2}.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+CACHE_CONFIG_PATH = os.path.join(ROOT_DIR, "config", "cache.json")
+DEFAULT_DISK_DIR = os.path.join(ROOT_DIR, "data", "cache")
+DEFAULT_MAXSIZE = 512
+
+# Seconds
+DEFAULT_TTLS = {
+    "exchange_info": 3600,
+    "ticker_price": 5,
+    "klines": 30,
+}
+
+
+def load_cache_ttls(path: str = CACHE_CONFIG_PATH) -> dict:
+    """DEFAULT_TTLS merged with config/cache.json (if present)."""
+    ttls = dict(DEFAULT_TTLS)
+    if os.path.exists(path):
+        try:
+            with open(path, "r") as f:
+                ttls.update({k: float(v) for k, v in json.load(f).items()})
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"[CACHE CONFIG ERROR] Could not read {path}: {e}")
+    return ttls
+
+
+class TTLCache:
+    """Thread-safe LRU with per-entry expiry and an optional JSON disk tier."""
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE, disk_dir: str = None, clock=time.time):
+        self.maxsize = maxsize
+        self.disk_dir = disk_dir
+        self._clock = clock
+        self._entries = OrderedDict()   # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # ── Disk tier ───────────────────────────────────────────────
+    def _disk_path(self, key: str) -> str:
+        readable = re.sub(r"[^A-Za-z0-9_.-]+", "_", key)[:60]
+        digest = hashlib.sha1(key.encode()).hexdigest()[:12]
+        return os.path.join(self.disk_dir, f"{readable}-{digest}.json")
+
+    def _read_disk(self, key: str):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("key") != key or entry.get("expires_at", 0) <= self._clock():
+            return None
+        return entry["expires_at"], entry["value"]
+
+    def _write_disk(self, key: str, expires_at: float, value) -> None:
+        os.makedirs(self.disk_dir, exist_ok=True)
+        path = self._disk_path(key)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"key": key, "expires_at": expires_at, "value": value}, f)
+        os.replace(tmp, path)
+
+    # ── Public API ──────────────────────────────────────────────
+    def get(self, key: str, default=None):
+        """Return a live value from memory, then disk; `default` if missing/expired."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+
+        entry = self._read_disk(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._store(key, entry)
+        return entry[1]
+
+    def _store(self, key: str, entry: tuple) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def set(self, key: str, value, ttl: float, persist: bool = False) -> None:
+        """Cache `value` for `ttl` seconds; `persist` also writes the disk snapshot."""
+        expires_at = self._clock() + ttl
+        with self._lock:
+            self._store(key, (expires_at, value))
+        if persist and self.disk_dir:
+            self._write_disk(key, expires_at, value)
+
+    def get_or_load(self, key: str, loader, ttl: float, persist: bool = False):
+        """Return the cached value or call `loader()`; empty/None results are not cached."""
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value
+        value = loader()
+        if value:
+            self.set(key, value, ttl, persist)
+        return value
+
+    def invalidate(self, key: str = None, prefix: str = None) -> int:
+        """
+        Drop one key, every key starting with `prefix`, or (no args) everything,
+        from both tiers. Returns the number of in-memory entries removed.
+        """
+        with self._lock:
+            if key is None and prefix is None:
+                keys = list(self._entries)
+            elif key is not None:
+                keys = [key] if key in self._entries else []
+            else:
+                keys = [k for k in self._entries if k.startswith(prefix)]
+            for k in keys:
+                del self._entries[k]
+
+        if self.disk_dir and os.path.isdir(self.disk_dir):
+            if key is not None:
+                targets = [self._disk_path(key)]
+            else:
+                readable = re.sub(r"[^A-Za-z0-9_.-]+", "_", prefix or "")
+                targets = [
+                    os.path.join(self.disk_dir, name)
+                    for name in os.listdir(self.disk_dir)
+                    if name.endswith(".json") and name.startswith(readable)
+                ]
+            for path in targets:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+        return len(keys)
+
+
+# ────────────────────────────────────────────────────────────────
+# Shared exchange cache
+# ────────────────────────────────────────────────────────────────
+CACHE_TTLS = load_cache_ttls()
+exchange_cache = TTLCache(disk_dir=DEFAULT_DISK_DIR)
+
+
+def invalidate_exchange_cache(kind: str = None) -> int:
+    """Invalidate one kind ("exchange_info", "ticker_price", "klines") or everything."""
+    if kind is None:
+        return exchange_cache.invalidate()
+    return exchange_cache.invalidate(prefix=f"{kind}:")
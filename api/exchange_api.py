@@ -1,20 +1,34 @@
 # api/exchange_api.py
 
+import json
 import requests
+from api.cache import exchange_cache, CACHE_TTLS
+from api.http_client import get_client
 from utils.tradeforge_logger import setup_logger
 
 # Initialize logger for this module
 logger = setup_logger(__name__)
 
-def get_all_symbols():
+# REST endpoint (overridable, e.g. for a local stub server in tests)
+BASE_URL = "https://api.binance.com"
+KLINES_MAX_LIMIT = 1000
+
+def get_all_symbols(use_cache=True):
     """
     Fetch all available trading symbols from Binance exchange.
+    The symbol list is cached (memory + disk) for CACHE_TTLS["exchange_info"].
     Returns:
         list: A list of symbol strings (e.g., ['BTCUSDT', 'ETHUSDT'])
     """
-    url = "https://api.binance.com/api/v3/exchangeInfo"
+    if use_cache:
+        return exchange_cache.get_or_load(
+            "exchange_info:symbols", lambda: get_all_symbols(use_cache=False),
+            CACHE_TTLS["exchange_info"], persist=True
+        )
+
+    url = f"{BASE_URL}/api/v3/exchangeInfo"
     try:
-        response = requests.get(url, timeout=10)
+        response = get_client().get(url, timeout=10)
         response.raise_for_status()
         data = response.json()
         symbols = [s["symbol"] for s in data.get("symbols", [])]
@@ -24,40 +38,99 @@ def get_all_symbols():
         logger.error(f"Error fetching trading pairs: {e}")
         return []
 
-def get_current_price(symbol="BTCUSDT"):
+def get_current_price(symbol="BTCUSDT", use_cache=True):
     """
     Get the latest market price for the specified trading symbol.
     Parameters:
         symbol (str): Trading pair symbol (default is 'BTCUSDT').
+        use_cache (bool): Serve prices younger than CACHE_TTLS["ticker_price"].
     Returns:
         float or None: The latest price as a float, or None on failure.
     """
-    url = f"https://api.binance.com/api/v3/ticker/price?symbol={symbol}"
+    key = f"ticker_price:{symbol}"
+    if use_cache:
+        cached = exchange_cache.get(key)
+        if cached is not None:
+            return cached
+
+    url = f"{BASE_URL}/api/v3/ticker/price?symbol={symbol}"
     try:
-        response = requests.get(url, timeout=10)
+        response = get_client().get(url, timeout=10)
         response.raise_for_status()
         price = float(response.json().get("price"))
+        exchange_cache.set(key, price, CACHE_TTLS["ticker_price"])
         logger.info(f"Fetched current price for {symbol}: {price}")
         return price
     except (requests.exceptions.RequestException, ValueError, TypeError) as e:
         logger.error(f"Error fetching current price for {symbol}: {e}")
         return None
 
-def fetch_ohlcv(symbol="BTCUSDT", interval="1m", limit=100):
+def get_current_prices(symbols, use_cache=True):
+    """
+    Get latest prices for several symbols with one multi-symbol ticker request.
+    Parameters:
+        symbols (list): Trading pair symbols.
+        use_cache (bool): Only request symbols without a fresh cached price.
+    Returns:
+        dict: {symbol: price}; symbols that could not be fetched are omitted.
+    """
+    prices = {}
+    missing = []
+    for symbol in dict.fromkeys(symbols):
+        cached = exchange_cache.get(f"ticker_price:{symbol}") if use_cache else None
+        if cached is not None:
+            prices[symbol] = cached
+        else:
+            missing.append(symbol)
+
+    if not missing:
+        return prices
+
+    url = f"{BASE_URL}/api/v3/ticker/price"
+    params = {"symbols": json.dumps(missing, separators=(",", ":"))}
+    try:
+        response = get_client().get(url, params=params, timeout=10)
+        response.raise_for_status()
+        for item in response.json():
+            price = float(item["price"])
+            prices[item["symbol"]] = price
+            exchange_cache.set(f"ticker_price:{item['symbol']}", price, CACHE_TTLS["ticker_price"])
+        logger.info(f"Fetched {len(missing)} prices in one request")
+    except (requests.exceptions.RequestException, ValueError, TypeError, KeyError) as e:
+        logger.error(f"Error fetching prices for {missing}: {e}")
+    return prices
+
+def fetch_ohlcv(symbol="BTCUSDT", interval="1m", limit=100, start_time=None, end_time=None,
+                use_cache=False):
     """
     Fetch historical OHLCV (Open, High, Low, Close, Volume) candlestick data from Binance.
     Parameters:
         symbol (str): Trading pair (e.g., 'BTCUSDT').
         interval (str): Timeframe interval (e.g., '1m', '5m', '1h').
-        limit (int): Number of candlesticks to fetch.
+        limit (int): Number of candlesticks to fetch (max 1000).
+        start_time (int): Optional epoch-ms open time of the first candle.
+        end_time (int): Optional epoch-ms upper bound for candle open times.
+        use_cache (bool): Reuse the latest-candles response for CACHE_TTLS["klines"]
+            (only applies without start_time/end_time).
     Returns:
         list of dict: OHLCV data in dictionary format with timestamps.
     """
-    url = "https://api.binance.com/api/v3/klines"
+    if use_cache and start_time is None and end_time is None:
+        return exchange_cache.get_or_load(
+            f"klines:{symbol}:{interval}:{limit}",
+            lambda: fetch_ohlcv(symbol, interval, limit),
+            CACHE_TTLS["klines"]
+        )
+
+    url = f"{BASE_URL}/api/v3/klines"
     params = {"symbol": symbol, "interval": interval, "limit": limit}
+    if start_time is not None:
+        params["startTime"] = int(start_time)
+    if end_time is not None:
+        params["endTime"] = int(end_time)
 
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = get_client().get(url, params=params, timeout=10)
         response.raise_for_status()
         raw_data = response.json()
 
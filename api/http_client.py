@@ -0,0 +1,201 @@
+# api/http_client.py
+"""
+TradeForge Exchange HTTP Client
+-------------------------------
+One shared, thread-safe client for all exchange REST calls:
+
+- keep-alive connection pooling (no TCP+TLS handshake per request)
+- exponential backoff with jitter on 429 / 418 / 5xx and connection errors,
+  honouring the `Retry-After` header when the exchange sends one
+- tracking of the `X-MBX-USED-WEIGHT-1M` header so callers are throttled
+  before the exchange starts returning 429s (and eventually 418 IP bans)
+- per-endpoint latency statistics
+"""
+
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.tradeforge_logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# ────────────────────────────────────────────────────────────────
+# Configuration
+# ────────────────────────────────────────────────────────────────
+DEFAULT_POOL_SIZE = 32
+DEFAULT_TIMEOUT_S = 10
+DEFAULT_MAX_RETRIES = 5
+BACKOFF_BASE_S = 0.5
+BACKOFF_MAX_S = 30.0
+
+RETRY_STATUSES = {418, 429, 500, 502, 503, 504}
+WEIGHT_HEADERS = ("X-MBX-USED-WEIGHT-1M", "X-MBX-USED-WEIGHT")
+WEIGHT_LIMIT_1M = 1200
+THROTTLE_RATIO = 0.9      # start pausing at 90% of the minute budget
+
+
+class EndpointStats:
+    """Running latency counters for one endpoint path."""
+
+    __slots__ = ("count", "errors", "total_ms", "max_ms", "last_ms")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_ms = 0.0
+
+    def record(self, elapsed_ms: float, ok: bool) -> None:
+        self.count += 1
+        self.errors += 0 if ok else 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.last_ms = elapsed_ms
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            "max_ms": self.max_ms,
+            "last_ms": self.last_ms,
+        }
+
+
+class ExchangeClient:
+    """Pooled, retrying, weight-aware HTTP client."""
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, timeout: float = DEFAULT_TIMEOUT_S,
+                 max_retries: int = DEFAULT_MAX_RETRIES, backoff_base: float = BACKOFF_BASE_S,
+                 backoff_max: float = BACKOFF_MAX_S, weight_limit: int = WEIGHT_LIMIT_1M,
+                 throttle_ratio: float = THROTTLE_RATIO, clock=time.time, sleep=time.sleep):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.weight_limit = weight_limit
+        self.throttle_ratio = throttle_ratio
+        self._clock = clock
+        self._sleep = sleep
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._lock = threading.Lock()
+        self._used_weight = 0
+        self._weight_minute = None
+        self._stats = {}
+
+    # ── Weight tracking ─────────────────────────────────────────
+    @property
+    def used_weight(self) -> int:
+        """Last reported request weight for the current minute (0 once it rolls over)."""
+        with self._lock:
+            if self._weight_minute != int(self._clock() // 60):
+                return 0
+            return self._used_weight
+
+    def _update_weight(self, response) -> None:
+        for header in WEIGHT_HEADERS:
+            value = response.headers.get(header)
+            if value is not None:
+                with self._lock:
+                    self._used_weight = int(value)
+                    self._weight_minute = int(self._clock() // 60)
+                return
+
+    def _throttle(self) -> None:
+        """Sleep to the next minute boundary when the reported weight is near the limit."""
+        if self.used_weight < self.weight_limit * self.throttle_ratio:
+            return
+        delay = 60 - (self._clock() % 60)
+        logger.warning(f"Request weight {self._used_weight}/{self.weight_limit}; pausing {delay:.1f}s")
+        self._sleep(delay)
+
+    # ── Retry policy ────────────────────────────────────────────
+    def _backoff_delay(self, attempt: int, response=None) -> float:
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after is not None:
+                try:
+                    return float(retry_after)
+                except ValueError:
+                    pass
+        cap = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(cap / 2, cap)
+
+    def _record(self, url: str, elapsed_ms: float, ok: bool) -> None:
+        endpoint = urlparse(url).path or url
+        with self._lock:
+            stats = self._stats.get(endpoint)
+            if stats is None:
+                stats = self._stats[endpoint] = EndpointStats()
+            stats.record(elapsed_ms, ok)
+
+    # ── Requests ────────────────────────────────────────────────
+    def get(self, url: str, params: dict = None, timeout: float = None) -> requests.Response:
+        """
+        GET with throttling and retries.
+
+        Raises:
+            requests.exceptions.RequestException: When retries are exhausted
+            or the response is a non-retryable HTTP error.
+        """
+        for attempt in range(self.max_retries + 1):
+            self._throttle()
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, params=params, timeout=timeout or self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self._record(url, (time.perf_counter() - start) * 1000, ok=False)
+                if attempt == self.max_retries:
+                    raise
+                delay = self._backoff_delay(attempt)
+                logger.warning(f"{e.__class__.__name__} on {url}; retry {attempt + 1} in {delay:.2f}s")
+                self._sleep(delay)
+                continue
+
+            self._record(url, (time.perf_counter() - start) * 1000, ok=response.ok)
+            self._update_weight(response)
+
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                delay = self._backoff_delay(attempt, response)
+                logger.warning(f"HTTP {response.status_code} on {url}; retry {attempt + 1} in {delay:.2f}s")
+                self._sleep(delay)
+                continue
+
+            response.raise_for_status()
+            return response
+
+    def get_json(self, url: str, params: dict = None, timeout: float = None):
+        return self.get(url, params=params, timeout=timeout).json()
+
+    def latency_stats(self) -> dict:
+        """Per-endpoint latency summary: {path: {count, errors, mean_ms, max_ms, last_ms}}."""
+        with self._lock:
+            return {endpoint: stats.as_dict() for endpoint, stats in self._stats.items()}
+
+
+# ────────────────────────────────────────────────────────────────
+# Shared instance
+# ────────────────────────────────────────────────────────────────
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> ExchangeClient:
+    """Return the process-wide ExchangeClient, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = ExchangeClient()
+    return _client
@@ -0,0 +1,75 @@
+# api/rate_limiter.py
+"""
+TradeForge Request-Weight Limiter
+---------------------------------
+Binance limits REST usage by *request weight* per rolling minute (per IP),
+not by request count. This thread-safe sliding-window limiter lets many
+worker threads share one budget: each caller blocks in `acquire(weight)`
+until the weight spent in the last `window` seconds leaves room.
+"""
+
+import threading
+import time
+from collections import deque
+
+# Stay under Binance's spot REST limit, leaving headroom for other clients
+DEFAULT_MAX_WEIGHT = 1200
+DEFAULT_WINDOW_S = 60.0
+
+
+def klines_request_weight(limit: int) -> int:
+    """Request weight of GET /api/v3/klines for a given `limit`."""
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
+
+
+class WeightRateLimiter:
+    """Sliding-window request-weight budget shared across threads."""
+
+    def __init__(self, max_weight: int = DEFAULT_MAX_WEIGHT, window: float = DEFAULT_WINDOW_S,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.max_weight = max_weight
+        self.window = window
+        self._clock = clock
+        self._sleep = sleep
+        self._spent = deque()   # (timestamp, weight)
+        self._used = 0
+        self._lock = threading.Lock()
+
+    @property
+    def used_weight(self) -> int:
+        """Weight spent inside the current window."""
+        with self._lock:
+            self._expire(self._clock())
+            return self._used
+
+    def _expire(self, now: float) -> None:
+        while self._spent and now - self._spent[0][0] >= self.window:
+            self._used -= self._spent.popleft()[1]
+
+    def acquire(self, weight: int = 1) -> float:
+        """
+        Block until `weight` fits in the budget, then spend it.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        weight = min(weight, self.max_weight)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._expire(now)
+                if self._used + weight <= self.max_weight:
+                    self._spent.append((now, weight))
+                    self._used += weight
+                    return waited
+                delay = self.window - (now - self._spent[0][0])
+            delay = max(delay, 0.001)
+            self._sleep(delay)
+            waited += delay
@@ -3,25 +3,28 @@
 import os
 import pandas as pd
 from ml.label_generator import generate_labels
+from storage import parquet_store
 
+SYMBOL = "BTCUSDT"
+INTERVAL = "15m"
 INPUT_CSV = "data/BTCUSDT_15m.csv"
 OUTPUT_CSV = "data/BTCUSDT_15m_labeled.csv"
 
-def save_labeled_dataset(input_csv: str, output_csv: str) -> None:
+def save_labeled_dataset(input_csv: str, output_csv: str, symbol: str = SYMBOL, interval: str = INTERVAL) -> None:
     """
-    Load OHLCV CSV with indicators → apply signal labels → save labeled CSV.
+    Load OHLCV with indicators (Parquet store, else CSV) → apply signal labels
+    → save labeled CSV and replace the pair in the store's "labeled" dataset
+    (labels are recomputed as a whole, so nothing stale may be kept).
 
     Note: Assumes indicators are already computed.
     """
-    if not os.path.exists(input_csv):
-        raise FileNotFoundError(f"Input file not found: {input_csv}")
-
-    df = pd.read_csv(input_csv).dropna()
+    df = parquet_store.load_candles(symbol, interval, input_csv).dropna()
 
     df_labeled = generate_labels(df, threshold=0.002, future_window=5)
 
     os.makedirs(os.path.dirname(output_csv), exist_ok=True)
     df_labeled.to_csv(output_csv, index=False)
+    parquet_store.replace_candles(symbol, interval, df_labeled, dataset="labeled")
 
     print(f"[✔] Labeled dataset saved to: {output_csv}")
     print(f"Columns: {df_labeled.columns.tolist()}")
@@ -9,14 +9,16 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from ml.feature_engineering import compute_technical_indicators
 from ml.label_generator import generate_labels
+from storage import parquet_store
 
 # === Default Paths ===
 INPUT_PATH = "data/BTCUSDT_15m.csv"
 OUTPUT_PATH = "data/BTCUSDT_15m_labeled.csv"
 
-def process_and_label_data(input_path: str, output_path: str) -> None:
+def process_and_label_data(input_path: str, output_path: str, symbol: str = "BTCUSDT", interval: str = "15m") -> None:
     """
-    Load OHLCV CSV → Compute indicators + labels → Save new labeled CSV.
+    Load OHLCV CSV → Compute indicators + labels → Save new labeled CSV and
+    replace the pair in the store's "labeled" dataset (read first by train_models).
     """
     if not os.path.exists(input_path):
         raise FileNotFoundError(f"Input file not found: {input_path}")
@@ -28,6 +30,7 @@ def process_and_label_data(input_path: str, output_path: str) -> None:
 
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
     df.to_csv(output_path, index=False)
+    parquet_store.replace_candles(symbol, interval, df, dataset="labeled")
 
     print(f"[✔] Labeled data saved to: {output_path}")
 
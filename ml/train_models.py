@@ -9,6 +9,8 @@ from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score, classification_report
 from xgboost import XGBClassifier
 
+from storage import parquet_store
+
 # === Paths ===
 DATA_PATH = "data/BTCUSDT_15m_labeled.csv"
 MODEL_DIR = "ml/models"
@@ -22,8 +24,8 @@ FEATURES = [
 ]
 TARGET = 'label'
 
-# === Load Data ===
-df = pd.read_csv(DATA_PATH)
+# === Load Data (Parquet store, else CSV) ===
+df = parquet_store.load_candles("BTCUSDT", "15m", DATA_PATH, dataset="labeled")
 df.dropna(subset=FEATURES + [TARGET], inplace=True)
 
 # Map labels to 0/1/2 for ML models
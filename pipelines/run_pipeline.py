@@ -3,16 +3,30 @@
 TradeForge Data Pipeline Script
 -------------------------------
 Fetches OHLCV data from Binance, calculates indicators (SMA, EMA, RSI, MACD),
-and stores the enriched dataset into MongoDB.
+and stores the enriched dataset into a MongoDB time-series collection
+(see storage/mongo_timeseries.py); re-running the pipeline over
+overlapping candles does not store duplicates. Only closed candles are
+stored: a stored candle is never rewritten, so the still-open last kline
+of a fetch would otherwise keep its partial values for good.
+
+Fetches run concurrently on a bounded thread pool that shares one pooled
+HTTP session and one request-weight budget; indicators and Mongo writes
+run on the main thread as each fetch completes, overlapping network I/O.
 
 Author: Amil
 """
 
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import pandas as pd
 from pymongo import MongoClient
 
+from api.backfill import INTERVAL_MS
 from api.exchange_api import fetch_ohlcv
+from api.rate_limiter import WeightRateLimiter, klines_request_weight
+from storage.mongo_timeseries import ensure_timeseries_collection, insert_new_candles
 from signal_engine.indicators_core import (
     calculate_sma, calculate_ema,
     calculate_rsi, calculate_macd
@@ -24,12 +38,19 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(
 # === MongoDB Setup ===
 client = MongoClient("mongodb://localhost:27017/")
 db = client["tradeforge_db"]
-collection = db["ohlcv_data"]
+OHLCV_COLLECTION = "ohlcv_ts"          # time-series; replaces the legacy "ohlcv_data"
+collection = db[OHLCV_COLLECTION]
 
 # === Symbols & Intervals ===
 SYMBOLS = ["BTCUSDT", "ETHUSDT", "BNBUSDT", "SOLUSDT", "XRPUSDT"]
 INTERVALS = ["1m", "5m", "15m"]
 
+# === Concurrency ===
+FETCH_WORKERS = 8
+FETCH_LIMIT = 100
+rate_limiter = WeightRateLimiter()
+clock = time.time       # decides which fetched candles are closed
+
 
 def calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
     """Calculate all technical indicators on a DataFrame."""
@@ -44,7 +65,7 @@ def calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
 
 
 def insert_data(symbol: str, interval: str, df: pd.DataFrame) -> int:
-    """Insert processed DataFrame into MongoDB after validation. Returns # inserted."""
+    """Store closed candles not yet in MongoDB for (symbol, interval). Returns # inserted."""
     if df.empty:
         logging.warning(f"❌ No data for {symbol} [{interval}]. Skipping insert.")
         return 0
@@ -55,39 +76,72 @@ def insert_data(symbol: str, interval: str, df: pd.DataFrame) -> int:
     else:
         df["timestamp"] = pd.to_datetime(df["timestamp"])
 
-    # Add metadata
+    # Add metadata (stored as the time-series metaField)
     df["symbol"] = symbol
     df["interval"] = interval
 
+    # Drop the still-open candle (open time + interval in the future); the next run stores it closed
+    step = INTERVAL_MS.get(interval)
+    if step is not None:
+        now = pd.Timestamp(clock(), unit="s")
+        df = df[df["timestamp"] + pd.Timedelta(milliseconds=step) <= now]
+
     data_dict = df.to_dict("records")
     if not data_dict:
         logging.warning(f"⚠ Nothing to insert for {symbol} [{interval}]")
         return 0
 
-    result = collection.insert_many(data_dict)
-    inserted_count = len(result.inserted_ids)
-    logging.info(f"✅ Inserted {inserted_count} records for {symbol} [{interval}]")
+    inserted_count = insert_new_candles(collection, symbol, interval, data_dict)
+    skipped = len(data_dict) - inserted_count
+    logging.info(f"✅ Inserted {inserted_count} records for {symbol} [{interval}]"
+                 + (f" ({skipped} already stored)" if skipped else ""))
     return inserted_count
 
 
-def run_data_pipeline() -> pd.DataFrame:
+def fetch_pair(symbol: str, interval: str, limit: int = FETCH_LIMIT):
+    """Fetch one (symbol, interval) within the shared request-weight budget."""
+    rate_limiter.acquire(klines_request_weight(limit))
+    df = fetch_ohlcv(symbol, interval, limit)
+
+    # ✅ Always convert to DataFrame if list
+    if isinstance(df, list):
+        df = pd.DataFrame(df)
+    return df
+
+
+def run_data_pipeline(symbols: list = None, intervals: list = None,
+                      max_workers: int = FETCH_WORKERS, limit: int = FETCH_LIMIT) -> pd.DataFrame:
     """
     Run the data pipeline: fetch → calculate indicators → store in MongoDB.
     Returns a combined DataFrame of all processed records.
     """
+    symbols = symbols or SYMBOLS
+    intervals = intervals or INTERVALS
+    pairs = [(symbol, interval) for symbol in symbols for interval in intervals]
+
     success_count = 0
     fail_count = 0
-    all_dataframes = []
+    processed = {}
 
-    for symbol in SYMBOLS:
-        for interval in INTERVALS:
-            logging.info(f"\n{'=' * 60}\nStarting pipeline for {symbol} [{interval}]\n{'=' * 60}")
+    ensure_timeseries_collection(collection.database, collection.name)
 
-            df = fetch_ohlcv(symbol, interval)
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pairs)))) as pool:
+        futures = {
+            pool.submit(fetch_pair, symbol, interval, limit): (symbol, interval)
+            for symbol, interval in pairs
+        }
 
-            # ✅ Always convert to DataFrame if list
-            if isinstance(df, list):
-                df = pd.DataFrame(df)
+        # Process each pair as soon as its fetch lands; the rest keep downloading
+        for future in as_completed(futures):
+            symbol, interval = futures[future]
+            logging.info(f"\n{'=' * 60}\nProcessing {symbol} [{interval}]\n{'=' * 60}")
+
+            try:
+                df = future.result()
+            except Exception as e:
+                logging.error(f"Fetch failed for {symbol} [{interval}]: {e}")
+                fail_count += 1
+                continue
 
             if not isinstance(df, pd.DataFrame):
                 logging.error(f"Unexpected data format from fetch_ohlcv for {symbol} [{interval}] → {type(df)}")
@@ -100,17 +154,14 @@ def run_data_pipeline() -> pd.DataFrame:
                 continue
 
             df = calculate_indicators(df)
-            inserted = insert_data(symbol, interval, df)
-
-            if inserted > 0:
-                success_count += 1
-                all_dataframes.append(df)
-            else:
-                fail_count += 1
+            insert_data(symbol, interval, df)   # 0 when every candle was already stored
+            success_count += 1
+            processed[(symbol, interval)] = df
 
     logging.info(f"\n✅ Pipeline completed. Success: {success_count} | Failures: {fail_count}")
 
-    # Return combined DataFrame (if nothing, return empty DF)
+    # Return combined DataFrame in (symbol, interval) order (if nothing, return empty DF)
+    all_dataframes = [processed[pair] for pair in pairs if pair in processed]
     if all_dataframes:
         return pd.concat(all_dataframes, ignore_index=True)
     return pd.DataFrame()
@@ -0,0 +1,87 @@
+#scripts/benchmark_parquet_store.py
+"""
+Benchmark the Parquet candle store against CSV on synthetic 1m candles.
+
+Writes N rows (default: 525,600 = one year of 1m data) for one pair into a
+scratch store and CSV, then times a full-history read, a one-month range
+read with column pushdown, `read_latest` and, for comparison, `pd.read_csv`
+of the same candles. Target: the full year reads in well under a second.
+
+Usage:
+    python scripts/benchmark_parquet_store.py --rows 525600 --repeats 3
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add root path to access project modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from storage import parquet_store
+
+SYMBOL = "BTCUSDT"
+INTERVAL = "1m"
+START = pd.Timestamp("2023-01-01")
+
+
+def make_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.001, rows)))
+    return pd.DataFrame({
+        "timestamp": pd.date_range(START, periods=rows, freq="min"),
+        "open": close, "high": close * 1.001, "low": close * 0.999, "close": close,
+        "volume": rng.random(rows) * 10,
+    })
+
+
+def best_of(repeats: int, fn):
+    timings, result = [], None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def run_benchmark(rows: int, repeats: int) -> None:
+    df = make_frame(rows)
+    with tempfile.TemporaryDirectory(prefix="tradeforge_parquet_bench_") as scratch:
+        root = os.path.join(scratch, "parquet")
+        csv_path = os.path.join(scratch, f"{SYMBOL}_{INTERVAL}.csv")
+
+        print(f"📊 Benchmarking the Parquet store on {rows:,} rows of {SYMBOL} [{INTERVAL}] ({repeats} runs)")
+        start = time.perf_counter()
+        parquet_store.write_candles(SYMBOL, INTERVAL, df, root=root)
+        print(f" - Write (Parquet)   : {time.perf_counter() - start:.3f}s")
+        df.to_csv(csv_path, index=False)
+
+        full, result = best_of(repeats, lambda: parquet_store.read_candles(SYMBOL, INTERVAL, root=root))
+        print(f" - Full read         : {full:.3f}s | {len(result):,} rows | {len(result) / full:,.0f} rows/s")
+
+        month_end = START + pd.Timedelta(days=30)
+        ranged, result = best_of(repeats, lambda: parquet_store.read_candles(
+            SYMBOL, INTERVAL, START, month_end, columns=["close"], root=root))
+        print(f" - 30-day close read : {ranged:.3f}s | {len(result):,} rows")
+
+        latest, result = best_of(repeats, lambda: parquet_store.read_latest(SYMBOL, INTERVAL, 500, root=root))
+        print(f" - Latest 500        : {latest:.3f}s | {len(result):,} rows")
+
+        csv_time, _ = best_of(repeats, lambda: pd.read_csv(csv_path, parse_dates=["timestamp"]))
+        print(f" - CSV read          : {csv_time:.3f}s → Parquet speed-up ~{csv_time / full:,.1f}x")
+
+        status = "✅" if full < 1.0 else "⚠️"
+        print(f"{status} Full read {'under' if full < 1.0 else 'over'} the 1s target")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the TradeForge Parquet candle store.")
+    parser.add_argument("--rows", type=int, default=525_600)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    run_benchmark(args.rows, args.repeats)
@@ -0,0 +1,83 @@
+#scripts/benchmark_replay.py
+"""
+Benchmark the streamer's message path (RSI → prediction → SQL) offline.
+
+Replays a recording made with TRADEFORGE_RECORD_PATH (or a synthetic one
+of N closed 1m klines) through `websocket_streamer.on_message` at full
+speed, with orders disabled, against a scratch SQLite DB unless
+--db-url is given.
+
+Usage:
+    python scripts/benchmark_replay.py --synthetic 20000
+    python scripts/benchmark_replay.py --recording data/recordings/btcusdt_1m.bin.gz --speed 10
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+# Add root path to access project modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sql.db_engine import configure_engine
+from sql.models import Base
+from streaming.recorder import MessageRecorder
+
+
+def write_synthetic_recording(path: str, messages: int, symbol: str = "BTCUSDT",
+                              interval: str = "1m", seed: int = 0) -> None:
+    """Closed 1m klines on a random walk, received one per minute."""
+    rng = np.random.default_rng(seed)
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.001, messages)))
+    start_ms = 1_700_000_000_000
+    with MessageRecorder(path) as recorder:
+        for i, price in enumerate(close):
+            t = start_ms + i * 60_000
+            kline = {
+                "t": t, "T": t + 59_999, "s": symbol, "i": interval,
+                "o": f"{price:.2f}", "h": f"{price * 1.001:.2f}", "l": f"{price * 0.999:.2f}",
+                "c": f"{price:.2f}", "v": "12.5", "x": True,
+            }
+            message = {"e": "kline", "E": t + 60_000, "s": symbol, "k": kline}
+            recorder.record(json.dumps(message), received_ns=(t + 60_000) * 1_000_000)
+
+
+def run_benchmark(recording: str, speed: float, limit: int, db_url: str) -> None:
+    engine = configure_engine(db_url, config={})
+    Base.metadata.create_all(engine)
+
+    from streaming import websocket_streamer
+    print(f"📼 Replaying {recording} ({'max' if not speed else f'{speed:g}x'} speed) into {db_url}")
+    stats = websocket_streamer.replay_recording(recording, speed=speed, limit=limit)
+
+    sql = stats["sql"]
+    total = stats["elapsed_s"] + stats["sql_flush_s"]
+    print(f" - Messages   : {stats['messages']:,} ({stats['errors']} errors)")
+    print(f" - Handler    : {stats['elapsed_s']:.3f}s | {stats['msgs_per_sec']:,.0f} msgs/s")
+    print(f" - With SQL   : {total:.3f}s | {stats['messages'] / total:,.0f} msgs/s end-to-end")
+    print(f" - SQL writes : {sql['written_rows']:,} rows in {sql['batches']} batches "
+          f"(avg {sql['avg_flush_ms']:.1f} ms, max {sql['max_flush_ms']:.1f} ms, dropped {sql['dropped']})")
+    websocket_streamer.get_sql_writer().stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the streamer by replaying recorded messages.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--recording", help="Recording written by MessageRecorder")
+    source.add_argument("--synthetic", type=int, help="Generate N synthetic closed klines instead")
+    parser.add_argument("--speed", default="max", help="1 = real time, N = N x faster, 'max' = no pacing")
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--db-url", default=None, help="Defaults to a scratch SQLite file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        recording = args.recording
+        if args.synthetic:
+            recording = os.path.join(tmp, "synthetic.bin.gz")
+            write_synthetic_recording(recording, args.synthetic)
+        db_url = args.db_url or f"sqlite:///{os.path.join(tmp, 'replay.db')}"
+        run_benchmark(recording, None if args.speed == "max" else float(args.speed), args.limit, db_url)
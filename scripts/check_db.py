@@ -1,11 +1,8 @@
 #scripts/check_db.py
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 from sql.models import OHLCV
+from sql.db_engine import get_session
 
-engine = create_engine("sqlite:///sql/escalade.db")
-Session = sessionmaker(bind=engine)
-session = Session()
+session = get_session()
 
 rows = session.query(OHLCV).limit(5).all()
 for r in rows:
@@ -0,0 +1,107 @@
+#scripts/compact_mongo_ohlcv.py
+"""
+Compact the pipeline's MongoDB OHLCV store.
+
+- Creates the time-series collection `tradeforge_db.ohlcv_ts` and its
+  (meta.symbol, meta.interval, timestamp) index if missing.
+- With --migrate, copies the legacy flat `ohlcv_data` collection into it
+  pair by pair, skipping candles already present (so duplicates written
+  by earlier pipeline runs are dropped on the way).
+- Removes duplicate candles from the time-series collection, keeping the
+  first stored document of each (symbol, interval, timestamp). MongoDB
+  5.1-6.x cannot delete time-series documents by `_id`, so there the
+  affected pairs are rewritten through `ohlcv_ts_compact_staging`; if a
+  run is interrupted, copy that collection back before running again.
+- With --drop-legacy (after --migrate), drops `ohlcv_data`.
+
+Safe to run more than once.
+
+Usage:
+    python scripts/compact_mongo_ohlcv.py --migrate
+    python scripts/compact_mongo_ohlcv.py --migrate --drop-legacy
+"""
+
+import argparse
+import os
+import sys
+
+from pymongo import ASCENDING, MongoClient
+
+# --- Ensure project root is in sys.path ---
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from storage.mongo_timeseries import compact_duplicates, ensure_timeseries_collection, insert_new_candles
+
+MONGO_URI = "mongodb://localhost:27017/"
+MONGO_DB = "tradeforge_db"
+TS_COLLECTION = "ohlcv_ts"
+LEGACY_COLLECTION = "ohlcv_data"
+MIGRATE_BATCH = 5000
+
+
+def migrate_legacy(db, target, batch_size: int = MIGRATE_BATCH) -> dict:
+    """Copy `ohlcv_data` (flat symbol/interval fields) into `target`; returns rows copied per pair."""
+    legacy = db[LEGACY_COLLECTION]
+    copied = {}
+    pairs = legacy.aggregate([{"$group": {"_id": {"symbol": "$symbol", "interval": "$interval"}}}])
+    for pair in pairs:
+        symbol, interval = pair["_id"]["symbol"], pair["_id"]["interval"]
+        if not symbol or not interval:
+            continue
+        cursor = legacy.find({"symbol": symbol, "interval": interval}, {"_id": 0}) \
+                       .sort("timestamp", ASCENDING).batch_size(batch_size)
+        total, batch = 0, []
+        for doc in cursor:
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                total += insert_new_candles(target, symbol, interval, batch)
+                batch = []
+        total += insert_new_candles(target, symbol, interval, batch)
+        copied[(symbol, interval)] = total
+    return copied
+
+
+def compact(db, migrate: bool = False, drop_legacy: bool = False) -> dict:
+    """
+    Run the compaction on database `db`.
+
+    Returns:
+        dict: copied (per pair), removed duplicates and whether the legacy collection was dropped.
+    """
+    target = ensure_timeseries_collection(db, TS_COLLECTION)
+    summary = {"copied": {}, "removed": 0, "dropped_legacy": False}
+
+    if migrate and LEGACY_COLLECTION in db.list_collection_names():
+        summary["copied"] = migrate_legacy(db, target)
+    summary["removed"] = compact_duplicates(target)
+
+    if drop_legacy:
+        if not migrate:
+            raise ValueError("--drop-legacy requires --migrate")
+        db.drop_collection(LEGACY_COLLECTION)
+        summary["dropped_legacy"] = True
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Deduplicate and migrate the MongoDB OHLCV store.")
+    parser.add_argument("--uri", default=MONGO_URI)
+    parser.add_argument("--migrate", action="store_true", help=f"Copy {LEGACY_COLLECTION} into {TS_COLLECTION}")
+    parser.add_argument("--drop-legacy", action="store_true", help=f"Drop {LEGACY_COLLECTION} after migrating")
+    args = parser.parse_args()
+
+    try:
+        result = compact(MongoClient(args.uri)[MONGO_DB], args.migrate, args.drop_legacy)
+        print(f"✅ Compaction complete for: {MONGO_DB}.{TS_COLLECTION}")
+        for (symbol, interval), count in result["copied"].items():
+            print(f" - Migrated {symbol} [{interval}]: {count} candles")
+        print(f" - Removed duplicates : {result['removed']}")
+        print(f" - Dropped legacy     : {result['dropped_legacy']}")
+        if any(result["copied"].values()):
+            print("ℹ️ Migrated candles may predate the SQL sync watermarks: "
+                  "run scripts/populate_sql_from_mongo.py --full")
+    except Exception as e:
+        print(f"❌ Compaction failed: {e}")
+        sys.exit(1)
@@ -0,0 +1,88 @@
+#scripts/import_csv_to_parquet.py
+"""
+Import candle CSVs into the partitioned Parquet store (storage/parquet_store.py).
+
+Files are named `{SYMBOL}_{INTERVAL}.csv` (→ dataset "ohlcv") or
+`{SYMBOL}_{INTERVAL}_{suffix}.csv` (→ dataset `suffix`, e.g. "labeled").
+CSVs are read in chunks; candles already in the store are skipped, so
+re-running an import only appends what is new. Derived datasets (anything
+but "ohlcv") are recomputed as a whole, so their import replaces what the
+store holds for the pair instead.
+
+Usage:
+    python scripts/import_csv_to_parquet.py                      # every CSV in data/
+    python scripts/import_csv_to_parquet.py data/BTCUSDT_15m.csv --symbol BTCUSDT --interval 15m
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+
+import pandas as pd
+
+# --- Ensure project root is in sys.path ---
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from storage import parquet_store
+
+DATA_DIR = os.path.join(ROOT_DIR, "data")
+CHUNK_SIZE = 200_000
+FILENAME_PATTERN = re.compile(r"^(?P<symbol>[A-Z0-9]+)_(?P<interval>\d+[smhdwM])(?:_(?P<dataset>\w+))?\.csv$")
+
+
+def parse_filename(path: str):
+    """`BTCUSDT_15m_labeled.csv` → ("BTCUSDT", "15m", "labeled"); None if it does not match."""
+    match = FILENAME_PATTERN.match(os.path.basename(path))
+    if not match:
+        return None
+    return match["symbol"], match["interval"], match["dataset"] or parquet_store.DEFAULT_DATASET
+
+
+def import_csv(path: str, symbol: str, interval: str, dataset: str = parquet_store.DEFAULT_DATASET,
+               root: str = None, chunk_size: int = CHUNK_SIZE, replace: bool = None) -> int:
+    """
+    Append one CSV to the store in chunks of `chunk_size` rows.
+
+    Parameters:
+        replace (bool): Replace the pair's stored rows (the first chunk replaces,
+            later chunks append). Default: True for every dataset but "ohlcv".
+
+    Returns:
+        int: Number of rows written.
+    """
+    if replace is None:
+        replace = dataset != parquet_store.DEFAULT_DATASET
+    written = 0
+    for chunk in pd.read_csv(path, chunksize=chunk_size):
+        write = parquet_store.replace_candles if replace else parquet_store.write_candles
+        written += write(symbol, interval, chunk, dataset=dataset, root=root)
+        replace = False
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import OHLCV/feature CSVs into the Parquet store.")
+    parser.add_argument("paths", nargs="*", help=f"CSV files (default: every CSV in {DATA_DIR})")
+    parser.add_argument("--symbol", help="Override the symbol parsed from the file name")
+    parser.add_argument("--interval", help="Override the interval parsed from the file name")
+    parser.add_argument("--dataset", help="Override the dataset parsed from the file name")
+    parser.add_argument("--root", default=parquet_store.DEFAULT_ROOT)
+    args = parser.parse_args()
+
+    paths = args.paths or sorted(glob.glob(os.path.join(DATA_DIR, "*.csv")))
+    for path in paths:
+        symbol, interval, dataset = parse_filename(path) or (None, None, parquet_store.DEFAULT_DATASET)
+        symbol, interval = args.symbol or symbol, args.interval or interval
+        dataset = args.dataset or dataset
+        if not symbol or not interval:
+            print(f"⚠️ Skipping {path}: cannot tell symbol/interval (use --symbol/--interval)")
+            continue
+        try:
+            rows = import_csv(path, symbol, interval, dataset, root=args.root)
+            print(f"✅ {os.path.basename(path)} → [{dataset}] {symbol} {interval}: {rows} new rows")
+        except Exception as e:
+            print(f"❌ Failed to import {path}: {e}")
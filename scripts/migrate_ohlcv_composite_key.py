@@ -0,0 +1,113 @@
+#scripts/migrate_ohlcv_composite_key.py
+"""
+Migrate an existing TradeForge SQLite database (e.g. sql/escalade.db)
+to the composite OHLCV key introduced in sql/models.py.
+
+- Drops the legacy global UNIQUE index on ohlcv_data.timestamp (which made
+  BTCUSDT and ETHUSDT candles at the same minute collide) and the
+  single-column symbol index, plus the redundant covering index an
+  earlier version of this migration created.
+- Removes duplicate (symbol, interval, timestamp) candles and duplicate /
+  orphaned indicator and prediction rows, keeping the oldest row.
+- Creates every index declared on the models (composite unique key,
+  unique ohlcv_id indexes) and refreshes planner stats.
+
+Safe to run more than once.
+
+Usage:
+    python scripts/migrate_ohlcv_composite_key.py --db sql/escalade.db
+"""
+
+import argparse
+import os
+import sys
+
+from sqlalchemy import create_engine, inspect, text
+
+# --- Ensure project root is in sys.path ---
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from sql.models import Base, OHLCV, Indicator, MLPrediction
+
+DEFAULT_DB_PATH = os.path.join(ROOT_DIR, "sql", "escalade.db")
+LEGACY_INDEXES = [
+    "ix_ohlcv_data_timestamp",
+    "ix_ohlcv_data_symbol",
+    "ix_ohlcv_symbol_interval_timestamp_covering",   # same key prefix as the unique index
+]
+CHILD_TABLES = [Indicator.__tablename__, MLPrediction.__tablename__]
+
+
+def migrate(db_path: str = DEFAULT_DB_PATH) -> dict:
+    """
+    Apply the composite-key migration to the SQLite file at `db_path`.
+
+    Returns:
+        dict: Number of rows removed per table and indexes dropped/created.
+    """
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"Database not found: {db_path}")
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    summary = {"dropped_indexes": [], "created_indexes": [], "removed_rows": {}}
+
+    try:
+        # Tables that do not exist yet are simply created with the new schema
+        Base.metadata.create_all(engine)
+        existing = {idx["name"] for idx in inspect(engine).get_indexes(OHLCV.__tablename__)}
+
+        with engine.begin() as conn:
+            for name in LEGACY_INDEXES:
+                if name in existing:
+                    conn.execute(text(f"DROP INDEX {name}"))
+                    summary["dropped_indexes"].append(name)
+
+            # --- Duplicate candles: keep the lowest id per key ---
+            duplicate_ids = (
+                "SELECT id FROM ohlcv_data WHERE id NOT IN ("
+                " SELECT MIN(id) FROM ohlcv_data GROUP BY symbol, interval, timestamp)"
+            )
+            for child in CHILD_TABLES:
+                conn.execute(text(f"DELETE FROM {child} WHERE ohlcv_id IN ({duplicate_ids})"))
+            removed = conn.execute(text(f"DELETE FROM ohlcv_data WHERE id IN ({duplicate_ids})"))
+            summary["removed_rows"]["ohlcv_data"] = removed.rowcount
+
+            # --- Orphaned / duplicate child rows: one per candle ---
+            for child in CHILD_TABLES:
+                removed = conn.execute(text(
+                    f"DELETE FROM {child} WHERE ohlcv_id NOT IN (SELECT id FROM ohlcv_data)"
+                    f" OR id NOT IN (SELECT MIN(id) FROM {child} GROUP BY ohlcv_id)"
+                ))
+                summary["removed_rows"][child] = removed.rowcount
+
+            for table in (OHLCV.__table__, Indicator.__table__, MLPrediction.__table__):
+                current = {idx["name"] for idx in inspect(conn).get_indexes(table.name)}
+                for index in table.indexes:
+                    if index.name not in current:
+                        index.create(conn)
+                        summary["created_indexes"].append(index.name)
+
+            conn.execute(text("ANALYZE"))
+    finally:
+        engine.dispose()
+
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Migrate OHLCV table to the composite key.")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="Path to the SQLite database file")
+    args = parser.parse_args()
+
+    try:
+        result = migrate(args.db)
+        print(f"✅ Migration complete for: {args.db}")
+        print(f" - Dropped indexes : {result['dropped_indexes'] or 'none'}")
+        print(f" - Created indexes : {result['created_indexes'] or 'none'}")
+        for table, count in result["removed_rows"].items():
+            print(f" - Removed from {table:<15}: {count} rows")
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        sys.exit(1)
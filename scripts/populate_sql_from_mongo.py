@@ -1,73 +1,197 @@
 #script/populate_sql_from_mongo.py
 """
-Script to populate SQLite database from MongoDB.
-Extracts OHLCV + indicators data and stores it in the SQL database.
+Script to populate the SQL database from MongoDB.
+Copies OHLCV + indicator data written by pipelines/run_pipeline.py into
+the ohlcv_data / indicators tables.
+
+Syncs are incremental: for each (symbol, interval) only candles newer
+than the stored watermark (table sync_watermarks) are read, through a
+batched, projected cursor. Each batch is converted to columnar arrays,
+upserted with the set-based bulk inserts (new candles inserted, stored
+candles and indicators updated where Mongo has different values) and
+committed together with the advanced watermark, so an interrupted sync
+resumes where it stopped. The watermark never moves past the last closed
+candle, so a candle still open at sync time is read again next run.
+Pairs are synced in parallel.
+
+The watermark is a timestamp, so candles that reach Mongo late with an
+older timestamp than the watermark (a backfilled gap, a
+compact_mongo_ohlcv.py --migrate of legacy data) are not picked up by
+incremental runs. Run with --full afterwards: it ignores the watermarks
+and re-reads every candle; only missing or changed rows are written.
+
+Usage:
+    python scripts/populate_sql_from_mongo.py --workers 4 --batch-size 5000
+    python scripts/populate_sql_from_mongo.py --full
 """
 
-from pymongo import MongoClient
-from sqlalchemy import create_engine
-import pandas as pd
+import argparse
 import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+from pymongo import ASCENDING, MongoClient
+from sqlalchemy import insert, select, update
+
+# --- Ensure project root is in sys.path ---
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from api.backfill import INTERVAL_MS
+from sql.db_engine import get_engine
+from sql.models import Base, SyncWatermark
+from sql.sql_handler import bulk_insert_ohlcv_sql, bulk_insert_indicators_sql
 
 # === MongoDB Configuration ===
 MONGO_URI = "mongodb://localhost:27017/"
 MONGO_DB = "tradeforge_db"
-MONGO_COLLECTION = "ohlcv_data"
+MONGO_COLLECTION = "ohlcv_ts"   # time-series collection written by pipelines/run_pipeline.py
+SYNC_SOURCE = f"mongo:{MONGO_DB}.{MONGO_COLLECTION}"
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT", "BNBUSDT", "SOLUSDT", "XRPUSDT"]
+INTERVALS = ["1m", "5m", "15m"]
 
-# === SQLite Configuration ===
-SQLITE_PATH = os.path.join(os.getcwd(), "escalade.db")
-engine = create_engine(f"sqlite:///{SQLITE_PATH}")
+BATCH_SIZE = 5000
+SYNC_WORKERS = 4
+
+# Mongo field → SQL column (only these are read from Mongo)
+OHLCV_FIELDS = ["open", "high", "low", "close", "volume"]
+INDICATOR_FIELDS = {"sma_14": "sma", "ema_14": "ema", "rsi_14": "rsi"}
+PROJECTION = {"_id": 0, "timestamp": 1, **{f: 1 for f in OHLCV_FIELDS}, **{f: 1 for f in INDICATOR_FIELDS}}
 
 # === MongoDB Connection ===
 client = MongoClient(MONGO_URI)
 mongo_collection = client[MONGO_DB][MONGO_COLLECTION]
 
-def transfer_data(symbol: str, interval: str):
-    """
-    Pulls data from MongoDB for a given symbol/interval, 
-    then inserts it into corresponding SQLite table.
-    """
-    query = {"symbol": symbol, "interval": interval}
-    cursor = mongo_collection.find(query)
-
-    data = list(cursor)
-    if not data:
-        print(f"⚠️ No MongoDB data found for {symbol} {interval}")
-        return
-
-    df = pd.DataFrame(data)
-
-    # Clean data for SQL compatibility
-    df.drop(columns=["_id"], inplace=True, errors="ignore")
-    df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
-    df.dropna(subset=["timestamp"], inplace=True)
 
-    # Format table name
-    table_name = f"{symbol.lower()}_{interval}"
-
-    try:
-        df.to_sql(table_name, con=engine, if_exists="replace", index=False)
-        print(f"✅ Inserted {len(df)} records into table: {table_name}")
-    except Exception as e:
-        print(f"❌ Error inserting {symbol} {interval}: {e}")
+def get_watermark(symbol: str, interval: str, source: str = SYNC_SOURCE):
+    """Timestamp of the newest candle already synced for the pair, or None."""
+    with get_engine().connect() as conn:
+        return conn.execute(
+            select(SyncWatermark.last_timestamp).where(
+                SyncWatermark.source == source,
+                SyncWatermark.symbol == symbol,
+                SyncWatermark.interval == interval,
+            )
+        ).scalar()
+
+
+def _set_watermark(conn, symbol: str, interval: str, timestamp, source: str = SYNC_SOURCE) -> None:
+    values = {"last_timestamp": timestamp}
+    where = (SyncWatermark.source == source, SyncWatermark.symbol == symbol, SyncWatermark.interval == interval)
+    if conn.execute(update(SyncWatermark).where(*where).values(**values)).rowcount == 0:
+        conn.execute(insert(SyncWatermark).values(source=source, symbol=symbol, interval=interval, **values))
+
+
+def batch_to_frame(docs: list) -> pd.DataFrame:
+    """Mongo documents → columnar DataFrame (float64 arrays, NaN for missing values)."""
+    frame = {"timestamp": pd.to_datetime([d["timestamp"] for d in docs])}
+    for field in OHLCV_FIELDS:
+        frame[field] = np.array([d.get(field) for d in docs], dtype=np.float64)
+    for field, column in INDICATOR_FIELDS.items():
+        frame[column] = np.array([d.get(field) for d in docs], dtype=np.float64)
+    return pd.DataFrame(frame)
+
+
+def _last_closed(df: pd.DataFrame, interval: str, now: float = None):
+    """Newest timestamp in `df` whose candle has closed by `now` (epoch s), or None."""
+    step = pd.Timedelta(milliseconds=INTERVAL_MS.get(interval, 0))
+    closed = df.loc[df["timestamp"] + step <= pd.Timestamp(time.time() if now is None else now, unit="s"),
+                    "timestamp"]
+    return closed.max().to_pydatetime() if not closed.empty else None
+
+
+def _write_batch(symbol: str, interval: str, docs: list) -> int:
+    """Upsert one batch and advance the watermark (to its last closed candle) in a single transaction."""
+    df = batch_to_frame(docs)
+    with get_engine().begin() as conn:
+        written = bulk_insert_ohlcv_sql(symbol, interval, df, conn=conn, upsert=True)
+        bulk_insert_indicators_sql(symbol, interval, df, conn=conn, upsert=True)
+        watermark = _last_closed(df, interval)
+        if watermark is not None:
+            _set_watermark(conn, symbol, interval, watermark)
+    return written
+
+
+def transfer_data(symbol: str, interval: str, collection=None, batch_size: int = BATCH_SIZE,
+                  full: bool = False) -> int:
+    """
+    Copy candles newer than the pair's watermark from MongoDB into SQL.
 
+    Parameters:
+        full (bool): Ignore the watermark and re-read every candle of the pair.
 
-def run_sql_populator():
+    Returns:
+        int: Number of OHLCV rows inserted or corrected.
     """
-    Transfers data for all configured symbol-interval pairs from MongoDB to SQLite.
+    collection = mongo_collection if collection is None else collection
+    watermark = None if full else get_watermark(symbol, interval)
+
+    query = {"meta.symbol": symbol, "meta.interval": interval}
+    if watermark is not None:
+        query["timestamp"] = {"$gt": watermark}
+    cursor = collection.find(query, PROJECTION).sort("timestamp", ASCENDING).batch_size(batch_size)
+
+    written, read, batch = 0, 0, []
+    for doc in cursor:
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            written += _write_batch(symbol, interval, batch)
+            read += len(batch)
+            batch = []
+    if batch:
+        written += _write_batch(symbol, interval, batch)
+        read += len(batch)
+
+    if read == 0:
+        print(f"✔ {symbol} {interval}: up to date (watermark {watermark})")
+    else:
+        print(f"✅ {symbol} {interval}: read {read} candles, inserted/updated {written} rows")
+    return written
+
+
+def run_sql_populator(symbols: list = None, intervals: list = None, max_workers: int = SYNC_WORKERS,
+                      collection=None, batch_size: int = BATCH_SIZE, full: bool = False) -> dict:
     """
-    symbols = ["BTCUSDT", "ETHUSDT", "BNBUSDT", "SOLUSDT", "XRPUSDT"]
-    intervals = ["1m", "5m", "15m"]
-    total_tables = 0
+    Sync all symbol-interval pairs from MongoDB to SQL in parallel
+    (`full` re-reads every candle, see the module docstring).
 
-    for symbol in symbols:
-        for interval in intervals:
-            transfer_data(symbol, interval)
-            total_tables += 1
-
-    print(f"\n🎉 SQL Sync Complete: {total_tables} tables processed.")
+    Returns:
+        dict: (symbol, interval) → rows inserted or corrected (None if the pair failed).
+    """
+    Base.metadata.create_all(get_engine())   # no-op for existing tables; adds sync_watermarks
+    pairs = [(s, i) for s in (symbols or SYMBOLS) for i in (intervals or INTERVALS)]
+    results = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pairs)))) as pool:
+        futures = {
+            pool.submit(transfer_data, symbol, interval, collection, batch_size, full): (symbol, interval)
+            for symbol, interval in pairs
+        }
+        for future in as_completed(futures):
+            pair = futures[future]
+            try:
+                results[pair] = future.result()
+            except Exception as e:
+                print(f"❌ Error syncing {pair[0]} {pair[1]}: {e}")
+                results[pair] = None
+
+    synced = sum(1 for count in results.values() if count is not None)
+    print(f"\n🎉 SQL Sync Complete: {synced}/{len(pairs)} pairs, "
+          f"{sum(c or 0 for c in results.values())} new rows.")
+    return results
 
 
 # === Entry Point ===
 if __name__ == "__main__":
-    run_sql_populator()
+    parser = argparse.ArgumentParser(description="Incrementally sync OHLCV + indicators from MongoDB to SQL.")
+    parser.add_argument("--workers", type=int, default=SYNC_WORKERS)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--full", action="store_true",
+                        help="Ignore the watermarks and re-read all candles (picks up late, older candles)")
+    args = parser.parse_args()
+    run_sql_populator(max_workers=args.workers, batch_size=args.batch_size, full=args.full)
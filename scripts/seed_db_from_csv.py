@@ -14,28 +14,25 @@ Target:
 
 import os
 import sys
+import time
 import pandas as pd
 
-ROOT_DIR = os.path.abspath(os.path.dirname(__file__))
-sys.path.append(ROOT_DIR)
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sql.models import OHLCV, Indicator, MLPrediction
+from sql.sql_handler import (
+    bulk_insert_ohlcv_sql,
+    bulk_insert_indicators_sql,
+    bulk_insert_predictions_sql,
+)
 
-DB_PATH = os.path.join(ROOT_DIR, "sql", "escalade.db")
 CSV_PATH = os.path.join("data", "BTCUSDT_15m.csv")
 
 # Change to match Streamlit filters
 DEFAULT_SYMBOL = "BTCUSDT"
 DEFAULT_INTERVAL = "15m"
 
-engine = create_engine(
-    f"sqlite:///{DB_PATH}",
-    connect_args={"check_same_thread": False}
-)
-Session = sessionmaker(bind=engine)
-
 def seed_database_from_csv():
     if not os.path.exists(CSV_PATH):
         print(f"[ERROR] CSV file not found: {CSV_PATH}")
@@ -49,55 +46,27 @@ def seed_database_from_csv():
         print("[ERROR] CSV missing 'timestamp' column.")
         return
 
-    # Open database session
-    session = Session()
-    try:
-        inserted_count = 0
-        for _, row in df.iterrows():
-            ts = pd.to_datetime(row["timestamp"])
-
-            # Insert OHLCV row
-            ohlcv_obj = OHLCV(
-                symbol=DEFAULT_SYMBOL,
-                interval=DEFAULT_INTERVAL,
-                timestamp=ts,
-                open=float(row["open"]),
-                high=float(row["high"]),
-                low=float(row["low"]),
-                close=float(row["close"]),
-                volume=float(row.get("volume", 0.0))
-            )
-            session.add(ohlcv_obj)
-            session.flush()  # Get the ohlcv_obj.id
+    if "volume" not in df.columns:
+        df["volume"] = 0.0
 
-            # Indicator placeholder
-            ind_obj = Indicator(
-                ohlcv_id=ohlcv_obj.id,
-                sma=0.0,
-                ema=0.0,
-                rsi=0.0
-            )
-            session.add(ind_obj)
+    start = time.perf_counter()
 
-            # Dummy prediction
-            pred_obj = MLPrediction(
-                ohlcv_id=ohlcv_obj.id,
-                prediction=0
-            )
-            session.add(pred_obj)
+    # Set-based inserts: duplicates are skipped by the database
+    inserted_count = bulk_insert_ohlcv_sql(DEFAULT_SYMBOL, DEFAULT_INTERVAL, df)
 
-            inserted_count += 1
+    # Indicator placeholders + dummy predictions, resolved to ohlcv_id in one join
+    placeholders = pd.DataFrame({
+        "timestamp": df["timestamp"],
+        "sma": 0.0,
+        "ema": 0.0,
+        "rsi": 0.0,
+        "prediction": 0
+    })
+    bulk_insert_indicators_sql(DEFAULT_SYMBOL, DEFAULT_INTERVAL, placeholders)
+    bulk_insert_predictions_sql(DEFAULT_SYMBOL, DEFAULT_INTERVAL, placeholders)
 
-        session.commit()
-        print(f"[SUCCESS] Inserted {inserted_count} OHLCV records into DB")
-
-    except Exception as e:
-        session.rollback()
-        print("[ERROR] Database insert failed:", e)
-
-    finally:
-        session.close()
+    elapsed = time.perf_counter() - start
+    print(f"[SUCCESS] Inserted {inserted_count} OHLCV records into DB in {elapsed:.2f}s")
 
 if __name__ == "__main__":
     seed_database_from_csv()
-
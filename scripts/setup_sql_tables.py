@@ -9,18 +9,14 @@ if ROOT_DIR not in sys.path:
 
 # --- Now import from sql package ---
 from sql.models import Base
-from sqlalchemy import create_engine
+from sql.db_engine import get_engine
 
-# === SQLite DB Path ===
-DB_DIR = os.path.join(ROOT_DIR, "sql")
-DB_FILENAME = "escalade.db"
-DB_PATH = os.path.join(DB_DIR, DB_FILENAME)
-
-os.makedirs(DB_DIR, exist_ok=True)
+# === DB Path (resolved by sql/db_engine.py) ===
+DB_PATH = get_engine().url.database or str(get_engine().url)
 
 def create_tables():
     """Initializes all tables defined in models.py."""
-    engine = create_engine(f"sqlite:///{DB_PATH}")
+    engine = get_engine()
     Base.metadata.create_all(engine)
 
     if os.path.exists(DB_PATH):
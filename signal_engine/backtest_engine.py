@@ -30,25 +30,157 @@ def generate_signals(
             1 = buy, -1 = sell, 0 = hold
     """
     df = df.copy()
-    df["signal"] = 0
+    has_sma = use_sma and "SMA_short" in df.columns and "SMA_long" in df.columns
+    has_rsi = use_rsi and "RSI" in df.columns
+
+    df["signal"] = _signal_array(
+        len(df),
+        sma_short=df["SMA_short"].to_numpy(dtype=np.float64) if has_sma else None,
+        sma_long=df["SMA_long"].to_numpy(dtype=np.float64) if has_sma else None,
+        rsi=df["RSI"].to_numpy(dtype=np.float64) if has_rsi else None,
+        rsi_buy=rsi_buy,
+        rsi_sell=rsi_sell,
+    )
+    return df
+
+
+def _signal_array(n: int, sma_short=None, sma_long=None, rsi=None,
+                  rsi_buy: float = 30, rsi_sell: float = 70) -> np.ndarray:
+    """
+    Array form of `generate_signals`: SMA crossover first, RSI thresholds override.
+    Pass None for an indicator to leave it out.
+    """
+    signal = np.zeros(n, dtype=np.int64)
 
     # --- SMA crossover ---
-    if use_sma and "SMA_short" in df.columns and "SMA_long" in df.columns:
-        df.loc[df["SMA_short"] > df["SMA_long"], "signal"] = 1
-        df.loc[df["SMA_short"] < df["SMA_long"], "signal"] = -1
+    if sma_short is not None and sma_long is not None:
+        signal[sma_short > sma_long] = 1
+        signal[sma_short < sma_long] = -1
 
     # --- RSI override ---
-    if use_rsi and "RSI" in df.columns:
-        df.loc[df["RSI"] < rsi_buy, "signal"] = 1
-        df.loc[df["RSI"] > rsi_sell, "signal"] = -1
+    if rsi is not None:
+        signal[rsi < rsi_buy] = 1
+        signal[rsi > rsi_sell] = -1
 
-    return df
+    return signal
+
+
+def _position_changes(signal: np.ndarray):
+    """
+    Derive entry/exit bars from a signal array.
+
+    A long position is opened on the first 1 while flat and closed on the
+    first -1 while holding; other values keep the current state. That state
+    is simply "the most recent non-hold signal was a buy", so it is found
+    with a forward fill instead of a per-row loop.
+
+    Returns:
+        (held, buy_idx, sell_idx): boolean holding mask plus integer bar
+        positions of every BUY and SELL.
+    """
+    n = len(signal)
+    marks = np.where(signal == 1, 1, np.where(signal == -1, -1, 0))
+    last_mark_pos = np.maximum.accumulate(np.where(marks != 0, np.arange(n), -1))
+    held = np.zeros(n, dtype=bool)
+    has_mark = last_mark_pos >= 0
+    held[has_mark] = marks[last_mark_pos[has_mark]] == 1
+
+    prev_held = np.concatenate(([False], held[:-1]))
+    buy_idx = np.flatnonzero(held & ~prev_held)
+    sell_idx = np.flatnonzero(~held & prev_held)
+    return held, buy_idx, sell_idx
+
+
+def _portfolio_values(close: np.ndarray, held: np.ndarray, buy_idx: np.ndarray,
+                      sell_idx: np.ndarray, initial_balance: float) -> np.ndarray:
+    """
+    Mark-to-market portfolio value for every bar, computed with array ops.
+
+    Only the cash carried between round trips needs a sequential pass, and
+    that pass runs once per trade rather than once per bar.
+    """
+    # cash[k] = balance available for the k-th entry (and after the k-th exit)
+    cash = np.empty(len(buy_idx) + 1, dtype=np.float64)
+    cash[0] = initial_balance
+    for k, (b, s) in enumerate(zip(buy_idx, sell_idx)):
+        cash[k + 1] = (cash[k] / close[b]) * close[s]
+    if len(buy_idx) > len(sell_idx):
+        cash[len(buy_idx)] = cash[len(sell_idx)]
+
+    exits = np.zeros(len(close), dtype=np.int64)
+    exits[sell_idx] = 1
+    values = cash[np.cumsum(exits)]
+    if len(buy_idx):
+        entries = np.zeros(len(close), dtype=np.int64)
+        entries[buy_idx] = 1
+        entry = np.cumsum(entries) - 1
+        units = cash[:len(buy_idx)] / close[buy_idx]
+        values = np.where(held, units[np.maximum(entry, 0)] * close, values)
+    return values
+
+
+def _compute_metrics(portfolio_values: np.ndarray, trade_types: list,
+                     trade_prices: list, initial_balance: float) -> dict:
+    """Performance metrics shared by `simulate_backtest` and the parameter sweep."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = portfolio_values[1:] / portfolio_values[:-1] - 1
+    returns = returns[~np.isnan(returns)]
+
+    if len(returns) > 1:
+        std = returns.std(ddof=1)
+        sharpe_ratio = (returns.mean() / std) * np.sqrt(252) if std != 0 else 0
+    else:
+        sharpe_ratio = np.nan  # matches pandas: std of < 2 returns is NaN
+
+    final_value = portfolio_values[-1]
+    total_return = (final_value / initial_balance) - 1
+
+    rolling_max = np.maximum.accumulate(portfolio_values)
+    max_drawdown = ((portfolio_values - rolling_max) / rolling_max).min()
+
+    wins = sum(
+        1 for j in range(1, len(trade_types))
+        if trade_types[j] == "SELL" and trade_prices[j] > trade_prices[j - 1]
+    )
+    win_rate = wins / (len(trade_types) // 2) if len(trade_types) >= 2 else 0
+
+    return {
+        "Final Portfolio Value": final_value,
+        "Total Return": total_return,
+        "Sharpe Ratio": sharpe_ratio,
+        "Max Drawdown": max_drawdown,
+        "Win Rate": win_rate,
+        "Number of Trades": len(trade_types)
+    }
+
+
+def _backtest_arrays(close: np.ndarray, signal: np.ndarray, initial_balance: float = 10000.0):
+    """
+    Core of `simulate_backtest` on plain arrays.
+
+    Returns:
+        (portfolio_values, metrics_dict)
+    """
+    held, buy_idx, sell_idx = _position_changes(signal)
+    portfolio_values = _portfolio_values(close, held, buy_idx, sell_idx, initial_balance)
+
+    # ---- Trade list (chronological) ----
+    trade_pos = np.concatenate((buy_idx, sell_idx))
+    order = np.argsort(trade_pos, kind="stable")
+    trade_types = np.array(["BUY"] * len(buy_idx) + ["SELL"] * len(sell_idx))[order].tolist()
+    trade_prices = close[trade_pos[order]].tolist()
+
+    metrics = _compute_metrics(portfolio_values, trade_types, trade_prices, initial_balance)
+    return portfolio_values, metrics
 
 
 def simulate_backtest(df: pd.DataFrame, initial_balance: float = 10000.0):
     """
     Simulates a backtest for the given trading signals.
 
+    Position state, portfolio value and the trade list are derived from the
+    signal array in vectorized NumPy passes (long-only, all-in/all-out).
+
     Parameters:
         df (pd.DataFrame): DataFrame with 'close' and 'signal'.
         initial_balance (float): Starting balance.
@@ -60,55 +192,9 @@ def simulate_backtest(df: pd.DataFrame, initial_balance: float = 10000.0):
     if "signal" not in df.columns:
         raise ValueError("DataFrame must contain 'signal' column.")
 
-    balance = initial_balance
-    position = 0
-    portfolio_values = []
-    trades = []
-
-    for i, row in df.iterrows():
-        price = row["close"]
-        signal = row["signal"]
-
-        # --- Buy ---
-        if signal == 1 and position == 0:
-            position = balance / price
-            balance = 0
-            trades.append({"type": "BUY", "price": price, "time": i})
-
-        # --- Sell ---
-        elif signal == -1 and position > 0:
-            balance = position * price
-            position = 0
-            trades.append({"type": "SELL", "price": price, "time": i})
-
-        # --- Track Portfolio ---
-        portfolio_value = balance + position * price
-        portfolio_values.append(portfolio_value)
+    close = df["close"].to_numpy(dtype=np.float64)
+    signal = df["signal"].to_numpy()
 
+    portfolio_values, metrics = _backtest_arrays(close, signal, initial_balance)
     df["portfolio_value"] = portfolio_values
-
-    # ---- Metrics ----
-    returns = df["portfolio_value"].pct_change().dropna()
-    total_return = (df["portfolio_value"].iloc[-1] / initial_balance) - 1
-    sharpe_ratio = (returns.mean() / returns.std()) * np.sqrt(252) if returns.std() != 0 else 0
-
-    rolling_max = df["portfolio_value"].cummax()
-    drawdown = (df["portfolio_value"] - rolling_max) / rolling_max
-    max_drawdown = drawdown.min()
-
-    wins = [
-        1 for j in range(1, len(trades))
-        if trades[j]["type"] == "SELL" and trades[j]["price"] > trades[j-1]["price"]
-    ]
-    win_rate = len(wins) / (len(trades) // 2) if len(trades) >= 2 else 0
-
-    metrics = {
-        "Final Portfolio Value": df["portfolio_value"].iloc[-1],
-        "Total Return": total_return,
-        "Sharpe Ratio": sharpe_ratio,
-        "Max Drawdown": max_drawdown,
-        "Win Rate": win_rate,
-        "Number of Trades": len(trades)
-    }
-
     return df, metrics
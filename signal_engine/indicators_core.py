@@ -82,3 +82,28 @@ def calculate_macd(df: pd.DataFrame) -> pd.DataFrame:
         "Signal_Line": signal_line,
         "Histogram": histogram
     })
+
+
+def calculate_bollinger_bands(df: pd.DataFrame, period: int = 20, num_std: float = 2.0) -> pd.DataFrame:
+    """
+    Calculate Bollinger Bands around a Simple Moving Average.
+
+    Middle Band = SMA(period)
+    Upper/Lower Band = Middle ± num_std * rolling sample std
+
+    Parameters:
+        df (pd.DataFrame): DataFrame with 'close' prices.
+        period (int): Lookback window size (default: 20).
+        num_std (float): Band width in standard deviations (default: 2).
+
+    Returns:
+        pd.DataFrame: DataFrame with ['BB_Upper', 'BB_Middle', 'BB_Lower'] columns.
+    """
+    middle = df["close"].rolling(window=period).mean()
+    std = df["close"].rolling(window=period).std()
+
+    return pd.DataFrame({
+        "BB_Upper": middle + num_std * std,
+        "BB_Middle": middle,
+        "BB_Lower": middle - num_std * std
+    })
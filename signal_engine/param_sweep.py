@@ -0,0 +1,232 @@
+# signal_engine/param_sweep.py
+"""
+TradeForge - Parallel Parameter Sweep
+Searches `generate_signals` / `simulate_backtest` parameters (RSI thresholds,
+SMA windows) across a process pool and returns a ranked metrics table.
+
+Indicator columns are computed once in the parent and placed in a single
+shared memory block; workers map it read-only, so each task only ships a
+small parameter dict instead of the whole price history.
+
+Usage:
+    python -m signal_engine.param_sweep data/BTCUSDT_15m.csv \\
+        --rsi-buy 20 25 30 --rsi-sell 70 75 80 \\
+        --sma-short 5 10 20 --sma-long 50 100 200 --workers 8
+"""
+
+import argparse
+import itertools
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from signal_engine.indicators_core import calculate_rsi
+from signal_engine.backtest_engine import _signal_array, _backtest_arrays
+from utils.shm import attach_shared_memory
+
+DEFAULT_GRID = {
+    "rsi_buy": [20, 25, 30, 35],
+    "rsi_sell": [65, 70, 75, 80],
+    "sma_short": [5, 10, 20],
+    "sma_long": [50, 100, 200],
+}
+
+# Worker-side location of the shared indicator matrix: (shm name, shape, column names)
+_worker_block = None
+
+
+# -----------------------------------------------
+# Parameter Space
+# -----------------------------------------------
+def build_param_grid(grid: dict = None, n_random: int = None, seed: int = None) -> list:
+    """
+    Expand a parameter grid into a list of parameter dicts.
+
+    Combinations where `sma_short >= sma_long` are dropped. If `n_random` is
+    given, that many combinations are sampled without replacement (random search).
+    """
+    grid = grid or DEFAULT_GRID
+    keys = list(grid.keys())
+    combos = [
+        dict(zip(keys, values))
+        for values in itertools.product(*(grid[k] for k in keys))
+    ]
+    combos = [
+        p for p in combos
+        if p.get("sma_short") is None or p.get("sma_long") is None
+        or p["sma_short"] < p["sma_long"]
+    ]
+    if n_random is not None and n_random < len(combos):
+        combos = random.Random(seed).sample(combos, n_random)
+    return combos
+
+
+def prepare_indicator_columns(df: pd.DataFrame, params: list, rsi_period: int = 14) -> dict:
+    """Compute close, RSI and every SMA window referenced by `params`, once."""
+    close = df["close"].astype(float)
+    columns = {
+        "close": close.to_numpy(dtype=np.float64),
+        "RSI": calculate_rsi(df, rsi_period).to_numpy(dtype=np.float64),
+    }
+    windows = {p[k] for p in params for k in ("sma_short", "sma_long") if p.get(k)}
+    for window in sorted(windows):
+        columns[f"SMA_{window}"] = close.rolling(window=window).mean().to_numpy(dtype=np.float64)
+    return columns
+
+
+# -----------------------------------------------
+# Worker Side
+# -----------------------------------------------
+def _init_worker(shm_name: str, shape: tuple, names: list) -> None:
+    """Pool initializer: remember where the shared indicator matrix lives."""
+    global _worker_block
+    _worker_block = (shm_name, shape, names)
+
+
+def _evaluate(params: dict, initial_balance: float, cols: dict) -> dict:
+    """Run one backtest on the shared columns."""
+    close = cols["close"]
+    use_sma = params.get("use_sma", True) and params.get("sma_short") and params.get("sma_long")
+    use_rsi = params.get("use_rsi", True)
+
+    signal = _signal_array(
+        len(close),
+        sma_short=cols[f"SMA_{params['sma_short']}"] if use_sma else None,
+        sma_long=cols[f"SMA_{params['sma_long']}"] if use_sma else None,
+        rsi=cols["RSI"] if use_rsi else None,
+        rsi_buy=params.get("rsi_buy", 30),
+        rsi_sell=params.get("rsi_sell", 70),
+    )
+    _, metrics = _backtest_arrays(close, signal, initial_balance)
+    return {**params, **metrics}
+
+
+def _evaluate_batch(batch: list, initial_balance: float) -> list:
+    """Map the shared indicator matrix read-only, run the batch, then unmap it."""
+    shm_name, shape, names = _worker_block
+    shm = attach_shared_memory(shm_name)
+    try:
+        matrix = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        matrix.flags.writeable = False
+        cols = {name: matrix[i] for i, name in enumerate(names)}
+        return [_evaluate(params, initial_balance, cols) for params in batch]
+    finally:
+        cols = matrix = None  # release the views before the block is closed
+        shm.close()
+
+
+# -----------------------------------------------
+# Sweep API
+# -----------------------------------------------
+def run_parameter_sweep(
+    df: pd.DataFrame,
+    param_grid: dict = None,
+    n_random: int = None,
+    seed: int = None,
+    max_workers: int = None,
+    initial_balance: float = 10000.0,
+    rsi_period: int = 14,
+    rank_by: str = "Sharpe Ratio",
+    batch_size: int = 32,
+) -> pd.DataFrame:
+    """
+    Backtest every parameter combination in parallel and rank the results.
+
+    Parameters:
+        df (pd.DataFrame): OHLCV data with a 'close' column.
+        param_grid (dict): Lists of values for 'rsi_buy', 'rsi_sell',
+            'sma_short', 'sma_long' (defaults to DEFAULT_GRID).
+        n_random (int): Sample this many combinations instead of the full grid.
+        seed (int): Random seed for sampling.
+        max_workers (int): Process count (default: os.cpu_count()).
+        initial_balance (float): Starting balance for each backtest.
+        rsi_period (int): RSI lookback shared by all combinations.
+        rank_by (str): Metric column to sort by (descending).
+        batch_size (int): Combinations sent to a worker per task.
+
+    Returns:
+        pd.DataFrame: One row per combination (parameters + metrics), best first.
+    """
+    params = build_param_grid(param_grid, n_random=n_random, seed=seed)
+    if not params or df.empty:
+        return pd.DataFrame()
+
+    columns = prepare_indicator_columns(df, params, rsi_period)
+    names = list(columns.keys())
+    shape = (len(names), len(df))
+
+    shm = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * 8, 1))
+    try:
+        matrix = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        for i, name in enumerate(names):
+            matrix[i] = columns[name]
+        del matrix  # release the parent's view before the block is closed
+
+        batches = [params[i:i + batch_size] for i in range(0, len(params), batch_size)]
+        with ProcessPoolExecutor(
+            max_workers=max_workers or os.cpu_count(),
+            initializer=_init_worker,
+            initargs=(shm.name, shape, names),
+        ) as pool:
+            results = [
+                row
+                for batch_result in pool.map(
+                    _evaluate_batch, batches, itertools.repeat(initial_balance)
+                )
+                for row in batch_result
+            ]
+    finally:
+        shm.close()
+        shm.unlink()
+
+    table = pd.DataFrame(results)
+    if rank_by in table.columns:
+        table = table.sort_values(rank_by, ascending=False, na_position="last")
+    return table.reset_index(drop=True)
+
+
+# -----------------------------------------------
+# CLI
+# -----------------------------------------------
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Parallel strategy parameter sweep.")
+    parser.add_argument("csv", help="OHLCV CSV with a 'close' column")
+    parser.add_argument("--rsi-buy", type=int, nargs="+", default=DEFAULT_GRID["rsi_buy"])
+    parser.add_argument("--rsi-sell", type=int, nargs="+", default=DEFAULT_GRID["rsi_sell"])
+    parser.add_argument("--sma-short", type=int, nargs="+", default=DEFAULT_GRID["sma_short"])
+    parser.add_argument("--sma-long", type=int, nargs="+", default=DEFAULT_GRID["sma_long"])
+    parser.add_argument("--rsi-period", type=int, default=14)
+    parser.add_argument("--random", type=int, default=None, help="Random-search sample size")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--balance", type=float, default=10000.0)
+    parser.add_argument("--rank-by", default="Sharpe Ratio")
+    parser.add_argument("--top", type=int, default=20, help="Rows to print")
+    parser.add_argument("--out", default=None, help="Write the full table to this CSV")
+    args = parser.parse_args(argv)
+
+    df = pd.read_csv(args.csv).dropna(subset=["close"])
+    grid = {
+        "rsi_buy": args.rsi_buy,
+        "rsi_sell": args.rsi_sell,
+        "sma_short": args.sma_short,
+        "sma_long": args.sma_long,
+    }
+    table = run_parameter_sweep(
+        df, grid, n_random=args.random, seed=args.seed, max_workers=args.workers,
+        initial_balance=args.balance, rsi_period=args.rsi_period, rank_by=args.rank_by,
+    )
+
+    print(f"[✔] Evaluated {len(table)} combinations on {len(df)} rows")
+    print(table.head(args.top).to_string(index=False))
+    if args.out:
+        table.to_csv(args.out, index=False)
+        print(f"[✔] Results saved to: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+# signal_engine/streaming_indicators.py
+"""
+TradeForge - Streaming Indicator Engine
+Stateful counterparts of the batch functions in `indicators_core`.
+Each indicator consumes one price per `update()` call in O(1) time and
+reproduces the batch values (within float tolerance) for the same series.
+State can be captured with `snapshot()` and rebuilt with `restore()`.
+"""
+
+from collections import deque
+import math
+
+
+class StreamingSMA:
+    """Simple Moving Average over the last `period` prices (matches `calculate_sma`)."""
+
+    __slots__ = ("period", "_window", "_sum")
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._window = deque(maxlen=period)
+        self._sum = 0.0
+
+    @property
+    def value(self):
+        if len(self._window) < self.period:
+            return None
+        return self._sum / self.period
+
+    def update(self, price: float):
+        """Add a price and return the current SMA (None until the window is full)."""
+        if len(self._window) == self.period:
+            self._sum -= self._window[0]
+        self._window.append(price)
+        self._sum += price
+        return self.value
+
+    def snapshot(self) -> dict:
+        return {"type": "SMA", "period": self.period, "window": list(self._window), "sum": self._sum}
+
+    @classmethod
+    def restore(cls, state: dict) -> "StreamingSMA":
+        obj = cls(state["period"])
+        obj._window.extend(state["window"])
+        obj._sum = state["sum"]
+        return obj
+
+
+class StreamingEMA:
+    """Exponential Moving Average, `adjust=False` (matches `calculate_ema`)."""
+
+    __slots__ = ("period", "alpha", "_value")
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        self._value = None
+
+    @property
+    def value(self):
+        return self._value
+
+    def update(self, price: float):
+        """Add a price and return the current EMA (seeded with the first price)."""
+        if self._value is None:
+            self._value = price
+        else:
+            self._value = self.alpha * price + (1 - self.alpha) * self._value
+        return self._value
+
+    def snapshot(self) -> dict:
+        return {"type": "EMA", "period": self.period, "value": self._value}
+
+    @classmethod
+    def restore(cls, state: dict) -> "StreamingEMA":
+        obj = cls(state["period"])
+        obj._value = state["value"]
+        return obj
+
+
+class StreamingRSI:
+    """
+    Relative Strength Index using rolling mean gains/losses (matches `calculate_rsi`).
+
+    Like the batch version, the first price contributes a zero gain/loss,
+    so the first value is produced after `period` prices.
+    """
+
+    __slots__ = ("period", "_prev", "_gains", "_losses", "_gain_sum", "_loss_sum")
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._prev = None
+        self._gains = deque(maxlen=period)
+        self._losses = deque(maxlen=period)
+        self._gain_sum = 0.0
+        self._loss_sum = 0.0
+
+    @property
+    def value(self):
+        if len(self._gains) < self.period:
+            return None
+        gain = self._gain_sum / self.period
+        loss = self._loss_sum / self.period
+        rs = gain / (loss + 1e-10)  # Avoid division by zero
+        return 100 - (100 / (1 + rs))
+
+    def update(self, price: float):
+        """Add a price and return the current RSI (None until `period` prices are seen)."""
+        delta = 0.0 if self._prev is None else price - self._prev
+        self._prev = price
+
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        if len(self._gains) == self.period:
+            self._gain_sum -= self._gains[0]
+            self._loss_sum -= self._losses[0]
+        self._gains.append(gain)
+        self._losses.append(loss)
+        self._gain_sum += gain
+        self._loss_sum += loss
+        return self.value
+
+    def snapshot(self) -> dict:
+        return {
+            "type": "RSI",
+            "period": self.period,
+            "prev": self._prev,
+            "gains": list(self._gains),
+            "losses": list(self._losses),
+            "gain_sum": self._gain_sum,
+            "loss_sum": self._loss_sum,
+        }
+
+    @classmethod
+    def restore(cls, state: dict) -> "StreamingRSI":
+        obj = cls(state["period"])
+        obj._prev = state["prev"]
+        obj._gains.extend(state["gains"])
+        obj._losses.extend(state["losses"])
+        obj._gain_sum = state["gain_sum"]
+        obj._loss_sum = state["loss_sum"]
+        return obj
+
+
+class StreamingMACD:
+    """MACD line, signal line and histogram (matches `calculate_macd`)."""
+
+    __slots__ = ("_fast", "_slow", "_signal")
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self._fast = StreamingEMA(fast)
+        self._slow = StreamingEMA(slow)
+        self._signal = StreamingEMA(signal)
+
+    @property
+    def value(self):
+        if self._signal.value is None:
+            return None
+        macd = self._fast.value - self._slow.value
+        return macd, self._signal.value, macd - self._signal.value
+
+    def update(self, price: float):
+        """Add a price and return (MACD, Signal_Line, Histogram)."""
+        macd = self._fast.update(price) - self._slow.update(price)
+        self._signal.update(macd)
+        return self.value
+
+    def snapshot(self) -> dict:
+        return {
+            "type": "MACD",
+            "fast": self._fast.snapshot(),
+            "slow": self._slow.snapshot(),
+            "signal": self._signal.snapshot(),
+        }
+
+    @classmethod
+    def restore(cls, state: dict) -> "StreamingMACD":
+        obj = cls.__new__(cls)
+        obj._fast = StreamingEMA.restore(state["fast"])
+        obj._slow = StreamingEMA.restore(state["slow"])
+        obj._signal = StreamingEMA.restore(state["signal"])
+        return obj
+
+
+class StreamingBollinger:
+    """
+    Bollinger Bands with rolling sample std (matches `calculate_bollinger_bands`).
+
+    Mean and sum of squared deviations are maintained with a sliding
+    Welford update to avoid cancellation at large price levels.
+    """
+
+    __slots__ = ("period", "num_std", "_window", "_mean", "_m2")
+
+    def __init__(self, period: int = 20, num_std: float = 2.0):
+        self.period = period
+        self.num_std = num_std
+        self._window = deque(maxlen=period)
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    @property
+    def value(self):
+        if len(self._window) < self.period:
+            return None
+        std = math.sqrt(max(self._m2, 0.0) / (self.period - 1))
+        return (
+            self._mean + self.num_std * std,
+            self._mean,
+            self._mean - self.num_std * std,
+        )
+
+    def update(self, price: float):
+        """Add a price and return (BB_Upper, BB_Middle, BB_Lower)."""
+        if len(self._window) == self.period:
+            old = self._window[0]
+            n = self.period - 1
+            delta = old - self._mean
+            self._mean -= delta / n
+            self._m2 -= delta * (old - self._mean)
+
+        self._window.append(price)
+        n = len(self._window)
+        delta = price - self._mean
+        self._mean += delta / n
+        self._m2 += delta * (price - self._mean)
+        return self.value
+
+    def snapshot(self) -> dict:
+        return {
+            "type": "Bollinger",
+            "period": self.period,
+            "num_std": self.num_std,
+            "window": list(self._window),
+            "mean": self._mean,
+            "m2": self._m2,
+        }
+
+    @classmethod
+    def restore(cls, state: dict) -> "StreamingBollinger":
+        obj = cls(state["period"], state["num_std"])
+        obj._window.extend(state["window"])
+        obj._mean = state["mean"]
+        obj._m2 = state["m2"]
+        return obj
+
+
+# -----------------------------------------------
+# Snapshot Dispatch
+# -----------------------------------------------
+INDICATOR_TYPES = {
+    "SMA": StreamingSMA,
+    "EMA": StreamingEMA,
+    "RSI": StreamingRSI,
+    "MACD": StreamingMACD,
+    "Bollinger": StreamingBollinger,
+}
+
+
+def restore_indicator(state: dict):
+    """Rebuild any streaming indicator from the dict returned by its `snapshot()`."""
+    try:
+        indicator_cls = INDICATOR_TYPES[state["type"]]
+    except KeyError:
+        raise ValueError(f"Unknown indicator snapshot type: {state.get('type')}")
+    return indicator_cls.restore(state)
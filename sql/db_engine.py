@@ -0,0 +1,156 @@
+# sql/db_engine.py
+"""
+TradeForge SQL Engine Factory
+------------------------------
+Single place where the SQLAlchemy engine and session factory are created.
+Every SQL module (handlers, query layer, trade logger, scripts) goes through
+here so the streamer writing and the Streamlit pages reading share one
+database file and one set of connection settings.
+
+Database URL resolution (first match wins):
+1. TRADEFORGE_DB_URL environment variable
+2. "url" key in config/database.json
+3. sqlite:///<project root>/sql/escalade.db
+
+config/database.json may also override pool and pragma settings, e.g.:
+    {"url": "sqlite:////data/escalade.db", "pool_size": 10,
+     "pragmas": {"cache_size": -131072}}
+
+SQLite connections run in WAL mode with synchronous=NORMAL, a memory map
+and a larger page cache, so readers never block the writer.
+"""
+
+import json
+import os
+import threading
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+DB_URL_ENV = "TRADEFORGE_DB_URL"
+DB_CONFIG_PATH = os.path.join(ROOT_DIR, "config", "database.json")
+DEFAULT_DB_URL = f"sqlite:///{os.path.join(ROOT_DIR, 'sql', 'escalade.db')}"
+
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 10
+DEFAULT_BUSY_TIMEOUT_S = 30
+
+DEFAULT_SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",        # concurrent readers + one writer
+    "synchronous": "NORMAL",      # safe with WAL, far fewer fsyncs
+    "mmap_size": 268435456,       # 256 MB memory-mapped reads
+    "cache_size": -65536,         # 64 MB page cache (negative = KiB)
+    "temp_store": "MEMORY",
+    "foreign_keys": "ON",
+}
+
+# Session factory shared by all modules; rebound by configure_engine()
+Session = sessionmaker()
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def load_db_config(path: str = DB_CONFIG_PATH) -> dict:
+    """Read config/database.json if present (empty dict otherwise)."""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[SQL CONFIG ERROR] Could not read {path}: {e}")
+        return {}
+
+
+def resolve_db_url(config: dict = None) -> str:
+    """Return the database URL from env, config file, or the default path."""
+    config = load_db_config() if config is None else config
+    return os.environ.get(DB_URL_ENV) or config.get("url") or DEFAULT_DB_URL
+
+
+def _attach_sqlite_pragmas(engine, pragmas: dict) -> None:
+    """Apply PRAGMA settings on every new DBAPI connection."""
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def build_engine(url: str = None, config: dict = None):
+    """
+    Create a new engine with TradeForge's pooling and SQLite settings.
+
+    Parameters:
+        url (str): SQLAlchemy URL (defaults to resolve_db_url()).
+        config (dict): Overrides (pool_size, max_overflow, busy_timeout, pragmas).
+    """
+    config = load_db_config() if config is None else config
+    url = url or resolve_db_url(config)
+
+    if not url.startswith("sqlite"):
+        return create_engine(
+            url,
+            pool_size=config.get("pool_size", DEFAULT_POOL_SIZE),
+            max_overflow=config.get("max_overflow", DEFAULT_MAX_OVERFLOW),
+            pool_pre_ping=True,
+        )
+
+    is_memory = url in ("sqlite://", "sqlite:///:memory:")
+    if not is_memory:
+        db_file = url.split("sqlite:///", 1)[-1]
+        if os.path.dirname(db_file):
+            os.makedirs(os.path.dirname(db_file), exist_ok=True)
+
+    options = {
+        "connect_args": {
+            "check_same_thread": False,
+            "timeout": config.get("busy_timeout", DEFAULT_BUSY_TIMEOUT_S),
+        },
+    }
+    if not is_memory:
+        options["pool_size"] = config.get("pool_size", DEFAULT_POOL_SIZE)
+        options["max_overflow"] = config.get("max_overflow", DEFAULT_MAX_OVERFLOW)
+
+    engine = create_engine(url, **options)
+    pragmas = dict(DEFAULT_SQLITE_PRAGMAS, **config.get("pragmas", {}))
+    _attach_sqlite_pragmas(engine, pragmas)
+    return engine
+
+
+def get_engine():
+    """Return the shared engine, creating it on first use."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = build_engine()
+                Session.configure(bind=_engine)
+    return _engine
+
+
+def configure_engine(url: str = None, config: dict = None):
+    """
+    Replace the shared engine (e.g. to point at another DB file in tests/scripts).
+    Existing pooled connections are closed.
+    """
+    global _engine
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+        _engine = build_engine(url, config)
+        Session.configure(bind=_engine)
+    return _engine
+
+
+def get_session():
+    """Return a new session bound to the shared engine."""
+    get_engine()
+    return Session()
@@ -7,10 +7,11 @@ Defines hybrid SQL storage schema for:
 2. Technical indicators (SMA, EMA, RSI)
 3. Machine learning predictions (Buy/Sell/Hold)
 4. Auto-Executed Trade Logs
+5. Incremental sync watermarks
 """
 
 from sqlalchemy import (
-    Column, Integer, Float, String, DateTime, ForeignKey
+    Column, Integer, Float, String, DateTime, ForeignKey, Index
 )
 from sqlalchemy.orm import declarative_base, relationship
 from datetime import datetime
@@ -22,11 +23,16 @@ Base = declarative_base()
 # -------------------------
 class OHLCV(Base):
     __tablename__ = "ohlcv_data"
+    __table_args__ = (
+        # One candle per (symbol, interval, timestamp); also serves time-range
+        # and "latest N candles" scans
+        Index("ux_ohlcv_symbol_interval_timestamp", "symbol", "interval", "timestamp", unique=True),
+    )
 
     id = Column(Integer, primary_key=True)
-    symbol = Column(String, index=True, nullable=False)       # e.g., BTCUSDT
+    symbol = Column(String, nullable=False)                    # e.g., BTCUSDT
     interval = Column(String, nullable=False)                  # e.g., '1m', '5m'
-    timestamp = Column(DateTime, index=True, unique=True, nullable=False)
+    timestamp = Column(DateTime, nullable=False)
 
     open = Column(Float, nullable=False)
     high = Column(Float, nullable=False)
@@ -49,7 +55,7 @@ class Indicator(Base):
     __tablename__ = "indicators"
 
     id = Column(Integer, primary_key=True)
-    ohlcv_id = Column(Integer, ForeignKey("ohlcv_data.id"), nullable=False)
+    ohlcv_id = Column(Integer, ForeignKey("ohlcv_data.id"), nullable=False, unique=True, index=True)
 
     sma = Column(Float, nullable=True)
     ema = Column(Float, nullable=True)
@@ -68,7 +74,7 @@ class MLPrediction(Base):
     __tablename__ = "ml_predictions"
 
     id = Column(Integer, primary_key=True)
-    ohlcv_id = Column(Integer, ForeignKey("ohlcv_data.id"), nullable=False)
+    ohlcv_id = Column(Integer, ForeignKey("ohlcv_data.id"), nullable=False, unique=True, index=True)
     prediction = Column(Integer, nullable=False)  # 1 = Buy, -1 = Sell, 0 = Hold
 
     ohlcv = relationship("OHLCV", back_populates="prediction")
@@ -93,3 +99,20 @@ class Trade(Base):
 
     def __repr__(self):
         return f"<Trade(symbol={self.symbol}, side={self.side}, quantity={self.quantity}, price={self.price}, source={self.source})>"
+
+
+# ----------------------------------------
+# Table: Sync Watermarks
+# ----------------------------------------
+class SyncWatermark(Base):
+    """Newest candle already copied from an external source, per (symbol, interval)."""
+    __tablename__ = "sync_watermarks"
+
+    source = Column(String, primary_key=True)     # e.g. 'mongo:tradeforge_db.ohlcv_ts'
+    symbol = Column(String, primary_key=True)
+    interval = Column(String, primary_key=True)
+    last_timestamp = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<SyncWatermark(source={self.source}, symbol={self.symbol}, interval={self.interval}, last={self.last_timestamp})>"
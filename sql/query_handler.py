@@ -8,9 +8,10 @@ Fetches recent OHLCV + indicator data and ML predictions.
 
 import os
 import sys
+import numpy as np
 import pandas as pd
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
+from datetime import datetime
+from sqlalchemy import select, String, type_coerce
 
 # Make sure we can import models even if executed dynamically
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -18,70 +19,207 @@ if ROOT_DIR not in sys.path:
     sys.path.insert(0, ROOT_DIR)
 
 from sql.models import OHLCV, Indicator, MLPrediction
+from sql.db_engine import get_engine
 
-# Use absolute DB path to always connect to the **correct** file
-ABSOLUTE_DB_PATH = "sqlite:///C:/Users/Amil/TradeForge/sql/escalade.db"
+# Shared engine (DB location comes from TRADEFORGE_DB_URL / config/database.json)
+get_engine()
 
-engine = create_engine(
-    ABSOLUTE_DB_PATH,
-    connect_args={"check_same_thread": False}
-)
-Session = sessionmaker(bind=engine)
+DEFAULT_CHUNKSIZE = 50_000
 
+OHLCV_COLUMNS = ("open", "high", "low", "close", "volume")
+INDICATOR_COLUMNS = ("sma", "ema", "rsi")
+
+# -----------------------------------------------
+# Columnar Core Reads
+# -----------------------------------------------
+def _to_datetime(value):
+    """Accept datetime / str / pd.Timestamp / epoch-ms int for range bounds."""
+    if value is None or isinstance(value, datetime):
+        return value
+    if isinstance(value, (int, np.integer)):
+        return pd.to_datetime(int(value), unit="ms").to_pydatetime()
+    return pd.Timestamp(value).to_pydatetime()
+
+
+def _range_select(columns, symbol, interval, start=None, end=None, join=None):
+    """SELECT `columns` for one (symbol, interval), optionally bounded in time."""
+    stmt = select(*columns).where(OHLCV.symbol == symbol, OHLCV.interval == interval)
+    if join is not None:
+        stmt = stmt.join_from(OHLCV, join, OHLCV.id == join.ohlcv_id)
+    if start is not None:
+        stmt = stmt.where(OHLCV.timestamp >= _to_datetime(start))
+    if end is not None:
+        stmt = stmt.where(OHLCV.timestamp <= _to_datetime(end))
+    return stmt
+
+
+def _ohlcv_columns(extra=()):
+    """
+    Column list with the timestamp read as its raw driver value, so SQLite's
+    text timestamps skip the per-row datetime processor and are parsed in
+    one vectorized pd.to_datetime call instead.
+    """
+    cols = [type_coerce(OHLCV.timestamp, String).label("timestamp")]
+    cols += [getattr(OHLCV, name) for name in OHLCV_COLUMNS]
+    return cols + list(extra)
+
+
+def _rows_to_frame(rows, names, float_names) -> pd.DataFrame:
+    """Transpose fetched rows straight into typed NumPy columns."""
+    if not rows:
+        return pd.DataFrame(columns=list(names))
+    columns = dict(zip(names, zip(*rows)))
+    data = {}
+    for name in names:
+        values = columns[name]
+        if name == "timestamp":
+            data[name] = pd.to_datetime(np.asarray(values), format="ISO8601")
+        elif name in float_names:
+            data[name] = np.asarray(values, dtype=np.float64)
+        else:
+            data[name] = np.asarray(values)
+    return pd.DataFrame(data)
+
+
+def iter_ohlcv_range(symbol: str, interval: str, start=None, end=None,
+                     chunksize: int = DEFAULT_CHUNKSIZE, with_indicators: bool = False):
+    """
+    Stream OHLCV rows for [start, end] as DataFrame chunks, oldest first.
+
+    Parameters:
+        start, end: Inclusive bounds (datetime, str, pd.Timestamp or epoch ms).
+        chunksize (int): Rows per yielded DataFrame.
+        with_indicators (bool): Inner-join sma/ema/rsi from the indicators table.
+
+    Yields:
+        pd.DataFrame: float64 price/volume columns and a datetime64 'timestamp'.
+    """
+    extra = [getattr(Indicator, name) for name in INDICATOR_COLUMNS] if with_indicators else []
+    stmt = _range_select(
+        _ohlcv_columns(extra), symbol, interval, start, end,
+        join=Indicator if with_indicators else None,
+    ).order_by(OHLCV.timestamp.asc())
+
+    names = ("timestamp",) + OHLCV_COLUMNS + (INDICATOR_COLUMNS if with_indicators else ())
+    float_names = set(names) - {"timestamp"}
+
+    with get_engine().connect() as conn:
+        result = conn.execution_options(stream_results=True).execute(stmt)
+        for rows in result.partitions(chunksize):
+            yield _rows_to_frame(rows, names, float_names)
+
+
+def fetch_ohlcv_range(symbol: str, interval: str, start=None, end=None,
+                      limit: int = None, with_indicators: bool = False) -> pd.DataFrame:
+    """
+    Load OHLCV rows for [start, end] into one columnar DataFrame, oldest first.
+    With `limit`, only the newest `limit` rows inside the range are returned.
+    """
+    extra = [getattr(Indicator, name) for name in INDICATOR_COLUMNS] if with_indicators else []
+    stmt = _range_select(
+        _ohlcv_columns(extra), symbol, interval, start, end,
+        join=Indicator if with_indicators else None,
+    )
+    if limit is not None:
+        stmt = stmt.order_by(OHLCV.timestamp.desc()).limit(limit)
+    else:
+        stmt = stmt.order_by(OHLCV.timestamp.asc())
+
+    names = ("timestamp",) + OHLCV_COLUMNS + (INDICATOR_COLUMNS if with_indicators else ())
+    with get_engine().connect() as conn:
+        rows = conn.execute(stmt).all()
+    if limit is not None:
+        rows.reverse()
+    return _rows_to_frame(rows, names, set(names) - {"timestamp"})
+
+
+# -----------------------------------------------
+# Dashboard Queries
+# -----------------------------------------------
 def fetch_recent_ohlcv(symbol: str, interval: str, limit: int = 100):
-    session = Session()
     try:
-        query = (
-            session.query(OHLCV, Indicator)
-            .join(Indicator, OHLCV.id == Indicator.ohlcv_id)
-            .filter(OHLCV.symbol == symbol, OHLCV.interval == interval)
-            .order_by(OHLCV.timestamp.desc())
-            .limit(limit)
-        )
-        records = query.all()
-        data = [
-            {
-                "timestamp": ohlcv.timestamp,
-                "open": ohlcv.open,
-                "high": ohlcv.high,
-                "low": ohlcv.low,
-                "close": ohlcv.close,
-                "volume": ohlcv.volume,
-                "sma": ind.sma,
-                "ema": ind.ema,
-                "rsi": ind.rsi,
-                "signal": 0
-            }
-            for ohlcv, ind in reversed(records)
-        ]
-        return pd.DataFrame(data)
+        df = fetch_ohlcv_range(symbol, interval, limit=limit, with_indicators=True)
+        df["signal"] = 0
+        return df
     except Exception as e:
         print(f"[SQL FETCH OHLCV ERROR] {e}")
         return pd.DataFrame()
-    finally:
-        session.close()
 
 def fetch_recent_predictions(symbol: str, interval: str, limit: int = 100):
-    session = Session()
     try:
-        query = (
-            session.query(OHLCV, MLPrediction)
-            .join(MLPrediction, OHLCV.id == MLPrediction.ohlcv_id)
-            .filter(OHLCV.symbol == symbol, OHLCV.interval == interval)
+        stmt = (
+            _range_select(
+                [type_coerce(OHLCV.timestamp, String).label("timestamp"), MLPrediction.prediction],
+                symbol, interval, join=MLPrediction,
+            )
             .order_by(OHLCV.timestamp.desc())
             .limit(limit)
         )
-        records = query.all()
-        data = [
-            {
-                "timestamp": ohlcv.timestamp,
-                "prediction": pred.prediction
-            }
-            for ohlcv, pred in reversed(records)
-        ]
-        return pd.DataFrame(data)
+        with get_engine().connect() as conn:
+            rows = conn.execute(stmt).all()
+        rows.reverse()
+        if not rows:
+            return pd.DataFrame()
+        return _rows_to_frame(rows, ("timestamp", "prediction"), set())
     except Exception as e:
         print(f"[SQL FETCH PREDICTION ERROR] {e}")
         return pd.DataFrame()
-    finally:
-        session.close()
+
+def fetch_ohlcv_history(symbol: str, interval: str, limit: int = 500):
+    """
+    Fetch the latest `limit` raw OHLCV candles (no indicator join), oldest first.
+    Used to warm-start the streamer's candle buffers.
+    """
+    try:
+        df = fetch_ohlcv_range(symbol, interval, limit=limit)
+        return df if not df.empty else pd.DataFrame()
+    except Exception as e:
+        print(f"[SQL FETCH OHLCV HISTORY ERROR] {e}")
+        return pd.DataFrame()
+
+# -----------------------------------------------
+# Incremental (Live Chart) Queries
+# -----------------------------------------------
+def fetch_ohlcv_since(symbol: str, interval: str, since=None, limit: int = 100):
+    """
+    Fetch candles (with indicators and, where present, predictions) newer than
+    `since`, oldest first. At most the newest `limit` rows are returned.
+    With `since=None` this is the initial window load.
+    """
+    try:
+        columns = _ohlcv_columns(
+            [getattr(Indicator, name) for name in INDICATOR_COLUMNS] + [MLPrediction.prediction]
+        )
+        stmt = (
+            _range_select(columns, symbol, interval, join=Indicator)
+            .outerjoin(MLPrediction, OHLCV.id == MLPrediction.ohlcv_id)
+            .order_by(OHLCV.timestamp.desc())
+            .limit(limit)
+        )
+        if since is not None:
+            stmt = stmt.where(OHLCV.timestamp > _to_datetime(since))
+
+        names = ("timestamp",) + OHLCV_COLUMNS + INDICATOR_COLUMNS + ("prediction",)
+        with get_engine().connect() as conn:
+            rows = conn.execute(stmt).all()
+        rows.reverse()
+        df = _rows_to_frame(rows, names, set(names) - {"timestamp"})
+        df.insert(len(names) - 1, "signal", 0)
+        return df
+    except Exception as e:
+        print(f"[SQL FETCH OHLCV SINCE ERROR] {e}")
+        return pd.DataFrame()
+
+def fetch_predictions_since(symbol: str, interval: str, since):
+    """Fetch predictions for candles at or after `since`, oldest first."""
+    try:
+        stmt = _range_select(
+            [type_coerce(OHLCV.timestamp, String).label("timestamp"), MLPrediction.prediction],
+            symbol, interval, start=since, join=MLPrediction,
+        ).order_by(OHLCV.timestamp.asc())
+        with get_engine().connect() as conn:
+            rows = conn.execute(stmt).all()
+        return _rows_to_frame(rows, ("timestamp", "prediction"), {"prediction"})
+    except Exception as e:
+        print(f"[SQL FETCH PREDICTION SINCE ERROR] {e}")
+        return pd.DataFrame()
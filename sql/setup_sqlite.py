@@ -11,23 +11,21 @@ Initializes the hybrid SQL database (escalade.db) and creates all required table
 Author: Amil
 """
 
-from sqlalchemy import create_engine
 from sql.models import Base  # Includes OHLCV, Indicator, MLPrediction, Trade
+from sql.db_engine import get_engine, build_engine
 
-# Default path to SQLite DB (relative to project root)
-DEFAULT_DB_PATH = "sqlite:///sql/tradeforge.db"
-
-def init_sqlite_db(db_path: str = DEFAULT_DB_PATH):
+def init_sqlite_db(db_path: str = None):
     """
     Initializes the SQLite database using SQLAlchemy and creates all tables.
 
     Args:
-        db_path (str): SQLAlchemy-compatible DB URI (default = 'sqlite:///sql/tradeforge.db')
+        db_path (str): SQLAlchemy-compatible DB URI (default = shared engine
+            from sql/db_engine.py, i.e. TRADEFORGE_DB_URL or sql/escalade.db)
     """
     try:
-        engine = create_engine(db_path)
+        engine = build_engine(db_path) if db_path else get_engine()
         Base.metadata.create_all(engine)
-        print(f"[✔] SQLite database and tables created successfully at: {db_path}")
+        print(f"[✔] SQLite database and tables created successfully at: {engine.url}")
     except Exception as e:
         print(f"[✘] Database initialization failed: {e}")
 
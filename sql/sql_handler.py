@@ -8,19 +8,30 @@ Used for writing:
 - Technical indicators (SMA, EMA, RSI)
 - ML predictions (Buy/Sell/Hold)
 
+Row-by-row ORM inserts are kept for small live writes; the bulk_* variants
+use set-based `INSERT ... ON CONFLICT DO NOTHING` with executemany on a Core
+connection for seeding and backfills (built with the SQLite / PostgreSQL
+dialect insert, so it runs on either backend of sql/db_engine.py). With
+`upsert=True` existing rows whose values changed are updated instead
+(`ON CONFLICT ... DO UPDATE ... WHERE <any value differs>`).
+
 Also exposes a session getter for external scripts.
 """
 
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
+from sqlalchemy import select, and_, or_
+from sqlalchemy.dialects import postgresql, sqlite
 from sql.models import OHLCV, Indicator, MLPrediction
+from sql.db_engine import Session, get_engine
 
 import pandas as pd
 
-# === SQLite Engine and Session ===
-DB_PATH = "sqlite:///sql/escalade.db"
-engine = create_engine(DB_PATH)
-Session = sessionmaker(bind=engine)
+# === Shared engine / session (configured in sql/db_engine.py) ===
+get_engine()
+
+BULK_CHUNK_SIZE = 10_000  # rows per executemany call
+
+# Dialects with INSERT ... ON CONFLICT support
+_DIALECT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
 
 # ----------------------------------------------------------
 # Insert OHLCV Data (if not exists)
@@ -152,6 +163,201 @@ def insert_predictions_sql(symbol: str, interval: str, df: pd.DataFrame) -> int:
 
     return inserted
 
+# ----------------------------------------------------------
+# Bulk (set-based) Inserts
+# ----------------------------------------------------------
+def _to_datetimes(timestamps: pd.Series) -> pd.Series:
+    """Normalize epoch-ms or string/datetime timestamps to naive datetimes."""
+    if pd.api.types.is_numeric_dtype(timestamps):
+        return pd.to_datetime(timestamps, unit="ms")
+    return pd.to_datetime(timestamps)
+
+
+def _column_values(values: pd.Series) -> list:
+    """Column → Python values for the driver (datetimes, NaN → None)."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return list(values.dt.to_pydatetime())
+    return values.astype(object).where(values.notna(), None).tolist()
+
+
+def _insert_statement(conn, table, update_on: tuple = None, columns: list = None):
+    """
+    The dialect's `INSERT ... ON CONFLICT DO NOTHING` for `table`, or with
+    `update_on` (the conflict key) `ON CONFLICT (key) DO UPDATE` of the other
+    `columns`, only where one of them differs (so rowcount = rows changed).
+    """
+    dialect_insert = _DIALECT_INSERTS.get(conn.dialect.name)
+    if dialect_insert is None:
+        raise NotImplementedError(
+            f"Bulk inserts need INSERT ... ON CONFLICT (SQLite or PostgreSQL), not {conn.dialect.name}"
+        )
+    stmt = dialect_insert(table)
+    if not update_on:
+        return stmt.on_conflict_do_nothing()
+    updated = [c for c in columns if c not in update_on]
+    return stmt.on_conflict_do_update(
+        index_elements=list(update_on),
+        set_={c: stmt.excluded[c] for c in updated},
+        where=or_(*(table.c[c].is_distinct_from(stmt.excluded[c]) for c in updated)),
+    )
+
+
+def _executemany(conn, table, frame: pd.DataFrame, update_on: tuple = None) -> int:
+    """
+    `INSERT ... ON CONFLICT DO NOTHING` (or `DO UPDATE` on `update_on`, see
+    _insert_statement) every row of `frame` via executemany, in chunks of
+    BULK_CHUNK_SIZE rows. NaN values are stored as NULL.
+
+    Returns:
+        int: Number of rows written (inserted or changed)
+    """
+    columns = list(frame.columns)
+    stmt = _insert_statement(conn, table, update_on, columns)
+    rows = [dict(zip(columns, values)) for values in zip(*(_column_values(frame[col]) for col in columns))]
+
+    written = 0
+    for start in range(0, len(rows), BULK_CHUNK_SIZE):
+        result = conn.execute(stmt, rows[start:start + BULK_CHUNK_SIZE])
+        written += max(result.rowcount, 0)
+    return written
+
+
+def _child_ids(conn, child_table, symbol: str, interval: str,
+               timestamps: pd.Series, only_missing: bool = True) -> pd.DataFrame:
+    """
+    Resolve timestamps to `ohlcv_id` with one join, keeping only candles
+    that have no row yet in `child_table` (indicators / ml_predictions)
+    unless `only_missing` is False.
+    """
+    conditions = [
+        OHLCV.symbol == symbol,
+        OHLCV.interval == interval,
+        OHLCV.timestamp >= timestamps.min().to_pydatetime(),
+        OHLCV.timestamp <= timestamps.max().to_pydatetime(),
+    ]
+    query = select(OHLCV.id, OHLCV.timestamp)
+    if only_missing:
+        query = query.outerjoin(child_table, child_table.c.ohlcv_id == OHLCV.id)
+        conditions.append(child_table.c.id.is_(None))
+    query = query.where(and_(*conditions))
+    rows = conn.execute(query).all()
+    ids = pd.DataFrame(rows, columns=["ohlcv_id", "timestamp"])
+    ids["timestamp"] = pd.to_datetime(ids["timestamp"])
+    return ids
+
+
+def _in_transaction(conn, work):
+    """Run `work(conn)` on the caller's connection, or in a new transaction."""
+    if conn is not None:
+        return work(conn)
+    with get_engine().begin() as new_conn:
+        return work(new_conn)
+
+
+def _bulk_insert_children(child_table, columns: dict, symbol: str, interval: str,
+                          df: pd.DataFrame, conn=None, upsert: bool = False) -> int:
+    """Shared body of the indicator / prediction bulk inserts."""
+    frame = pd.DataFrame({"timestamp": _to_datetimes(df["timestamp"])})
+    for target, source in columns.items():
+        frame[target] = df[source].to_numpy() if source in df.columns else None
+
+    # Rows missing a NOT NULL value (e.g. no prediction) would fail the whole chunk
+    required = [target for target in columns if not child_table.c[target].nullable]
+    if required:
+        frame = frame.dropna(subset=required)
+        if frame.empty:
+            return 0
+
+    def work(conn):
+        ids = _child_ids(conn, child_table, symbol, interval, frame["timestamp"], only_missing=not upsert)
+        if ids.empty:
+            return 0
+        merged = frame.drop_duplicates("timestamp").merge(ids, on="timestamp", how="inner")
+        return _executemany(conn, child_table, merged[["ohlcv_id", *columns.keys()]],
+                            update_on=("ohlcv_id",) if upsert else None)
+
+    return _in_transaction(conn, work)
+
+
+def bulk_insert_ohlcv_sql(symbol: str, interval: str, df: pd.DataFrame, conn=None,
+                          upsert: bool = False) -> int:
+    """
+    Insert OHLCV candles with `INSERT ... ON CONFLICT DO NOTHING` (executemany).
+
+    Duplicates are skipped by the database instead of a SELECT per row;
+    with `upsert`, stored candles whose values differ are updated instead.
+    Pass `conn` to write inside the caller's transaction; errors are then
+    raised instead of logged.
+
+    Returns:
+        int: Number of rows inserted (or, with `upsert`, inserted or changed)
+    """
+    if df.empty:
+        return 0
+
+    frame = pd.DataFrame({
+        "symbol": symbol,
+        "interval": interval,
+        "timestamp": _to_datetimes(df["timestamp"]).to_numpy(),
+        "open": df["open"].astype(float).to_numpy(),
+        "high": df["high"].astype(float).to_numpy(),
+        "low": df["low"].astype(float).to_numpy(),
+        "close": df["close"].astype(float).to_numpy(),
+        "volume": df["volume"].astype(float).to_numpy(),
+    })
+    try:
+        update_on = ("symbol", "interval", "timestamp") if upsert else None
+        return _in_transaction(conn, lambda c: _executemany(c, OHLCV.__table__, frame, update_on))
+    except Exception as e:
+        if conn is not None:
+            raise
+        print(f"[SQL BULK INSERT ERROR - OHLCV] {e}")
+        return 0
+
+
+def bulk_insert_indicators_sql(symbol: str, interval: str, df: pd.DataFrame, conn=None,
+                               upsert: bool = False) -> int:
+    """
+    Insert SMA, EMA, RSI values for candles that have no indicator row yet
+    (with `upsert`, also update existing rows whose values differ).
+
+    Returns:
+        int: Number of indicator rows inserted (or, with `upsert`, inserted or changed)
+    """
+    if df.empty:
+        return 0
+    try:
+        return _bulk_insert_children(
+            Indicator.__table__, {"sma": "sma", "ema": "ema", "rsi": "rsi"},
+            symbol, interval, df, conn, upsert
+        )
+    except Exception as e:
+        if conn is not None:
+            raise
+        print(f"[SQL BULK INSERT ERROR - INDICATORS] {e}")
+        return 0
+
+
+def bulk_insert_predictions_sql(symbol: str, interval: str, df: pd.DataFrame, conn=None) -> int:
+    """
+    Insert ML prediction labels for candles that have no prediction row yet.
+
+    Returns:
+        int: Number of prediction rows inserted
+    """
+    if df.empty:
+        return 0
+    try:
+        return _bulk_insert_children(
+            MLPrediction.__table__, {"prediction": "prediction"},
+            symbol, interval, df, conn
+        )
+    except Exception as e:
+        if conn is not None:
+            raise
+        print(f"[SQL BULK INSERT ERROR - PREDICTIONS] {e}")
+        return 0
+
 # ----------------------------------------------------------
 # External Access: Get SQL Session
 # ----------------------------------------------------------
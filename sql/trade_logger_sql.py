@@ -9,16 +9,13 @@ Author: Amil
 
 import uuid
 from datetime import datetime
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 from sql.models import Trade
+from sql.db_engine import Session, get_engine
 
 # -------------------------------------
-# SQLite Database Configuration
+# SQLite Database Configuration (shared engine, see sql/db_engine.py)
 # -------------------------------------
-DATABASE_URL = "sqlite:///sql/tradeforge.db"
-engine = create_engine(DATABASE_URL)
-Session = sessionmaker(bind=engine)
+get_engine()
 
 # -------------------------------------
 # Trade Logging Function
@@ -0,0 +1,216 @@
+# sql/write_behind.py
+"""
+TradeForge SQL Write-Behind Queue
+---------------------------------
+Keeps SQL writes off the WebSocket receive thread. Producers drop
+candles / predictions on a bounded queue (never blocking: when the queue
+is full the item is counted as dropped); a background writer drains it
+and writes everything gathered every `batch_rows` rows or
+`flush_interval_ms` after the oldest pending row, whichever comes first
+(also while rows keep arriving).
+
+Each (table, symbol, interval) group of a batch is one bulk insert in its
+own transaction, so a bad group only loses its own rows. OHLCV groups are
+committed before any prediction group, so a prediction always finds the
+candle it belongs to.
+"""
+
+import atexit
+import queue
+import threading
+import time
+
+import pandas as pd
+
+from sql.db_engine import get_engine
+from sql.sql_handler import bulk_insert_ohlcv_sql, bulk_insert_predictions_sql
+from utils.tradeforge_logger import setup_logger
+
+logger = setup_logger(__name__)
+
+DEFAULT_MAX_QUEUE = 10_000
+DEFAULT_BATCH_ROWS = 500
+DEFAULT_FLUSH_INTERVAL_MS = 250
+
+# Write order within a batch
+_WRITERS = {
+    "ohlcv": bulk_insert_ohlcv_sql,
+    "predictions": bulk_insert_predictions_sql,
+}
+
+_STOP = object()
+
+
+class _FlushRequest:
+    __slots__ = ("done",)
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class WriteBehindQueue:
+    """Bounded queue + batching writer thread for OHLCV and prediction rows."""
+
+    def __init__(self, max_queue: int = DEFAULT_MAX_QUEUE, batch_rows: int = DEFAULT_BATCH_ROWS,
+                 flush_interval_ms: float = DEFAULT_FLUSH_INTERVAL_MS):
+        self.batch_rows = batch_rows
+        self.flush_interval = flush_interval_ms / 1000.0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._lock = threading.Lock()
+        self._metrics = {
+            "enqueued": 0, "dropped": 0, "written_rows": 0, "failed_rows": 0,
+            "batches": 0, "errors": 0, "max_depth": 0,
+            "last_flush_ms": 0.0, "max_flush_ms": 0.0, "total_flush_ms": 0.0,
+        }
+
+    # ── Producer side ───────────────────────────────────────────
+    def _submit(self, kind: str, symbol: str, interval: str, df: pd.DataFrame) -> bool:
+        if df is None or df.empty:
+            return True
+        try:
+            self._queue.put_nowait((kind, symbol, interval, df))
+        except queue.Full:
+            with self._lock:
+                self._metrics["dropped"] += len(df)
+            logger.warning(f"SQL write queue full; dropped {len(df)} {kind} row(s) for {symbol} [{interval}]")
+            return False
+        with self._lock:
+            self._metrics["enqueued"] += len(df)
+            self._metrics["max_depth"] = max(self._metrics["max_depth"], self._queue.qsize())
+        return True
+
+    def submit_ohlcv(self, symbol: str, interval: str, df: pd.DataFrame) -> bool:
+        """Queue candles for insert. Returns False if the queue was full."""
+        return self._submit("ohlcv", symbol, interval, df)
+
+    def submit_predictions(self, symbol: str, interval: str, df: pd.DataFrame) -> bool:
+        """Queue prediction rows for insert, skipping rows without a prediction. Returns False if the queue was full."""
+        if df is not None and "prediction" in df.columns:
+            df = df[df["prediction"].notna()]
+        return self._submit("predictions", symbol, interval, df)
+
+    # ── Writer side ─────────────────────────────────────────────
+    def _write_batch(self, batch: list) -> None:
+        if not batch:
+            return
+        groups = {}
+        for kind, symbol, interval, df in batch:
+            groups.setdefault((kind, symbol, interval), []).append(df)
+
+        written = failed = errors = 0
+        start = time.perf_counter()
+        engine = get_engine()
+        for kind, writer in _WRITERS.items():
+            for (group_kind, symbol, interval), frames in groups.items():
+                if group_kind != kind:
+                    continue
+                df = pd.concat(frames, ignore_index=True)
+                try:
+                    with engine.begin() as conn:
+                        writer(symbol, interval, df, conn=conn)
+                    written += len(df)
+                except Exception as e:
+                    errors += 1
+                    failed += len(df)
+                    logger.error(f"SQL write-behind {kind} write of {len(df)} row(s) "
+                                 f"for {symbol} [{interval}] failed: {e}")
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        with self._lock:
+            m = self._metrics
+            m["batches"] += 1
+            m["last_flush_ms"] = elapsed_ms
+            m["max_flush_ms"] = max(m["max_flush_ms"], elapsed_ms)
+            m["total_flush_ms"] += elapsed_ms
+            m["written_rows"] += written
+            m["errors"] += errors
+            m["failed_rows"] += failed
+
+    def _run(self) -> None:
+        batch, rows = [], 0
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is None or item is _STOP or isinstance(item, _FlushRequest):
+                self._write_batch(batch)
+                batch, rows, deadline = [], 0, None
+                if isinstance(item, _FlushRequest):
+                    item.done.set()
+                if item is _STOP:
+                    return
+                continue
+
+            batch.append(item)
+            rows += len(item[3])
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+            if rows >= self.batch_rows or time.monotonic() >= deadline:
+                self._write_batch(batch)
+                batch, rows, deadline = [], 0, None
+
+    # ── Lifecycle ───────────────────────────────────────────────
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the writer thread (no-op if already running)."""
+        with self._lock:
+            if self.running:
+                return
+            self._thread = threading.Thread(target=self._run, name="sql-write-behind", daemon=True)
+            self._thread.start()
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Write everything queued so far; returns False on timeout or if not running."""
+        if not self.running:
+            return self._queue.empty()
+        request = _FlushRequest()
+        try:
+            self._queue.put(request, timeout=timeout)
+        except queue.Full:
+            return False
+        return request.done.wait(timeout)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Flush pending rows and stop the writer thread."""
+        if not self.running:
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning(f"SQL write queue still full at shutdown; up to {self._queue.qsize()} "
+                           f"queued item(s) may not be written")
+        self._thread.join(timeout)
+
+    def metrics(self) -> dict:
+        """Backpressure and latency counters, plus the current queue depth."""
+        with self._lock:
+            m = dict(self._metrics)
+        m["queue_depth"] = self._queue.qsize()
+        m["avg_flush_ms"] = m.pop("total_flush_ms") / m["batches"] if m["batches"] else 0.0
+        return m
+
+
+# ────────────────────────────────────────────────────────────────
+# Shared writer
+# ────────────────────────────────────────────────────────────────
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_sql_writer() -> WriteBehindQueue:
+    """Return the process-wide writer, started on first use and flushed at exit."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = WriteBehindQueue()
+            atexit.register(_writer.stop)
+        _writer.start()
+        return _writer
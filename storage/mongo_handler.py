@@ -1,5 +1,10 @@
 #storage/mongo_handler.py
-from pymongo import MongoClient, errors
+import threading
+import time
+
+import pandas as pd
+
+from pymongo import ASCENDING, MongoClient, UpdateOne, errors
 from utils.tradeforge_logger import setup_logger
 
 # Initialize logger
@@ -14,10 +19,71 @@ client = MongoClient("mongodb://localhost:27017/")
 db = client["tradeforge_data"]
 
 
+# Collections whose unique timestamp index is known to exist (checked once per process)
+_indexed_collections = set()
+# Collections whose index build failed (e.g. duplicate timestamps) -> monotonic time of the attempt;
+# inserts skip the build until INDEX_RETRY_S has passed instead of retrying it on every call
+_failed_index_collections = {}
+_index_lock = threading.Lock()
+INDEX_RETRY_S = 300
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+def ensure_ohlcv_index(collection, retry: bool = False) -> bool:
+    """
+    Create the unique `timestamp` index on an OHLCV collection (once per process).
+
+    A failed build is remembered and not attempted again for INDEX_RETRY_S
+    seconds, unless `retry` is set.
+
+    Returns:
+        bool: True if the index exists. False if it could not be built, e.g.
+        because the collection already holds duplicate timestamps.
+    """
+    key = (collection.database.name, collection.name)
+    if key in _indexed_collections:
+        return True
+    with _index_lock:
+        if key in _indexed_collections:
+            return True
+        failed_at = _failed_index_collections.get(key)
+        if not retry and failed_at is not None and time.monotonic() - failed_at < INDEX_RETRY_S:
+            return False
+        try:
+            collection.create_index([("timestamp", ASCENDING)], unique=True, name="timestamp_unique")
+        except errors.PyMongoError as e:
+            logger.error(f"[MongoDB Index Error] {collection.name}: could not create unique timestamp index "
+                         f"(remove duplicate timestamps first): {e}")
+            _failed_index_collections[key] = time.monotonic()
+            return False
+        _failed_index_collections.pop(key, None)
+        _indexed_collections.add(key)
+        return True
+
+
+def ensure_all_indexes() -> int:
+    """
+    Create the unique timestamp index on every `{symbol}_{interval}` collection,
+    retrying earlier failures. Run once at startup (the MongoDB Explorer does).
+
+    Returns:
+        int: Number of collections that have the index.
+    """
+    count = 0
+    for symbol, interval in get_all_symbols_and_intervals():
+        count += ensure_ohlcv_index(db[f"{symbol}_{interval}"], retry=True)
+    return count
+
+
 def insert_ohlcv(symbol: str, interval: str, ohlcv_data: list) -> int:
     """
     Insert OHLCV data into MongoDB for a specific symbol and interval.
 
+    Candles are upserted by `timestamp` in one unordered bulk write, so
+    candles already stored are left untouched and skipped server-side
+    (backed by a unique index on `timestamp`).
+
     Args:
         symbol (str): Trading pair (e.g., 'BTCUSDT')
         interval (str): Time interval (e.g., '1m')
@@ -32,26 +98,35 @@ def insert_ohlcv(symbol: str, interval: str, ohlcv_data: list) -> int:
 
     collection_name = f"{symbol}_{interval}"
     collection = db[collection_name]
+    ensure_ohlcv_index(collection)
 
-    try:
-        existing_timestamps = {
-            doc["timestamp"] for doc in collection.find({}, {"timestamp": 1})
-        }
-
-        new_candles = [doc for doc in ohlcv_data if doc["timestamp"] not in existing_timestamps]
-
-        if not new_candles:
-            logger.info(f"No new OHLCV data to insert for {symbol} ({interval}).")
-            return 0
-
-        result = collection.insert_many(new_candles)
-        logger.info(f"Inserted {len(result.inserted_ids)} OHLCV records for {symbol} ({interval}).")
-        return len(result.inserted_ids)
+    operations = [
+        UpdateOne({"timestamp": doc["timestamp"]}, {"$setOnInsert": doc}, upsert=True)
+        for doc in ohlcv_data
+    ]
 
+    try:
+        result = collection.bulk_write(operations, ordered=False)
+        inserted = result.upserted_count
+    except errors.BulkWriteError as e:
+        # A concurrent writer inserting the same timestamp first trips the unique
+        # index: that candle is already stored, so only other errors matter.
+        details = e.details
+        inserted = details.get("nUpserted", 0)
+        others = [err for err in details.get("writeErrors", []) if err.get("code") != DUPLICATE_KEY_ERROR]
+        if others:
+            logger.error(f"[MongoDB Insert Error] {symbol} ({interval}): {len(others)} write error(s), "
+                         f"first: {others[0].get('errmsg')}")
     except errors.PyMongoError as e:
         logger.error(f"[MongoDB Insert Error] {symbol} ({interval}): {e}")
         return 0
 
+    if inserted:
+        logger.info(f"Inserted {inserted} OHLCV records for {symbol} ({interval}).")
+    else:
+        logger.info(f"No new OHLCV data to insert for {symbol} ({interval}).")
+    return inserted
+
 
 def get_all_symbols_and_intervals():
     """
@@ -76,3 +151,110 @@ def get_all_symbols_and_intervals():
     except Exception as e:
         logger.error(f"[MongoDB Error] Failed to fetch collection names: {e}")
         return []
+
+
+# ----------------------------------------
+# Browsing (MongoDB Explorer)
+# ----------------------------------------
+
+PAGE_SIZE = 500
+EXPORT_CHUNK_SIZE = 10_000
+
+
+def _timestamp_range(collection, start=None, end=None) -> dict:
+    """
+    Build a `timestamp` range filter from datetime bounds ([start, end)),
+    matching the stored representation (epoch ms ints from the exchange
+    API, or BSON dates) so the unique timestamp index serves it.
+    """
+    if start is None and end is None:
+        return {}
+    sample = collection.find_one({}, {"timestamp": 1, "_id": 0}) or {}
+    as_ms = isinstance(sample.get("timestamp"), (int, float))
+
+    def bound(value):
+        value = pd.Timestamp(value)
+        return value.value // 1_000_000 if as_ms else value.to_pydatetime()
+
+    condition = {}
+    if start is not None:
+        condition["$gte"] = bound(start)
+    if end is not None:
+        condition["$lt"] = bound(end)
+    return {"timestamp": condition}
+
+
+def _projection(fields=None):
+    if not fields:
+        return {"_id": 0}
+    return {"_id": 0, "timestamp": 1, **{field: 1 for field in fields}}
+
+
+def get_fields(symbol: str, interval: str) -> list:
+    """Field names of the newest document in the pair's collection (minus `_id`)."""
+    doc = db[f"{symbol}_{interval}"].find_one({}, sort=[("timestamp", -1)]) or {}
+    return [field for field in doc if field != "_id"]
+
+
+def count_ohlcv(symbol: str, interval: str, start=None, end=None) -> int:
+    """Number of candles in the pair's collection within [start, end)."""
+    collection = db[f"{symbol}_{interval}"]
+    query = _timestamp_range(collection, start, end)
+    if not query:
+        return collection.estimated_document_count()
+    return collection.count_documents(query)
+
+
+def fetch_ohlcv_page(symbol: str, interval: str, fields=None, start=None, end=None,
+                     after=None, before=None, limit: int = PAGE_SIZE) -> list:
+    """
+    One page of candles, oldest first, paginated on `timestamp` (keyset, not skip):
+    pass the last timestamp of the current page as `after` for the next page,
+    or its first timestamp as `before` for the previous one.
+
+    Returns:
+        list of dict: At most `limit` documents, projected to `fields` (+ timestamp).
+    """
+    collection = db[f"{symbol}_{interval}"]
+    query = _timestamp_range(collection, start, end)
+    bounds = query.setdefault("timestamp", {})
+    if after is not None:
+        bounds["$gt"] = after
+    if before is not None:
+        bounds["$lt"] = min(before, bounds["$lt"]) if "$lt" in bounds else before
+    if not bounds:
+        del query["timestamp"]
+
+    direction = -1 if before is not None else 1
+    docs = list(collection.find(query, _projection(fields)).sort("timestamp", direction).limit(limit))
+    return docs[::-1] if direction == -1 else docs
+
+
+def export_ohlcv_csv(symbol: str, interval: str, path: str, fields=None, start=None, end=None,
+                     chunk_size: int = EXPORT_CHUNK_SIZE) -> int:
+    """
+    Write the pair's candles within [start, end) to `path` as CSV, streaming
+    the cursor in chunks of `chunk_size` rows so memory stays flat.
+
+    Returns:
+        int: Number of rows written.
+    """
+    collection = db[f"{symbol}_{interval}"]
+    cursor = collection.find(_timestamp_range(collection, start, end), _projection(fields)) \
+                       .sort("timestamp", ASCENDING).batch_size(chunk_size)
+    columns = ["timestamp", *fields] if fields else None
+    written, chunk = 0, []
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        for doc in cursor:
+            chunk.append(doc)
+            if len(chunk) >= chunk_size:
+                # The first chunk's columns fix the header for the whole file
+                frame = pd.DataFrame(chunk, columns=columns)
+                frame.to_csv(f, index=False, header=written == 0)
+                columns = list(frame.columns)
+                written += len(chunk)
+                chunk = []
+        if chunk or written == 0:
+            pd.DataFrame(chunk, columns=columns).to_csv(f, index=False, header=written == 0)
+            written += len(chunk)
+    return written
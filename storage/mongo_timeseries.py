@@ -0,0 +1,232 @@
+#storage/mongo_timeseries.py
+"""
+TradeForge MongoDB Time-Series Store
+------------------------------------
+Candles (plus whatever indicator columns the pipeline computed) live in
+one time-series collection:
+
+    {"timestamp": <datetime>, "meta": {"symbol": ..., "interval": ...}, "open": ..., ...}
+
+- timeField = "timestamp", metaField = "meta" (symbol + interval), so
+  MongoDB buckets each pair's candles together and compresses them.
+- A compound (meta.symbol, meta.interval, timestamp) index serves range
+  reads and the dedup lookup below.
+- Time-series collections cannot have unique indexes (and reject upserts
+  before MongoDB 8.0), so writes are made idempotent by reading the
+  timestamps already stored in the batch's time range — an indexed
+  range scan over at most `len(batch)` documents — and inserting only
+  the missing ones.
+- `compact_duplicates()` removes duplicates written before this (or into
+  the legacy `ohlcv_data` collection). Time-series collections only accept
+  deletes by `_id` from MongoDB 7.0; on 5.1-6.x each affected pair is
+  rewritten instead (deduplicated into a staging collection, deleted by
+  its meta fields, copied back). 5.0 cannot delete from them at all.
+
+On servers without time-series support (< 5.0) a regular collection is
+used instead, and the compound index is then made unique.
+"""
+
+from pymongo import ASCENDING, errors
+from utils.tradeforge_logger import setup_logger
+
+logger = setup_logger(__name__)
+
+TIME_FIELD = "timestamp"
+META_FIELD = "meta"
+PAIR_KEYS = (f"{META_FIELD}.symbol", f"{META_FIELD}.interval")
+INDEX_NAME = "pair_timestamp"
+TIMESERIES_DELETE_VERSION = (7, 0)     # first release with arbitrary deletes on time-series collections
+STAGING_SUFFIX = "_compact_staging"
+
+
+def ensure_timeseries_collection(db, name: str, granularity: str = "minutes"):
+    """
+    Create `name` as a time-series collection if it does not exist yet,
+    and make sure the compound range-read index exists. Call once at startup.
+
+    Returns:
+        Collection: The (time-series or fallback regular) collection.
+    """
+    if name not in db.list_collection_names():
+        try:
+            db.create_collection(name, timeseries={
+                "timeField": TIME_FIELD, "metaField": META_FIELD, "granularity": granularity,
+            })
+            logger.info(f"Created time-series collection {db.name}.{name} ({granularity}).")
+        except errors.CollectionInvalid:
+            pass    # created concurrently
+        except errors.OperationFailure as e:
+            logger.warning(f"Time-series collections unavailable ({e}); using a regular collection for {name}.")
+            db.create_collection(name)
+
+    collection = db[name]
+    keys = [(PAIR_KEYS[0], ASCENDING), (PAIR_KEYS[1], ASCENDING), (TIME_FIELD, ASCENDING)]
+    try:
+        # Enforced on the regular-collection fallback ...
+        collection.create_index(keys, name=INDEX_NAME, unique=True)
+    except errors.OperationFailure:
+        # ... while time-series collections reject unique indexes
+        collection.create_index(keys, name=INDEX_NAME)
+    return collection
+
+
+def to_documents(symbol: str, interval: str, records: list) -> list:
+    """Flat candle dicts → time-series documents (symbol/interval moved into `meta`)."""
+    meta = {"symbol": symbol, "interval": interval}
+    docs = []
+    for record in records:
+        doc = {k: v for k, v in record.items() if k not in ("symbol", "interval", "_id")}
+        doc[META_FIELD] = meta
+        docs.append(doc)
+    return docs
+
+
+def insert_new_candles(collection, symbol: str, interval: str, records: list) -> int:
+    """
+    Idempotently store candles for one pair: only timestamps not already
+    present (in the database or earlier in `records`) are inserted.
+
+    Returns:
+        int: Number of documents inserted.
+    """
+    if not records:
+        return 0
+    timestamps = [r[TIME_FIELD] for r in records]
+    existing = {
+        doc[TIME_FIELD] for doc in collection.find(
+            {PAIR_KEYS[0]: symbol, PAIR_KEYS[1]: interval,
+             TIME_FIELD: {"$gte": min(timestamps), "$lte": max(timestamps)}},
+            {TIME_FIELD: 1, "_id": 0},
+        )
+    }
+
+    fresh = []
+    for record in records:
+        ts = record[TIME_FIELD]
+        if ts not in existing:
+            existing.add(ts)
+            fresh.append(record)
+    if not fresh:
+        return 0
+
+    try:
+        result = collection.insert_many(to_documents(symbol, interval, fresh), ordered=False)
+        return len(result.inserted_ids)
+    except errors.BulkWriteError as e:
+        # Regular-collection fallback: a concurrent run won the race on the unique index
+        return e.details.get("nInserted", 0)
+
+
+def server_version(db):
+    """(major, minor) of the MongoDB server behind `db`, or None if unknown."""
+    try:
+        return tuple(db.client.server_info()["versionArray"][:2])
+    except (errors.PyMongoError, KeyError, NotImplementedError):
+        return None
+
+
+def is_timeseries(collection) -> bool:
+    """True if `collection` is a server-side time-series collection."""
+    try:
+        infos = collection.database.list_collections(filter={"name": collection.name})
+        return any(info.get("type") == "timeseries" for info in infos)
+    except (errors.PyMongoError, NotImplementedError):
+        return False
+
+
+def find_duplicate_ids(collection, key_fields=(*PAIR_KEYS, TIME_FIELD)):
+    """Yield, per duplicated key, the _ids to delete (all but the first stored)."""
+    group_id = {field.replace(".", "_"): f"${field}" for field in key_fields}
+    pipeline = [
+        {"$sort": {"_id": 1}},
+        {"$group": {"_id": group_id, "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+    ]
+    for group in collection.aggregate(pipeline, allowDiskUse=True):
+        yield group["ids"][1:]
+
+
+def compact_duplicates(collection, key_fields=(*PAIR_KEYS, TIME_FIELD), batch_size: int = 1000) -> int:
+    """
+    Delete duplicate candles, keeping the first stored document of each key.
+
+    Parameters:
+        key_fields (tuple): Identity of a candle; the legacy flat collection
+            uses ("symbol", "interval", "timestamp").
+
+    Returns:
+        int: Number of documents removed.
+    """
+    if is_timeseries(collection):
+        version = server_version(collection.database)
+        if version is None or version < TIMESERIES_DELETE_VERSION:
+            return _rewrite_duplicate_pairs(collection, batch_size)
+
+    removed = 0
+    pending = []
+    for ids in find_duplicate_ids(collection, key_fields):
+        pending.extend(ids)
+        if len(pending) >= batch_size:
+            removed += collection.delete_many({"_id": {"$in": pending}}).deleted_count
+            pending = []
+    if pending:
+        removed += collection.delete_many({"_id": {"$in": pending}}).deleted_count
+    logger.info(f"Compacted {collection.name}: removed {removed} duplicate candle(s).")
+    return removed
+
+
+def _rewrite_duplicate_pairs(collection, batch_size: int = 1000) -> int:
+    """
+    Pre-7.0 time-series compaction: for every pair holding duplicates, copy
+    its deduplicated candles (first stored per timestamp) to a staging
+    collection, delete the pair with a meta-only filter, and copy them back.
+
+    Raises:
+        RuntimeError: The staging collection is not empty (an earlier run was
+            interrupted; its candles must be copied back by hand first).
+    """
+    db = collection.database
+    staging = db[collection.name + STAGING_SUFFIX]
+    if staging.estimated_document_count():
+        raise RuntimeError(f"{staging.name} is not empty: restore it into {collection.name} before compacting")
+
+    group_id = {"symbol": f"${PAIR_KEYS[0]}", "interval": f"${PAIR_KEYS[1]}", "timestamp": f"${TIME_FIELD}"}
+    pairs = {
+        (group["_id"]["symbol"], group["_id"]["interval"])
+        for group in collection.aggregate([
+            {"$group": {"_id": group_id, "count": {"$sum": 1}}},
+            {"$match": {"count": {"$gt": 1}}},
+        ], allowDiskUse=True)
+    }
+
+    removed = 0
+    for symbol, interval in sorted(pairs):
+        pair = {PAIR_KEYS[0]: symbol, PAIR_KEYS[1]: interval}
+        before = collection.count_documents(pair)
+        batch, last_ts = [], None
+        for doc in collection.find(pair).sort([(TIME_FIELD, ASCENDING), ("_id", ASCENDING)]).batch_size(batch_size):
+            if doc[TIME_FIELD] == last_ts:
+                continue
+            last_ts = doc[TIME_FIELD]
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                staging.insert_many(batch)
+                batch = []
+        if batch:
+            staging.insert_many(batch)
+
+        collection.delete_many(pair)
+        batch = []
+        for doc in staging.find().sort(TIME_FIELD, ASCENDING).batch_size(batch_size):
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                collection.insert_many(batch)
+                batch = []
+        if batch:
+            collection.insert_many(batch)
+        kept = staging.count_documents({})
+        staging.drop()
+        removed += before - kept
+
+    logger.info(f"Compacted {collection.name} by rewriting {len(pairs)} pair(s): removed {removed} duplicate candle(s).")
+    return removed
@@ -0,0 +1,293 @@
+#storage/parquet_store.py
+"""
+TradeForge Parquet Candle Store
+-------------------------------
+Columnar, append-only storage for OHLCV candles and derived features,
+partitioned Hive-style under `data/parquet/`:
+
+    {dataset}/symbol=BTCUSDT/interval=1m/date=2024-01-01/part-<uuid>-0.parquet
+
+- `dataset` separates raw candles ("ohlcv") from feature/label tables
+  ("labeled", ...); each keeps whatever numeric columns it was written with.
+- Columns are typed once on write (timestamp[ms], int64 for INT_COLUMNS,
+  float64 for every other column) and zstd-compressed, so reads skip CSV
+  parsing entirely. Fixed types keep the files of one pair unifiable
+  whatever dtype a particular write happened to carry.
+- Writes only append new files, holding the candles newer than the last
+  stored timestamp of the pair; existing files are never rewritten.
+  Derived datasets that are recomputed as a whole (labels) use
+  `replace_candles()`, which drops the pair's files first.
+- Reads prune `date=` partitions from the requested range and push the
+  column selection and timestamp filter down to the Parquet reader.
+
+Author: Amil
+"""
+
+import os
+import shutil
+import uuid
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from utils.tradeforge_logger import setup_logger
+
+logger = setup_logger(__name__)
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_ROOT = os.path.join(ROOT_DIR, "data", "parquet")
+DEFAULT_DATASET = "ohlcv"
+COMPRESSION = "zstd"
+
+TIMESTAMP_TYPE = pa.timestamp("ms")
+PAIR_COLUMNS = ("symbol", "interval")
+INT_COLUMNS = ("label",)    # stored as int64; rows without a value are dropped
+
+
+def pair_dir(symbol: str, interval: str, dataset: str = DEFAULT_DATASET, root: str = None) -> str:
+    return os.path.join(root or DEFAULT_ROOT, dataset, f"symbol={symbol}", f"interval={interval}")
+
+
+def _date_dirs(path: str) -> list:
+    """Sorted `date=YYYY-MM-DD` partition names under a pair directory."""
+    if not os.path.isdir(path):
+        return []
+    return sorted(d for d in os.listdir(path) if d.startswith("date="))
+
+
+def _partition_files(path: str, date_dir: str) -> list:
+    folder = os.path.join(path, date_dir)
+    return sorted(os.path.join(folder, f) for f in os.listdir(folder) if f.endswith(".parquet"))
+
+
+def normalize_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Type a candle frame for storage: `timestamp` → datetime64[ms] (epoch ms,
+    strings and tz-aware values accepted; UTC), INT_COLUMNS → int64, every
+    other numeric (or numeric-looking) column → float64, pair columns and
+    non-numeric leftovers dropped. Rows are sorted and deduplicated on timestamp.
+    """
+    if "timestamp" not in df.columns:
+        raise ValueError("Candle frame needs a 'timestamp' column")
+    out = pd.DataFrame(index=df.index)
+
+    ts = df["timestamp"]
+    if pd.api.types.is_numeric_dtype(ts):
+        ts = pd.to_datetime(ts, unit="ms")
+    else:
+        ts = pd.to_datetime(ts, utc=True).dt.tz_localize(None)
+    out["timestamp"] = ts.astype("datetime64[ms]")
+
+    for column in df.columns:
+        if column == "timestamp" or column in PAIR_COLUMNS or column == "_id":
+            continue
+        values = df[column]
+        if pd.api.types.is_bool_dtype(values) or pd.api.types.is_numeric_dtype(values):
+            out[column] = values.astype("float64")
+        else:
+            converted = pd.to_numeric(values, errors="coerce")
+            if converted.notna().any():
+                out[column] = converted.astype("float64")
+
+    out = out.dropna(subset=["timestamp", *[c for c in INT_COLUMNS if c in out.columns]])
+    for column in INT_COLUMNS:
+        if column in out.columns:
+            out[column] = out[column].astype("int64")
+    return out.drop_duplicates("timestamp", keep="last").sort_values("timestamp", ignore_index=True)
+
+
+def last_timestamp(symbol: str, interval: str, dataset: str = DEFAULT_DATASET, root: str = None):
+    """Newest stored timestamp of the pair (reads only the last date partition), or None."""
+    path = pair_dir(symbol, interval, dataset, root)
+    dates = _date_dirs(path)
+    if not dates:
+        return None
+    table = pq.read_table(_partition_files(path, dates[-1]), columns=["timestamp"])
+    if table.num_rows == 0:
+        return None
+    return pd.Timestamp(pc.max(table["timestamp"]).as_py())
+
+
+def write_candles(symbol: str, interval: str, df: pd.DataFrame, dataset: str = DEFAULT_DATASET,
+                  root: str = None, compression: str = COMPRESSION) -> int:
+    """
+    Append candles for one pair. Only rows newer than the last stored
+    timestamp are written (as new files, one per touched date partition).
+
+    Returns:
+        int: Number of rows written.
+    """
+    if df is None or df.empty:
+        return 0
+    frame = normalize_frame(df)
+    last = last_timestamp(symbol, interval, dataset, root)
+    if last is not None:
+        frame = frame[frame["timestamp"] > last]
+    if frame.empty:
+        return 0
+
+    frame = frame.assign(date=frame["timestamp"].dt.strftime("%Y-%m-%d"))
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    table = table.set_column(0, "timestamp", table["timestamp"].cast(TIMESTAMP_TYPE))
+    pq.write_to_dataset(
+        table,
+        root_path=pair_dir(symbol, interval, dataset, root),
+        partition_cols=["date"],
+        basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+        compression=compression,
+    )
+    logger.info(f"Parquet [{dataset}] {symbol} ({interval}): appended {len(frame)} rows.")
+    return len(frame)
+
+
+def replace_candles(symbol: str, interval: str, df: pd.DataFrame, dataset: str = DEFAULT_DATASET,
+                    root: str = None, compression: str = COMPRESSION) -> int:
+    """
+    Replace everything stored for the pair with `df` (for recomputed datasets,
+    where appending would keep the stale rows and skip the recomputed ones).
+
+    Returns:
+        int: Number of rows written.
+    """
+    path = pair_dir(symbol, interval, dataset, root)
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    written = write_candles(symbol, interval, df, dataset, root, compression)
+    logger.info(f"Parquet [{dataset}] {symbol} ({interval}): replaced with {written} rows.")
+    return written
+
+
+def _dataset(path: str, files: list):
+    """
+    Dataset over `files`, with the schemas of all writes unified (feature
+    columns may differ; int/float mixes from older writes widen to float64).
+    """
+    schema = pa.unify_schemas([pq.read_schema(f) for f in files], promote_options="permissive")
+    return ds.dataset(files, schema=schema, format="parquet")
+
+
+def read_candles(symbol: str, interval: str, start=None, end=None, columns: list = None,
+                 dataset: str = DEFAULT_DATASET, root: str = None) -> pd.DataFrame:
+    """
+    Load a pair's candles within [start, end), oldest first.
+
+    Parameters:
+        columns (list): Columns to read besides `timestamp` (None = all).
+
+    Returns:
+        pd.DataFrame: Empty if nothing is stored for the pair/range.
+    """
+    path = pair_dir(symbol, interval, dataset, root)
+    start = pd.Timestamp(start) if start is not None else None
+    end = pd.Timestamp(end) if end is not None else None
+
+    # Partition pruning: only date directories overlapping the range are opened
+    dates = [
+        d for d in _date_dirs(path)
+        if (start is None or d[5:] >= start.strftime("%Y-%m-%d"))
+        and (end is None or d[5:] <= end.strftime("%Y-%m-%d"))
+    ]
+    files = [f for d in dates for f in _partition_files(path, d)]
+    if not files:
+        return pd.DataFrame(columns=["timestamp", *(columns or [])])
+
+    dataset_ = _dataset(path, files)
+    if columns is not None:
+        columns = ["timestamp", *[c for c in columns if c != "timestamp" and c in dataset_.schema.names]]
+
+    condition = None
+    if start is not None:
+        condition = ds.field("timestamp") >= pa.scalar(start.to_pydatetime(), type=TIMESTAMP_TYPE)
+    if end is not None:
+        upper = ds.field("timestamp") < pa.scalar(end.to_pydatetime(), type=TIMESTAMP_TYPE)
+        condition = upper if condition is None else condition & upper
+
+    table = dataset_.to_table(columns=columns, filter=condition)
+    return table.to_pandas().sort_values("timestamp", ignore_index=True)
+
+
+def read_latest(symbol: str, interval: str, n: int, columns: list = None,
+                dataset: str = DEFAULT_DATASET, root: str = None) -> pd.DataFrame:
+    """Newest `n` candles, opening only as many trailing date partitions as needed (row counts from footers)."""
+    path = pair_dir(symbol, interval, dataset, root)
+    files, rows = [], 0
+    for date_dir in reversed(_date_dirs(path)):
+        part = _partition_files(path, date_dir)
+        files = part + files
+        rows += sum(pq.ParquetFile(f).metadata.num_rows for f in part)
+        if rows >= n:
+            break
+    if not files:
+        return pd.DataFrame(columns=["timestamp", *(columns or [])])
+
+    dataset_ = _dataset(path, files)
+    if columns is not None:
+        columns = ["timestamp", *[c for c in columns if c != "timestamp" and c in dataset_.schema.names]]
+    df = dataset_.to_table(columns=columns).to_pandas().sort_values("timestamp", ignore_index=True)
+    return df.tail(n).reset_index(drop=True)
+
+
+def has_candles(symbol: str, interval: str, dataset: str = DEFAULT_DATASET, root: str = None) -> bool:
+    return bool(_date_dirs(pair_dir(symbol, interval, dataset, root)))
+
+
+def list_pairs(dataset: str = DEFAULT_DATASET, root: str = None) -> list:
+    """(symbol, interval) pairs stored in `dataset`."""
+    base = os.path.join(root or DEFAULT_ROOT, dataset)
+    pairs = []
+    if not os.path.isdir(base):
+        return pairs
+    for symbol_dir in sorted(os.listdir(base)):
+        if not symbol_dir.startswith("symbol="):
+            continue
+        for interval_dir in sorted(os.listdir(os.path.join(base, symbol_dir))):
+            if interval_dir.startswith("interval="):
+                pairs.append((symbol_dir[7:], interval_dir[9:]))
+    return pairs
+
+
+def _store_mtime(symbol: str, interval: str, dataset: str = DEFAULT_DATASET, root: str = None) -> float:
+    """Modification time of the pair's newest Parquet file (0 if none)."""
+    path = pair_dir(symbol, interval, dataset, root)
+    return max((os.path.getmtime(f) for d in _date_dirs(path) for f in _partition_files(path, d)), default=0.0)
+
+
+def load_candles(symbol: str, interval: str, csv_path: str = None, dataset: str = DEFAULT_DATASET,
+                 root: str = None, prefer: str = None) -> pd.DataFrame:
+    """
+    Loader for scripts and pages: the Parquet store or `pd.read_csv(csv_path)`
+    (timestamps parsed either way); the source used is logged.
+
+    Parameters:
+        prefer (str): "parquet" or "csv" to take that source whenever it has
+            the data; None (default) takes whichever was written last, so a
+            regenerated CSV is not shadowed by an older store copy.
+
+    Raises:
+        FileNotFoundError: Neither the store nor the CSV has the data.
+    """
+    if prefer not in (None, "parquet", "csv"):
+        raise ValueError(f"prefer must be 'parquet', 'csv' or None, not {prefer!r}")
+    in_store = has_candles(symbol, interval, dataset, root)
+    csv_exists = csv_path is not None and os.path.exists(csv_path)
+    if not in_store and not csv_exists:
+        raise FileNotFoundError(f"No Parquet data for {symbol} ({interval}) [{dataset}] and no CSV at {csv_path}")
+
+    if in_store and csv_exists and prefer is None:
+        use_csv = os.path.getmtime(csv_path) > _store_mtime(symbol, interval, dataset, root)
+    else:
+        use_csv = csv_exists and (prefer == "csv" or not in_store)
+    if not use_csv:
+        logger.info(f"Loading {symbol} ({interval}) [{dataset}] from the Parquet store.")
+        return read_candles(symbol, interval, dataset=dataset, root=root)
+
+    logger.info(f"Loading {symbol} ({interval}) [{dataset}] from {csv_path}.")
+    df = pd.read_csv(csv_path)
+    if "timestamp" in df.columns:
+        numeric = pd.api.types.is_numeric_dtype(df["timestamp"])
+        df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms" if numeric else None)
+    return df
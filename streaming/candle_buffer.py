@@ -0,0 +1,168 @@
+# streaming/candle_buffer.py
+"""
+TradeForge: Rolling Candle Buffer
+---------------------------------
+Bounded, array-backed ring buffer of recent closed candles per
+(symbol, interval). The WebSocket streamer appends one candle per
+closed kline and feeds the streaming indicators from it, so no
+DataFrame is rebuilt on the hot path.
+
+Author: Amil
+"""
+
+import threading
+import numpy as np
+import pandas as pd
+
+# ────────────────────────────────────────────────────────────────
+# Configuration
+# ────────────────────────────────────────────────────────────────
+DEFAULT_CAPACITY = 500
+OHLCV_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+class CandleBuffer:
+    """
+    Fixed-capacity ring buffer of closed OHLCV candles.
+
+    Timestamps are stored as epoch milliseconds (int64) and prices/volume
+    as float64 columns. Appends are O(1); the oldest candle is overwritten
+    once the buffer is full.
+    """
+
+    __slots__ = ("capacity", "_timestamps", "_values", "_head", "_size")
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if capacity < 2:
+            raise ValueError("CandleBuffer capacity must be at least 2.")
+        self.capacity = capacity
+        self._timestamps = np.zeros(capacity, dtype=np.int64)
+        self._values = np.zeros((capacity, len(OHLCV_FIELDS)), dtype=np.float64)
+        self._head = 0   # next slot to write
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def last_timestamp(self):
+        """Epoch-ms timestamp of the newest candle, or None if empty."""
+        if self._size == 0:
+            return None
+        return int(self._timestamps[(self._head - 1) % self.capacity])
+
+    def append(self, timestamp: int, open_: float, high: float, low: float,
+               close: float, volume: float) -> bool:
+        """
+        Append a closed candle.
+
+        A candle with the same timestamp as the newest one replaces it;
+        older candles are ignored.
+
+        Returns:
+            bool: True if a new slot was written, False if the candle
+            replaced the newest one or was ignored.
+        """
+        timestamp = int(timestamp)
+        last = self.last_timestamp
+        if last is not None and timestamp <= last:
+            if timestamp == last:
+                self._values[(self._head - 1) % self.capacity] = (open_, high, low, close, volume)
+            return False
+
+        self._timestamps[self._head] = timestamp
+        self._values[self._head] = (open_, high, low, close, volume)
+        self._head = (self._head + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+        return True
+
+    def _order(self, n: int) -> np.ndarray:
+        """Physical slot indices of the newest `n` candles, oldest first."""
+        start = self._head - n
+        return np.arange(start, self._head) % self.capacity
+
+    def timestamps(self, n: int = None) -> np.ndarray:
+        """Newest `n` timestamps (epoch ms), oldest first."""
+        n = self._size if n is None else min(n, self._size)
+        return self._timestamps[self._order(n)]
+
+    def column(self, field: str, n: int = None) -> np.ndarray:
+        """Newest `n` values of an OHLCV field, oldest first."""
+        n = self._size if n is None else min(n, self._size)
+        return self._values[self._order(n), OHLCV_FIELDS.index(field)]
+
+    def closes(self, n: int = None) -> np.ndarray:
+        return self.column("close", n)
+
+    def latest(self) -> dict:
+        """Return the newest candle as a dict, or None if empty."""
+        if self._size == 0:
+            return None
+        slot = (self._head - 1) % self.capacity
+        candle = dict(zip(OHLCV_FIELDS, self._values[slot].tolist()))
+        candle["timestamp"] = int(self._timestamps[slot])
+        return candle
+
+    def load_frame(self, df: pd.DataFrame) -> int:
+        """
+        Warm-start the buffer from a DataFrame with 'timestamp' and OHLCV columns.
+
+        Returns:
+            int: Number of candles appended.
+        """
+        if df is None or df.empty:
+            return 0
+
+        ts = df["timestamp"]
+        if pd.api.types.is_numeric_dtype(ts):
+            ts_ms = ts.to_numpy(dtype=np.int64)
+        else:
+            ts_ms = pd.to_datetime(ts).to_numpy(dtype="datetime64[ms]").astype(np.int64)
+
+        order = np.argsort(ts_ms, kind="stable")[-self.capacity:]
+        values = df[list(OHLCV_FIELDS)].to_numpy(dtype=np.float64)
+
+        appended = 0
+        for i in order:
+            appended += self.append(ts_ms[i], *values[i])
+        return appended
+
+    def to_frame(self) -> pd.DataFrame:
+        """Materialize the buffered candles as a DataFrame (oldest first)."""
+        order = self._order(self._size)
+        df = pd.DataFrame(self._values[order], columns=list(OHLCV_FIELDS))
+        df.insert(0, "timestamp", pd.to_datetime(self._timestamps[order], unit="ms"))
+        return df
+
+
+# ────────────────────────────────────────────────────────────────
+# Per-(symbol, interval) registry
+# ────────────────────────────────────────────────────────────────
+_buffers = {}
+_buffers_lock = threading.Lock()
+
+
+def get_buffer(symbol: str, interval: str, capacity: int = DEFAULT_CAPACITY) -> CandleBuffer:
+    """Return the shared buffer for (symbol, interval), creating it if needed."""
+    key = (symbol.upper(), interval)
+    with _buffers_lock:
+        buffer = _buffers.get(key)
+        if buffer is None:
+            buffer = CandleBuffer(capacity)
+            _buffers[key] = buffer
+        return buffer
+
+
+def swap_buffers(buffers: dict = None) -> dict:
+    """Install `buffers` (default: a fresh, empty registry) and return the previous one."""
+    global _buffers
+    with _buffers_lock:
+        previous, _buffers = _buffers, ({} if buffers is None else buffers)
+    return previous
+
+
+def reset_buffers() -> None:
+    """Drop all registered buffers."""
+    with _buffers_lock:
+        _buffers.clear()
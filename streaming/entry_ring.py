@@ -0,0 +1,161 @@
+# streaming/entry_ring.py
+"""
+TradeForge: Live Entry Ring Buffers
+-----------------------------------
+Preallocated, fixed-capacity NumPy structured-array rings holding the
+streamer's recent log/prediction entries, one ring per symbol.
+
+Appends are O(1) (one slot write). Readers never take the writer's lock:
+each ring carries a sequence counter that the writer makes odd while a
+slot is being written and even again afterwards (a seqlock). A reader
+copies the slots it wants and retries if the counter moved, so a
+snapshot is always consistent and ingestion never waits on dashboards.
+
+Author: Amil
+"""
+
+import threading
+import time
+import numpy as np
+import pandas as pd
+
+# ────────────────────────────────────────────────────────────────
+# Configuration
+# ────────────────────────────────────────────────────────────────
+DEFAULT_CAPACITY = 5000
+SYMBOL_WIDTH = 20
+
+ENTRY_DTYPE = np.dtype([
+    ("timestamp", "datetime64[ms]"),
+    ("symbol", f"U{SYMBOL_WIDTH}"),
+    ("close", np.float64),
+    ("rsi", np.float64),
+    ("rsi_signal", np.int8),       # RSI threshold rule: 1 buy, -1 sell, 0 neutral
+    ("prediction", np.float64),    # NaN when no prediction was made
+])
+
+_MAX_READ_RETRIES = 1000
+
+
+class EntryRing:
+    """Single-writer ring of entries with lock-free, seqlock-validated snapshots."""
+
+    __slots__ = ("capacity", "_data", "_count", "_seq", "_write_lock")
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError("EntryRing capacity must be at least 1.")
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=ENTRY_DTYPE)
+        self._count = 0     # total entries ever appended
+        self._seq = 0       # even = stable, odd = write in progress
+        self._write_lock = threading.Lock()   # writers only; readers never take it
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    @property
+    def total(self) -> int:
+        """Entries appended since creation (including overwritten ones)."""
+        return self._count
+
+    def append(self, timestamp, symbol: str, close: float, rsi: float,
+               rsi_signal: int = 0, prediction=None) -> None:
+        with self._write_lock:
+            slot = self._count % self.capacity
+            self._seq += 1
+            self._data[slot] = (
+                np.datetime64(pd.Timestamp(timestamp).as_unit("ms").to_datetime64(), "ms"),
+                symbol,
+                close,
+                np.nan if rsi is None else rsi,
+                rsi_signal or 0,
+                np.nan if prediction is None else prediction,
+            )
+            self._count += 1
+            self._seq += 1
+
+    def snapshot(self, n: int = None) -> np.ndarray:
+        """
+        Copy of the newest `n` entries (all if None), oldest first.
+
+        Raises:
+            RuntimeError: If a consistent copy could not be taken (writer
+            never paused), which should not happen in practice.
+        """
+        for _ in range(_MAX_READ_RETRIES):
+            seq = self._seq
+            if seq & 1:
+                time.sleep(0)   # let the writer finish its slot
+                continue
+            count = self._count
+            size = min(count, self.capacity)
+            n_read = size if n is None else min(n, size)
+            idx = np.arange(count - n_read, count) % self.capacity
+            out = self._data[idx]          # fancy indexing → copy
+            if self._seq == seq:
+                return out
+        raise RuntimeError("EntryRing snapshot kept racing the writer.")
+
+
+def entries_to_frame(entries: np.ndarray) -> pd.DataFrame:
+    """Structured entries → DataFrame with a datetime64 'timestamp' column."""
+    return pd.DataFrame({name: entries[name] for name in ENTRY_DTYPE.names})
+
+
+def entries_to_dicts(entries: np.ndarray) -> list:
+    """Structured entries → list of dicts (prediction None when missing)."""
+    rows = []
+    for ts, symbol, close, rsi, rsi_signal, prediction in entries.tolist():
+        rows.append({
+            "timestamp": pd.Timestamp(ts),
+            "symbol": symbol,
+            "close": close,
+            "rsi": None if np.isnan(rsi) else rsi,
+            "rsi_signal": rsi_signal,
+            "prediction": None if np.isnan(prediction) else int(prediction),
+        })
+    return rows
+
+
+# ────────────────────────────────────────────────────────────────
+# Per-symbol registry
+# ────────────────────────────────────────────────────────────────
+class EntryStore:
+    """Per-symbol EntryRings with merged, time-ordered reads."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self._rings = {}
+        self._lock = threading.Lock()    # only guards ring creation
+
+    def ring(self, symbol: str) -> EntryRing:
+        key = symbol.upper()
+        ring = self._rings.get(key)
+        if ring is None:
+            with self._lock:
+                ring = self._rings.get(key)
+                if ring is None:
+                    ring = EntryRing(self.capacity)
+                    self._rings = {**self._rings, key: ring}   # copy-on-write for readers
+        return ring
+
+    def append(self, symbol: str, timestamp, close: float, rsi: float,
+               rsi_signal: int = 0, prediction=None) -> None:
+        self.ring(symbol).append(timestamp, symbol.upper(), close, rsi, rsi_signal, prediction)
+
+    def latest(self, limit: int = 10, symbol: str = None) -> np.ndarray:
+        """Newest `limit` entries for one symbol or across all, oldest first."""
+        if symbol is not None:
+            ring = self._rings.get(symbol.upper())
+            return ring.snapshot(limit) if ring else np.zeros(0, dtype=ENTRY_DTYPE)
+
+        parts = [ring.snapshot(limit) for ring in self._rings.values()]
+        if not parts:
+            return np.zeros(0, dtype=ENTRY_DTYPE)
+        merged = np.concatenate(parts)
+        merged = merged[np.argsort(merged["timestamp"], kind="stable")]
+        return merged[-limit:] if limit is not None else merged
+
+    def symbols(self) -> list:
+        return list(self._rings)
@@ -0,0 +1,226 @@
+# streaming/multiplex.py
+"""
+TradeForge: Multiplexed Combined-Stream Ingestion
+--------------------------------------------------
+asyncio engine that watches many `<symbol>@kline_<interval>` streams from
+one process. Streams are sharded across combined-stream connections
+(`/stream?streams=a/b/c`); each connection's receive loop only parses the
+envelope and drops the payload on a bounded per-(symbol, interval) queue.
+A worker task per queue runs that pair's handler, so a slow symbol never
+stalls the socket or the other symbols.
+
+Usage:
+    python -m streaming.multiplex --symbols BTCUSDT ETHUSDT SOLUSDT --interval 1m
+
+Author: Amil
+"""
+
+import argparse
+import asyncio
+import inspect
+import json
+import random
+import threading
+from urllib.parse import urlencode
+
+from websockets.asyncio.client import connect
+from websockets.exceptions import WebSocketException
+
+from utils.tradeforge_logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# ────────────────────────────────────────────────────────────────
+# Configuration
+# ────────────────────────────────────────────────────────────────
+COMBINED_STREAM_URL = "wss://stream.binance.com:9443/stream"
+STREAMS_PER_CONNECTION = 100   # exchange allows up to 1024 per connection
+QUEUE_SIZE = 1000              # pending messages per (symbol, interval)
+RECONNECT_BASE_S = 1.0
+RECONNECT_MAX_S = 60.0
+
+
+def stream_name(symbol: str, interval: str) -> str:
+    return f"{symbol.lower()}@kline_{interval}"
+
+
+def shard_streams(streams: list, per_connection: int = STREAMS_PER_CONNECTION) -> list:
+    """Split stream names into connection-sized groups."""
+    return [streams[i:i + per_connection] for i in range(0, len(streams), per_connection)]
+
+
+class MultiplexStreamer:
+    """
+    Combined-stream ingestion for many (symbol, interval) pairs.
+
+    Handlers are called as `handler(symbol, interval, kline)` with the raw
+    kline dict (`k` field). Coroutine handlers are awaited on the loop;
+    plain functions run in a worker thread so blocking I/O (SQL, model
+    inference) does not block the event loop.
+    """
+
+    def __init__(self, pairs: list, handler=None, base_url: str = COMBINED_STREAM_URL,
+                 streams_per_connection: int = STREAMS_PER_CONNECTION,
+                 queue_size: int = QUEUE_SIZE, closed_only: bool = True):
+        self.base_url = base_url
+        self.streams_per_connection = streams_per_connection
+        self.queue_size = queue_size
+        self.closed_only = closed_only
+
+        self._pairs = {}      # stream name -> (SYMBOL, interval)
+        self._handlers = {}   # stream name -> handler
+        for symbol, interval in pairs:
+            self.register(symbol, interval, handler)
+
+        self._queues = {}
+        self._tasks = []
+        self._connections = set()
+        self._running = False
+        self._loop = None
+        self.stats = {"received": 0, "routed": 0, "dropped": 0, "errors": 0, "reconnects": 0}
+
+    # ── Routing ─────────────────────────────────────────────────
+    def register(self, symbol: str, interval: str, handler) -> None:
+        """Set the handler for one pair (before `run()`)."""
+        name = stream_name(symbol, interval)
+        self._pairs[name] = (symbol.upper(), interval)
+        self._handlers[name] = handler
+
+    @property
+    def streams(self) -> list:
+        return list(self._pairs)
+
+    def connection_urls(self) -> list:
+        return [
+            f"{self.base_url}?{urlencode({'streams': '/'.join(group)}, safe='@/')}"
+            for group in shard_streams(self.streams, self.streams_per_connection)
+        ]
+
+    def _route(self, raw: str) -> None:
+        """Parse the combined-stream envelope and enqueue without awaiting."""
+        self.stats["received"] += 1
+        try:
+            envelope = json.loads(raw)
+            name = envelope["stream"]
+            kline = envelope["data"]["k"]
+        except (ValueError, KeyError, TypeError):
+            self.stats["errors"] += 1
+            return
+
+        queue = self._queues.get(name)
+        if queue is None or (self.closed_only and not kline.get("x")):
+            return
+        try:
+            queue.put_nowait(kline)
+            self.stats["routed"] += 1
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+            logger.warning(f"Queue full for {name}; dropping kline {kline.get('t')}")
+
+    async def _worker(self, name: str) -> None:
+        symbol, interval = self._pairs[name]
+        handler = self._handlers[name]
+        queue = self._queues[name]
+        is_async = inspect.iscoroutinefunction(handler)
+        while True:
+            kline = await queue.get()
+            try:
+                if handler is None:
+                    pass
+                elif is_async:
+                    await handler(symbol, interval, kline)
+                else:
+                    await asyncio.to_thread(handler, symbol, interval, kline)
+            except Exception:
+                self.stats["errors"] += 1
+                logger.exception(f"Handler failed for {symbol} [{interval}]")
+            finally:
+                queue.task_done()
+
+    # ── Connections ─────────────────────────────────────────────
+    async def _connection(self, url: str) -> None:
+        attempt = 0
+        while self._running:
+            try:
+                async with connect(url, max_queue=None) as ws:
+                    self._connections.add(ws)
+                    attempt = 0
+                    logger.info(f"Combined stream connected ({url.count('@')} streams)")
+                    try:
+                        async for raw in ws:
+                            self._route(raw)
+                    finally:
+                        self._connections.discard(ws)
+            except (WebSocketException, OSError, asyncio.TimeoutError) as e:
+                # Drops, and rejected/timed-out handshakes (e.g. HTTP 429/5xx), all back off
+                if not self._running:
+                    break
+                logger.warning(f"Combined stream dropped: {e!r}")
+            if not self._running:
+                break
+            self.stats["reconnects"] += 1
+            delay = min(RECONNECT_MAX_S, RECONNECT_BASE_S * (2 ** attempt))
+            attempt += 1
+            await asyncio.sleep(random.uniform(delay / 2, delay))
+
+    async def run(self) -> None:
+        """Connect all shards and dispatch until `stop()` is called."""
+        self._loop = asyncio.get_running_loop()
+        self._running = True
+        self._queues = {name: asyncio.Queue(self.queue_size) for name in self._pairs}
+        workers = [asyncio.create_task(self._worker(name)) for name in self._pairs]
+        readers = [asyncio.create_task(self._connection(url)) for url in self.connection_urls()]
+        self._tasks = workers + readers
+        try:
+            await asyncio.gather(*readers)
+            # Let handlers finish what was already received
+            await asyncio.gather(*(q.join() for q in self._queues.values()))
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            self._running = False
+
+    async def stop(self) -> None:
+        """Close every connection; `run()` returns once queued messages are handled."""
+        self._running = False
+        for ws in list(self._connections):
+            await ws.close()
+
+    # ── Thread helpers (for sync callers such as Streamlit) ─────
+    def start_in_thread(self) -> threading.Thread:
+        thread = threading.Thread(target=asyncio.run, args=(self.run(),), daemon=True)
+        thread.start()
+        return thread
+
+    def stop_threadsafe(self, timeout: float = 10) -> None:
+        if self._loop is not None and self._running:
+            asyncio.run_coroutine_threadsafe(self.stop(), self._loop).result(timeout)
+
+
+# ────────────────────────────────────────────────────────────────
+# Entry Point
+# ────────────────────────────────────────────────────────────────
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Watch many kline streams from one process.")
+    parser.add_argument("--symbols", nargs="+", required=True)
+    parser.add_argument("--interval", default="1m")
+    parser.add_argument("--per-connection", type=int, default=STREAMS_PER_CONNECTION)
+    args = parser.parse_args(argv)
+
+    from streaming.websocket_streamer import process_kline, warm_start_buffer
+
+    pairs = [(symbol.upper(), args.interval) for symbol in args.symbols]
+    for symbol, interval in pairs:
+        warm_start_buffer(symbol, interval)
+
+    streamer = MultiplexStreamer(pairs, process_kline, streams_per_connection=args.per_connection)
+    logger.info(f"Watching {len(pairs)} pairs over {len(streamer.connection_urls())} connection(s)")
+    try:
+        asyncio.run(streamer.run())
+    except KeyboardInterrupt:
+        logger.info("Stopped by user.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+# streaming/reconnect.py
+"""
+TradeForge: Reconnecting WebSocket + Gap Backfill
+-------------------------------------------------
+`ReconnectingWebSocket` keeps a websocket-client `WebSocketApp` alive:
+when `run_forever` returns (server drop, network error) it reconnects
+after an exponential, jittered backoff until `stop()` is called.
+
+`backfill_gap` fetches the closed candles between the last processed
+one and now over REST and hands them, oldest first, to the same kline
+handler the live stream uses, so rolling indicators continue exactly
+as if nothing had been missed. The streamer runs it from `on_connect`,
+i.e. before the first live message after every (re)connect, on the
+socket's dispatch thread, so the catch-up is capped (`max_candles`):
+longer outages only replay the newest candles and leave the older part
+of the gap to api/backfill.
+
+Author: Amil
+"""
+
+import random
+import socket
+import threading
+import time
+
+import websocket
+
+from api import exchange_api
+from api.backfill import INTERVAL_MS
+from utils.tradeforge_logger import setup_logger
+
+logger = setup_logger(__name__)
+
+RECONNECT_BASE_S = 1.0
+RECONNECT_MAX_S = 60.0
+
+
+def backoff_delay(attempt: int, base: float = RECONNECT_BASE_S, cap: float = RECONNECT_MAX_S,
+                  rng=random) -> float:
+    """Exponential backoff with jitter: uniform in [d/2, d], d = min(cap, base * 2^attempt)."""
+    delay = min(cap, base * (2 ** attempt))
+    return rng.uniform(delay / 2, delay)
+
+
+def backfill_gap(symbol: str, interval: str, last_ms: int, handler, now_ms: int = None,
+                 limit: int = exchange_api.KLINES_MAX_LIMIT, max_candles: int = None) -> int:
+    """
+    Feed candles that closed after `last_ms` (open time) and before `now_ms`
+    through `handler(kline)`, oldest first, as closed WebSocket-style klines
+    ({'t', 'o', 'h', 'l', 'c', 'v', 'x': True}).
+
+    Parameters:
+        max_candles (int): Only the newest `max_candles` of a longer gap are fed.
+
+    Returns:
+        int: Number of candles handed to `handler`. A failed REST page ends
+        the backfill early (the rest of the gap is retried on the next connect).
+    """
+    if last_ms is None:
+        return 0
+    step = INTERVAL_MS[interval]
+    now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+    last_closed = (now_ms // step) * step - step    # open time of the newest closed candle
+    cursor = last_ms + step
+    if cursor > last_closed:
+        return 0
+    if max_candles is not None and (last_closed - cursor) // step + 1 > max_candles:
+        skipped_to = last_closed - (max_candles - 1) * step
+        logger.warning(
+            f"Gap for {symbol} [{interval}] is {(last_closed - cursor) // step + 1} candles; "
+            f"replaying the newest {max_candles}. Fill {cursor}..{skipped_to - step} with api/backfill."
+        )
+        cursor = skipped_to
+
+    logger.info(f"Backfilling {symbol} [{interval}]: {(last_closed - cursor) // step + 1} missed candle(s)")
+    handled = 0
+    while cursor <= last_closed:
+        page = exchange_api.fetch_ohlcv(symbol, interval, limit=limit, start_time=cursor, end_time=last_closed)
+        if not page:
+            logger.warning(f"Backfill for {symbol} [{interval}] stopped at {cursor}: no data returned")
+            break
+        for candle in page:
+            ts = int(candle["timestamp"])
+            if ts < cursor or ts > last_closed:
+                continue
+            handler({
+                "t": ts, "o": candle["open"], "h": candle["high"], "l": candle["low"],
+                "c": candle["close"], "v": candle["volume"], "x": True,
+            })
+            handled += 1
+            cursor = ts + step
+        if len(page) < limit:
+            break
+    return handled
+
+
+class ReconnectingWebSocket:
+    """
+    `WebSocketApp` wrapper that reconnects with jittered backoff.
+
+    Parameters:
+        on_connect (callable): Called with no arguments after every successful
+            (re)connect, before any message of that connection is handled.
+    """
+
+    def __init__(self, url: str, on_message, on_connect=None, on_error=None,
+                 base_delay: float = RECONNECT_BASE_S, max_delay: float = RECONNECT_MAX_S):
+        self.url = url
+        self.on_message = on_message
+        self.on_connect = on_connect
+        self.on_error = on_error
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.stats = {"connects": 0, "reconnects": 0}
+        self._stop = threading.Event()
+        self._app = None
+
+    def _on_open(self, ws):
+        self.stats["connects"] += 1
+        self._attempt = 0
+        logger.info(f"WebSocket connected: {self.url}")
+        if self.on_connect is not None:
+            try:
+                self.on_connect()
+            except Exception:
+                logger.exception("on_connect failed; continuing with live data")
+
+    def _on_error(self, ws, error):
+        logger.error(f"WebSocket error: {error}")
+        if self.on_error is not None:
+            self.on_error(error)
+
+    def _on_close(self, ws, close_status_code, close_msg):
+        logger.info(f"WebSocket connection closed ({close_status_code}).")
+
+    def run(self) -> None:
+        """Connect and reconnect until `stop()` (blocking)."""
+        self._stop.clear()
+        self._attempt = 0
+        while not self._stop.is_set():
+            self._app = websocket.WebSocketApp(
+                self.url,
+                on_open=self._on_open,
+                on_message=self.on_message,
+                on_error=self._on_error,
+                on_close=self._on_close,
+            )
+            try:
+                self._app.run_forever()
+            except Exception:
+                logger.exception("WebSocket run_forever crashed")
+            if self._stop.is_set():
+                break
+            delay = backoff_delay(self._attempt, self.base_delay, self.max_delay)
+            self._attempt += 1
+            self.stats["reconnects"] += 1
+            logger.warning(f"WebSocket dropped; reconnecting in {delay:.1f}s (attempt {self._attempt})")
+            self._stop.wait(delay)
+        self._app = None
+
+    def stop(self) -> None:
+        self._stop.set()
+        app = self._app
+        if app is None:
+            return
+        app.keep_running = False
+        sock = app.sock
+        if sock is not None and sock.sock is not None:
+            # Send the close frame and shut the socket down, but leave closing
+            # the fd to run_forever's thread: closing it from here would not
+            # wake that thread's selector, and it would sit out its timeout.
+            try:
+                sock.send_close()
+                sock.sock.shutdown(socket.SHUT_RDWR)
+            except (OSError, websocket.WebSocketException):
+                pass
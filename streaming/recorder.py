@@ -0,0 +1,191 @@
+# streaming/recorder.py
+"""
+TradeForge: WebSocket Record & Replay
+-------------------------------------
+`MessageRecorder` appends raw WebSocket messages to a gzip-compressed,
+length-prefixed log; `replay()` feeds such a log back through a message
+handler (e.g. `websocket_streamer.on_message`) at recorded speed, N x
+speed, or as fast as possible.
+
+Record format (repeated, little-endian):
+
+    int64  receive time, epoch ns
+    uint32 payload length in bytes
+    bytes  UTF-8 message
+
+Each `MessageRecorder` session is its own gzip member, so a log can be
+appended to across runs. The recorder sync-flushes the compressor every
+`flush_interval_s` seconds (and on `flush()`), so a crash loses at most
+the messages received since the last flush; the reader stops cleanly at
+the truncated end.
+
+During replay, the driver sets a clock to each message's recorded
+receive time, so anything that reads it (e.g. trade cooldowns) behaves
+the same on every run.
+
+Author: Amil
+"""
+
+import argparse
+import gzip
+import os
+import struct
+import tempfile
+import threading
+import time
+
+from utils.tradeforge_logger import setup_logger
+
+logger = setup_logger(__name__)
+
+_HEADER = struct.Struct("<qI")
+FLUSH_INTERVAL_S = 1.0
+
+
+class MessageRecorder:
+    """Thread-safe, append-only recorder of raw messages."""
+
+    def __init__(self, path: str, compresslevel: int = 6, flush_interval_s: float = FLUSH_INTERVAL_S):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = gzip.open(path, "ab", compresslevel=compresslevel)
+        self._lock = threading.Lock()
+        self.flush_interval_s = flush_interval_s
+        self._last_flush = time.monotonic()
+        self.count = 0
+
+    def record(self, message, received_ns: int = None) -> None:
+        payload = message.encode("utf-8") if isinstance(message, str) else bytes(message)
+        header = _HEADER.pack(time.time_ns() if received_ns is None else received_ns, len(payload))
+        with self._lock:
+            self._file.write(header + payload)
+            self.count += 1
+            now = time.monotonic()
+            if now - self._last_flush >= self.flush_interval_s:
+                self._flush_locked(now)
+
+    def _flush_locked(self, now: float) -> None:
+        # Z_SYNC_FLUSH: everything written so far becomes decodable from the file
+        self._file.flush()
+        self._file.fileobj.flush()
+        self._last_flush = now
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked(time.monotonic())
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_recording(path: str):
+    """
+    Yield (received_ns, message) pairs from a recording, in order.
+
+    A truncated final record (e.g. the recorder was killed) ends the
+    iteration with a warning instead of raising.
+    """
+    with gzip.open(path, "rb") as f:
+        while True:
+            try:
+                header = f.read(_HEADER.size)
+                if not header:
+                    return
+                if len(header) < _HEADER.size:
+                    raise EOFError
+                received_ns, length = _HEADER.unpack(header)
+                payload = f.read(length)
+                if len(payload) < length:
+                    raise EOFError
+            except EOFError:
+                logger.warning(f"Recording {path} ends with a truncated record; stopping there.")
+                return
+            yield received_ns, payload.decode("utf-8")
+
+
+class ReplayClock:
+    """Wall clock stand-in that reports the recorded time of the message being replayed."""
+
+    def __init__(self, start_s: float = 0.0):
+        self.now = start_s
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def replay(path: str, handler, speed: float = None, clock: ReplayClock = None,
+           sleep=time.sleep, limit: int = None) -> dict:
+    """
+    Feed a recording through `handler(message)`.
+
+    Parameters:
+        speed (float): 1.0 = recorded pace, N = N x faster, None/0 = no pacing.
+        clock (ReplayClock): Set to each message's recorded receive time before
+            the handler runs (pass the same object to the code under test).
+        limit (int): Stop after this many messages.
+
+    Returns:
+        dict: messages, errors, elapsed_s, msgs_per_sec.
+    """
+    stats = {"messages": 0, "errors": 0}
+    first_ns = None
+    start = time.perf_counter()
+
+    for received_ns, message in iter_recording(path):
+        if limit is not None and stats["messages"] >= limit:
+            break
+        if first_ns is None:
+            first_ns = received_ns
+        if speed:
+            due = (received_ns - first_ns) / 1e9 / speed
+            wait = due - (time.perf_counter() - start)
+            if wait > 0:
+                sleep(wait)
+        if clock is not None:
+            clock.now = received_ns / 1e9
+        try:
+            handler(message)
+        except Exception as e:
+            stats["errors"] += 1
+            logger.error(f"Replay handler failed on message {stats['messages']}: {e}")
+        stats["messages"] += 1
+
+    elapsed = time.perf_counter() - start
+    stats["elapsed_s"] = elapsed
+    stats["msgs_per_sec"] = stats["messages"] / elapsed if elapsed > 0 else 0.0
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded TradeForge WebSocket log.")
+    parser.add_argument("path", help="Recording (.bin.gz) written by MessageRecorder")
+    parser.add_argument("--speed", default="max", help="1 = real time, N = N x faster, 'max' = no pacing")
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--db-url", default=None,
+                        help="Database to replay into (default: a scratch SQLite file, discarded afterwards)")
+    args = parser.parse_args(argv)
+
+    from sql.db_engine import configure_engine
+    from sql.models import Base
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = args.db_url or f"sqlite:///{os.path.join(tmp, 'replay.db')}"
+        Base.metadata.create_all(configure_engine(db_url, config={}))
+
+        from streaming import websocket_streamer
+        speed = None if args.speed == "max" else float(args.speed)
+        stats = websocket_streamer.replay_recording(args.path, speed=speed, limit=args.limit)
+        websocket_streamer.get_sql_writer().stop()
+        logger.info(f"Replay into {db_url} finished: {stats}")
+
+
+if __name__ == "__main__":
+    main()
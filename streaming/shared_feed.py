@@ -0,0 +1,249 @@
+# streaming/shared_feed.py
+"""
+TradeForge: Shared-Memory Live Feed
+-----------------------------------
+The streamer publishes each closed candle (OHLCV + RSI + prediction) of
+a (symbol, interval) into a named shared-memory segment; any number of
+other processes (Streamlit workers, notebooks) map the same segment and
+read the newest candles without touching SQL or the streamer's Python
+objects.
+
+Segment layout (all little-endian, 8-byte aligned):
+
+    header  8 x uint64   magic, version, seq, count, capacity,
+                         record size, last publish (epoch ns), closed flag
+    records capacity x FEED_DTYPE ring, slot = index % capacity
+
+`seq` is a seqlock: the writer makes it odd before touching a record
+and even again after. Readers copy the rows they want and retry if
+`seq` moved, so a snapshot is never torn and the writer never waits.
+
+Author: Amil
+"""
+
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from utils.shm import attach_shared_memory
+
+# ────────────────────────────────────────────────────────────────
+# Configuration
+# ────────────────────────────────────────────────────────────────
+DEFAULT_CAPACITY = 1000
+FEED_MAGIC = 0x54464645454431    # "TFFEED1"
+FEED_VERSION = 1
+
+FEED_DTYPE = np.dtype([
+    ("timestamp", np.int64),       # candle open time, epoch ms
+    ("open", np.float64),
+    ("high", np.float64),
+    ("low", np.float64),
+    ("close", np.float64),
+    ("volume", np.float64),
+    ("rsi", np.float64),           # NaN until the RSI is warmed up
+    ("prediction", np.float64),    # NaN when no prediction was made
+])
+
+_HEADER_FIELDS = ("magic", "version", "seq", "count", "capacity", "record_size", "updated_ns", "closed")
+_H = {name: i for i, name in enumerate(_HEADER_FIELDS)}
+HEADER_SIZE = len(_HEADER_FIELDS) * 8
+
+_MAX_READ_RETRIES = 1000
+
+
+def feed_name(symbol: str, interval: str) -> str:
+    """Shared-memory segment name for (symbol, interval), e.g. 'tf_feed_BTCUSDT_1m'."""
+    return f"tf_feed_{symbol.upper()}_{interval}"
+
+
+def _segment_size(capacity: int) -> int:
+    return HEADER_SIZE + capacity * FEED_DTYPE.itemsize
+
+
+def _views(shm: shared_memory.SharedMemory, capacity: int):
+    header = np.ndarray((len(_HEADER_FIELDS),), dtype=np.uint64, buffer=shm.buf)
+    records = np.ndarray((capacity,), dtype=FEED_DTYPE, buffer=shm.buf, offset=HEADER_SIZE)
+    return header, records
+
+
+# ────────────────────────────────────────────────────────────────
+# Writer (the streamer process)
+# ────────────────────────────────────────────────────────────────
+class SharedFeedWriter:
+    """Owns the segment for one (symbol, interval); single writer."""
+
+    def __init__(self, symbol: str, interval: str, capacity: int = DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError("SharedFeedWriter capacity must be at least 1.")
+        self.symbol = symbol.upper()
+        self.interval = interval
+        self.capacity = capacity
+        self.name = feed_name(symbol, interval)
+        size = _segment_size(capacity)
+        try:
+            self._shm = shared_memory.SharedMemory(name=self.name, create=True, size=size)
+        except FileExistsError:
+            # Left behind by a streamer that did not shut down cleanly
+            stale = attach_shared_memory(self.name)
+            stale.close()
+            stale.unlink()
+            self._shm = shared_memory.SharedMemory(name=self.name, create=True, size=size)
+
+        self._header, self._records = _views(self._shm, capacity)
+        self._records[:] = np.zeros(capacity, dtype=FEED_DTYPE)
+        self._header[:] = 0
+        self._header[_H["magic"]] = FEED_MAGIC
+        self._header[_H["version"]] = FEED_VERSION
+        self._header[_H["capacity"]] = capacity
+        self._header[_H["record_size"]] = FEED_DTYPE.itemsize
+
+    @property
+    def count(self) -> int:
+        return int(self._header[_H["count"]])
+
+    def publish(self, timestamp, open_: float, high: float, low: float, close: float,
+                volume: float, rsi: float = None, prediction=None) -> None:
+        """Write one candle into the next slot (O(1), never blocks on readers). No-op once closed."""
+        header = self._header
+        if header is None:
+            return
+        count = int(header[_H["count"]])
+        if not isinstance(timestamp, (int, np.integer)):
+            timestamp = pd.Timestamp(timestamp).value // 1_000_000   # ns → ms
+        record = (
+            timestamp, open_, high, low, close, volume,
+            np.nan if rsi is None else rsi,
+            np.nan if prediction is None else prediction,
+        )
+        header[_H["seq"]] += 1                      # odd: write in progress
+        self._records[count % self.capacity] = record
+        header[_H["count"]] = count + 1
+        header[_H["updated_ns"]] = time.time_ns()
+        header[_H["seq"]] += 1                      # even: stable again
+
+    def close(self, unlink: bool = True) -> None:
+        """Mark the feed closed for readers, then release (and by default remove) the segment."""
+        if self._shm is None:
+            return
+        self._header[_H["closed"]] = 1
+        self._header = self._records = None
+        self._shm.close()
+        if unlink:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+        self._shm = None
+
+
+# ────────────────────────────────────────────────────────────────
+# Reader (any process)
+# ────────────────────────────────────────────────────────────────
+class SharedFeedReader:
+    """
+    Read-only view of a published feed.
+
+    `records` maps the ring in place (no copy, writeable=False); use
+    `snapshot()` / `frame()` for a consistent, time-ordered copy of the
+    newest rows.
+
+    Raises:
+        FileNotFoundError: If no streamer is publishing this feed.
+        ValueError: If the segment is not a TradeForge feed of this version.
+    """
+
+    def __init__(self, symbol: str, interval: str):
+        self.symbol = symbol.upper()
+        self.interval = interval
+        self.name = feed_name(symbol, interval)
+        self._shm = attach_shared_memory(self.name)
+        header = np.ndarray((len(_HEADER_FIELDS),), dtype=np.uint64, buffer=self._shm.buf).tolist()
+        if header[_H["magic"]] != FEED_MAGIC or header[_H["version"]] != FEED_VERSION \
+                or header[_H["record_size"]] != FEED_DTYPE.itemsize:
+            self._shm.close()
+            raise ValueError(f"Shared memory '{self.name}' is not a TradeForge feed (v{FEED_VERSION}).")
+        self.capacity = header[_H["capacity"]]
+        self._header, self.records = _views(self._shm, self.capacity)
+        self._header.flags.writeable = False
+        self.records.flags.writeable = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def count(self) -> int:
+        """Candles published since the feed was created."""
+        return int(self._header[_H["count"]])
+
+    @property
+    def updated_at(self) -> pd.Timestamp:
+        """Wall-clock time of the last publish (NaT if none yet)."""
+        ns = int(self._header[_H["updated_ns"]])
+        return pd.Timestamp(ns, unit="ns") if ns else pd.NaT
+
+    @property
+    def closed(self) -> bool:
+        """True once the writer has shut the feed down."""
+        return bool(self._header[_H["closed"]])
+
+    def snapshot(self, n: int = None) -> np.ndarray:
+        """Consistent copy of the newest `n` records (all if None), oldest first."""
+        header = self._header
+        for _ in range(_MAX_READ_RETRIES):
+            seq = int(header[_H["seq"]])
+            if seq & 1:
+                time.sleep(0)
+                continue
+            count = int(header[_H["count"]])
+            size = min(count, self.capacity)
+            n_read = size if n is None else min(n, size)
+            out = self.records[np.arange(count - n_read, count) % self.capacity]
+            if int(header[_H["seq"]]) == seq:
+                return out
+        raise RuntimeError(f"Shared feed '{self.name}' snapshot kept racing the writer.")
+
+    def frame(self, n: int = None) -> pd.DataFrame:
+        """Newest `n` candles as a DataFrame (datetime 'timestamp', NaN-free 'prediction' → Int64)."""
+        rows = self.snapshot(n)
+        df = pd.DataFrame({name: rows[name] for name in FEED_DTYPE.names})
+        df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
+        df["prediction"] = df["prediction"].astype("Int64")
+        return df
+
+    def close(self) -> None:
+        if self._shm is None:
+            return
+        self._header = self.records = None
+        self._shm.close()
+        self._shm = None
+
+
+def read_shared_feed(symbol: str, interval: str, n: int = None, max_age_s: float = None):
+    """
+    One-shot read of the newest `n` candles of a live feed.
+
+    Parameters:
+        max_age_s (float): Treat the feed as gone if its last publish is older than this.
+
+    Returns:
+        pd.DataFrame or None: None when no streamer is publishing (symbol, interval):
+        no segment, a closed one, or (with `max_age_s`) a stalled one.
+    """
+    try:
+        reader = SharedFeedReader(symbol, interval)
+    except (FileNotFoundError, ValueError):
+        return None
+    with reader:
+        if reader.closed:
+            return None
+        if max_age_s is not None:
+            updated = reader.updated_at
+            if pd.isna(updated) or (pd.Timestamp(time.time_ns(), unit="ns") - updated).total_seconds() > max_age_s:
+                return None
+        return reader.frame(n)
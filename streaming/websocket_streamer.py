@@ -2,9 +2,10 @@
 """
 TradeForge: WebSocket Streaming & Auto-Trading Engine
 ------------------------------------------------------
-Streams live OHLCV candles from Binance, computes RSI,
-makes ML predictions, logs to SQL, and executes trades 
-based on prediction signal with cooldown + toggle config.
+Streams live OHLCV candles from Binance, keeps a rolling
+candle buffer per symbol/interval, computes RSI, makes ML
+predictions, logs to SQL, and executes trades based on
+prediction signal with cooldown + toggle config.
 
 Author: Amil
 """
@@ -12,30 +13,32 @@ Author: Amil
 import json
 import time
 import threading
-import websocket
 import pandas as pd
 import joblib
 import os
-import sys  # 🔹 added
+import sys
 
 # ────────────────────────────────────────────────────────────────
-# Path Setup: Ensure project root and sql/ are on sys.path
+# Path Setup: Ensure project root is on sys.path
 # ────────────────────────────────────────────────────────────────
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if BASE_DIR not in sys.path:
     sys.path.append(BASE_DIR)
 
-SQL_DIR = os.path.join(BASE_DIR, "sql")
-if SQL_DIR not in sys.path:
-    sys.path.append(SQL_DIR)
-
 # ────────────────────────────────────────────────────────────────
 # Internal Imports (now safe)
 # ────────────────────────────────────────────────────────────────
 from utils.tradeforge_logger import setup_logger
-from signal_engine.indicators_core import calculate_rsi
-from sql_handler import insert_ohlcv_sql, insert_predictions_sql  # 🔹 updated import
+from streaming.candle_buffer import get_buffer, swap_buffers
+from streaming.entry_ring import EntryStore, entries_to_dicts, entries_to_frame
+from streaming.shared_feed import SharedFeedWriter
+from streaming.recorder import MessageRecorder, ReplayClock, replay
+from streaming.reconnect import ReconnectingWebSocket, backfill_gap
+from signal_engine.streaming_indicators import StreamingRSI
+from sql.write_behind import get_sql_writer
+from sql.query_handler import fetch_ohlcv_history
 from services.trade_executor import place_test_order
+from utils.config_service import auto_trading_config, strategy_config
 
 # ────────────────────────────────────────────────────────────────
 # Logger & Model Initialization
@@ -72,177 +75,377 @@ STREAM_URL = f"wss://stream.binance.com:9443/ws/{SYMBOL}@kline_{INTERVAL}"
 
 TRADE_QUANTITY = 0.001
 TRADE_INTERVAL_SECONDS = 300
-last_trade_time = 0
+_last_trade_times = {}  # symbol -> time of the last auto-trade
+clock = time.time       # swapped for a ReplayClock during replays
+DRY_RUN = False         # True: never place orders (replays, benchmarks)
 
+# Defaults; live values come from config/strategy_params.json
 RSI_PERIOD = 14
 RSI_OVERBOUGHT = 70
 RSI_OVERSOLD = 30
 
-AUTO_TRADING_CONFIG_PATH = os.path.join(BASE_DIR, "config", "auto_trading_status.json")
+BUFFER_CAPACITY = 500  # closed candles kept in memory per symbol/interval
+_rsi_indicators = {}   # (symbol, interval) -> StreamingRSI
 
 # ────────────────────────────────────────────────────────────────
-# Thread-safe storage for live logs / predictions
+# Live logs / predictions: per-symbol ring buffers, lock-free reads
 # ────────────────────────────────────────────────────────────────
-_latest_entries = []
-_entries_lock = threading.Lock()
-MAX_ENTRIES = 100  # store last 100 entries
+MAX_ENTRIES = int(os.environ.get("TRADEFORGE_MAX_ENTRIES", 5000))  # per symbol
+_entry_store = EntryStore(MAX_ENTRIES)
+
+def get_latest_entries(limit=10, symbol=None):
+    """Return the latest `limit` entries (all symbols, or one) as dicts, oldest first."""
+    return entries_to_dicts(_entry_store.latest(limit, symbol))
 
-def get_latest_entries(limit=10):
-    """Return the latest `limit` entries in a thread-safe way."""
-    with _entries_lock:
-        return list(_latest_entries[-limit:])
+def get_latest_frame(limit=1000, symbol=None) -> pd.DataFrame:
+    """Return the latest `limit` entries as a DataFrame, straight from the ring buffers."""
+    return entries_to_frame(_entry_store.latest(limit, symbol))
 
 def append_entry(entry: dict):
-    """Append a new log/prediction entry safely."""
-    with _entries_lock:
-        _latest_entries.append(entry)
-        if len(_latest_entries) > MAX_ENTRIES:
-            _latest_entries.pop(0)
+    """Append a new log/prediction entry to its symbol's ring."""
+    _entry_store.append(
+        entry["symbol"], entry["timestamp"], entry["close"], entry.get("rsi"),
+        entry.get("rsi_signal", 0), entry.get("prediction")
+    )
+
+# ────────────────────────────────────────────────────────────────
+# Shared-memory feed for other processes (see streaming/shared_feed.py)
+# ────────────────────────────────────────────────────────────────
+SHARED_FEED_ENABLED = os.environ.get("TRADEFORGE_SHARED_FEED", "1") != "0"
+SHARED_FEED_CAPACITY = 1000
+_feed_writers = {}
+
+def publish_shared_feed(symbol: str, interval: str, candle: dict, rsi: float, prediction) -> None:
+    """Publish a closed candle to the (symbol, interval) shared-memory feed."""
+    global SHARED_FEED_ENABLED
+    if not SHARED_FEED_ENABLED:
+        return
+    key = (symbol.upper(), interval)
+    try:
+        writer = _feed_writers.get(key)
+        if writer is None:
+            writer = SharedFeedWriter(symbol, interval, SHARED_FEED_CAPACITY)
+            _feed_writers[key] = writer
+            logger.info(f"Publishing {key[0]} [{interval}] to shared memory '{writer.name}'.")
+        writer.publish(
+            candle['timestamp'], candle['open'], candle['high'], candle['low'],
+            candle['close'], candle['volume'], rsi, prediction
+        )
+    except OSError as e:
+        # e.g. no /dev/shm in a container; SQL and in-process readers still work
+        SHARED_FEED_ENABLED = False
+        logger.warning(f"Shared-memory feed disabled: {e}")
+
+def close_shared_feeds() -> None:
+    for writer in _feed_writers.values():
+        writer.close()
+    _feed_writers.clear()
 
 # ────────────────────────────────────────────────────────────────
 # Utility Functions
 # ────────────────────────────────────────────────────────────────
 def is_auto_trading_enabled() -> bool:
-    try:
-        with open(AUTO_TRADING_CONFIG_PATH, "r") as f:
-            config = json.load(f)
-            return config.get("enabled", False)
-    except FileNotFoundError:
-        logger.warning("Auto-trading config not found. Defaulting to disabled.")
-        return False
+    """Cached flag from config/auto_trading_status.json (reloaded on file change)."""
+    return bool(auto_trading_config().get().get("enabled", False))
+
+def get_strategy_params() -> tuple:
+    """(rsi_period, rsi_buy_threshold, rsi_sell_threshold) from the cached strategy config."""
+    params = strategy_config().get()
+    return (
+        int(params.get("rsi_period", RSI_PERIOD)),
+        float(params.get("rsi_buy_threshold", RSI_OVERSOLD)),
+        float(params.get("rsi_sell_threshold", RSI_OVERBOUGHT)),
+    )
+
+def use_rsi_rule_fallback() -> bool:
+    """Opt-in: use the RSI rule as the prediction when no model is loaded (off by default)."""
+    return bool(strategy_config().get().get("rsi_rule_fallback", False))
+
+def rsi_signal(rsi: float, buy_threshold: float, sell_threshold: float) -> int:
+    """1 = oversold (buy), -1 = overbought (sell), 0 = neutral."""
+    if rsi <= buy_threshold:
+        return 1
+    if rsi >= sell_threshold:
+        return -1
+    return 0
 
 def preprocess_data(df: pd.DataFrame) -> pd.DataFrame:
     features = ['open', 'high', 'low', 'close', 'volume', 'rsi']
     return df[features].tail(1)
 
+def get_rsi_indicator(symbol: str, interval: str, period: int = RSI_PERIOD) -> StreamingRSI:
+    """Return the streaming RSI state for (symbol, interval), creating it if needed."""
+    key = (symbol.upper(), interval)
+    indicator = _rsi_indicators.get(key)
+    if indicator is None or indicator.period != period:
+        indicator = StreamingRSI(period)
+        _rsi_indicators[key] = indicator
+    return indicator
+
+def rebuild_rsi_indicator(symbol: str, interval: str, period: int) -> StreamingRSI:
+    """Replay the buffered closes into a fresh RSI (e.g. after the period changed)."""
+    symbol = symbol.upper()
+    indicator = StreamingRSI(period)
+    for price in get_buffer(symbol, interval, BUFFER_CAPACITY).closes():
+        indicator.update(price)
+    _rsi_indicators[(symbol, interval)] = indicator
+    return indicator
+
+def warm_start_buffer(symbol: str = None, interval: str = None) -> int:
+    """Seed the candle buffer and RSI state for (symbol, interval) from SQL history."""
+    symbol = (symbol or SYMBOL).upper()
+    interval = interval or INTERVAL
+    buffer = get_buffer(symbol, interval, BUFFER_CAPACITY)
+    try:
+        history = fetch_ohlcv_history(symbol, interval, limit=BUFFER_CAPACITY)
+    except Exception as e:
+        logger.warning(f"Buffer warm-start failed for {symbol} [{interval}]: {e}")
+        return 0
+    loaded = buffer.load_frame(history)
+
+    rebuild_rsi_indicator(symbol, interval, get_strategy_params()[0])
+    logger.info(f"Warm-started {symbol} [{interval}] buffer with {loaded} candles.")
+    return loaded
+
 def should_place_trade(prediction: int, last_trade_time: float) -> bool:
-    return (time.time() - last_trade_time) >= TRADE_INTERVAL_SECONDS
+    return (clock() - last_trade_time) >= TRADE_INTERVAL_SECONDS
 
 # ────────────────────────────────────────────────────────────────
 # WebSocket Event Handlers
 # ────────────────────────────────────────────────────────────────
-def on_message(ws, message):
-    global last_trade_time
+def process_kline(symbol: str, interval: str, kline: dict, trade: bool = True) -> None:
+    """
+    Handle one kline payload for (symbol, interval): buffer, persist,
+    update RSI, predict, log and auto-trade. Only closed candles are used,
+    each once (a candle already in the buffer is skipped).
+    Shared by the single-stream WebSocketApp, gap backfill (trade=False)
+    and streaming/multiplex.py.
+    """
+    if not kline['x']:
+        return
 
-    try:
-        data = json.loads(message)
-        kline = data['k']
-        if not kline['x']:
-            return
-
-        candle = {
-            'timestamp': pd.to_datetime(kline['t'], unit='ms'),
-            'open': float(kline['o']),
-            'high': float(kline['h']),
-            'low': float(kline['l']),
-            'close': float(kline['c']),
-            'volume': float(kline['v'])
-        }
-
-        df = pd.DataFrame([candle])
-        df['rsi'] = calculate_rsi(df, period=RSI_PERIOD)
-
-        # Handle insufficient candles gracefully
-        if df['rsi'].isnull().any():
-            logger.info(f"⏳ Waiting for RSI (need at least {RSI_PERIOD} candles)...")
-            return
+    symbol = symbol.upper()
+    candle = {
+        'timestamp': pd.to_datetime(kline['t'], unit='ms'),
+        'open': float(kline['o']),
+        'high': float(kline['h']),
+        'low': float(kline['l']),
+        'close': float(kline['c']),
+        'volume': float(kline['v'])
+    }
+
+    buffer = get_buffer(symbol, interval, BUFFER_CAPACITY)
+    is_new = buffer.append(
+        kline['t'], candle['open'], candle['high'],
+        candle['low'], candle['close'], candle['volume']
+    )
+    if not is_new:
+        # Already processed, e.g. backfilled over REST and then delivered live
+        return
 
-        try:
-            insert_ohlcv_sql(SYMBOL.upper(), INTERVAL, df)
-        except Exception as e:
-            logger.warning(f"SQL insert failed (OHLCV): {e}")
-
-        if model:
-            X = preprocess_data(df)
-            prediction = model.predict(X)[0]
-            logger.info(
-                f"[{model_name}] Prediction: {prediction} | "
-                f"Close: {df['close'].iloc[0]:.2f} | RSI: {df['rsi'].iloc[0]:.2f}"
-            )
-        else:
-            prediction = None
-            logger.warning("Model not loaded. Skipping prediction.")
-
-        entry = {
-            "timestamp": candle['timestamp'],
-            "symbol": SYMBOL.upper(),
-            "close": candle['close'],
-            "rsi": df['rsi'].iloc[0],
-            "prediction": prediction
-        }
-        append_entry(entry)
+    df = pd.DataFrame([candle])
+
+    # Persist every closed candle so restarts can warm-start the buffer
+    # (queued; the write-behind thread batches it into one transaction)
+    sql_writer = get_sql_writer()
+    sql_writer.submit_ohlcv(symbol, interval, df.copy())
+
+    rsi_period, rsi_buy, rsi_sell = get_strategy_params()
+    rsi_indicator = _rsi_indicators.get((symbol, interval))
+    if rsi_indicator is None or rsi_indicator.period != rsi_period:
+        # New pair or period changed in Settings: replay the buffer (includes this candle)
+        rsi = rebuild_rsi_indicator(symbol, interval, rsi_period).value
+    else:
+        rsi = rsi_indicator.update(candle['close'])
+
+    # Handle insufficient candles gracefully
+    if rsi is None:
+        logger.info(
+            f"⏳ Waiting for RSI on {symbol} [{interval}] "
+            f"(need {rsi_period} candles, have {len(buffer)})..."
+        )
+        return
 
-        try:
-            df['prediction'] = prediction
-            df['confidence'] = None
-            insert_predictions_sql(SYMBOL.upper(), INTERVAL, df)
-        except Exception as e:
-            logger.warning(f"SQL insert failed (Prediction): {e}")
-
-        if is_auto_trading_enabled() and prediction in [1, -1]:
-            if should_place_trade(prediction, last_trade_time):
-                action = "BUY" if prediction == 1 else "SELL"
-                logger.info(f"Placing {action} order...")
-                place_test_order(SYMBOL.upper(), action, TRADE_QUANTITY)
-                last_trade_time = time.time()
-        else:
-            logger.info("Auto-trading disabled or no actionable signal.")
+    df['rsi'] = rsi
+    rule_signal = rsi_signal(rsi, rsi_buy, rsi_sell)
 
+    if model:
+        X = preprocess_data(df)
+        prediction = model.predict(X)[0]
+        logger.info(
+            f"[{model_name}] {symbol} Prediction: {prediction} | "
+            f"Close: {df['close'].iloc[0]:.2f} | RSI: {df['rsi'].iloc[0]:.2f}"
+        )
+    elif use_rsi_rule_fallback():
+        # No model, and the strategy opts into the RSI threshold rule
+        prediction = rule_signal
+        logger.warning(
+            f"Model not loaded. Using RSI rule ({rsi_buy:g}/{rsi_sell:g}) → {prediction}"
+        )
+    else:
+        prediction = None
+        logger.warning("Model not loaded. Skipping prediction.")
+
+    entry = {
+        "timestamp": candle['timestamp'],
+        "symbol": symbol,
+        "close": candle['close'],
+        "rsi": df['rsi'].iloc[0],
+        "rsi_signal": rule_signal,
+        "prediction": prediction
+    }
+    append_entry(entry)
+    publish_shared_feed(symbol, interval, candle, rsi, prediction)
+
+    df['prediction'] = prediction
+    df['confidence'] = None
+    sql_writer.submit_predictions(symbol, interval, df)
+
+    if trade and not DRY_RUN and is_auto_trading_enabled() and prediction in [1, -1]:
+        if should_place_trade(prediction, _last_trade_times.get(symbol, 0)):
+            action = "BUY" if prediction == 1 else "SELL"
+            logger.info(f"Placing {action} order for {symbol}...")
+            place_test_order(symbol, action, TRADE_QUANTITY)
+            _last_trade_times[symbol] = clock()
+    else:
+        logger.info("Auto-trading disabled or no actionable signal.")
+
+def on_message(ws, message):
+    if _recorder is not None:
+        _recorder.record(message)
+    try:
+        data = json.loads(message)
+        process_kline(SYMBOL, INTERVAL, data['k'])
     except Exception as e:
         logger.exception("Exception in WebSocket message handler")
 
-def on_error(ws, error):
-    logger.error(f"WebSocket error: {error}")
-
-def on_close(ws, close_status_code, close_msg):
-    logger.info("WebSocket connection closed.")
+def backfill_missed_candles(symbol: str = None, interval: str = None) -> int:
+    """
+    Process candles that closed while disconnected (REST), so the buffer,
+    RSI and SQL have no gap before live messages resume. No trades are
+    placed for backfilled candles. Runs on the socket's dispatch thread, so
+    at most BUFFER_CAPACITY candles are replayed (enough to refill the buffer).
+    """
+    symbol = (symbol or SYMBOL).upper()
+    interval = interval or INTERVAL
+    last_ms = get_buffer(symbol, interval, BUFFER_CAPACITY).last_timestamp
+    handled = backfill_gap(
+        symbol, interval, last_ms,
+        lambda kline: process_kline(symbol, interval, kline, trade=False),
+        now_ms=int(clock() * 1000), max_candles=BUFFER_CAPACITY
+    )
+    if handled:
+        logger.info(f"Backfilled {handled} candle(s) for {symbol} [{interval}].")
+    return handled
 
-def on_open(ws):
-    logger.info(f"WebSocket connected: {STREAM_URL}")
+# ────────────────────────────────────────────────────────────────
+# Record & Replay (see streaming/recorder.py)
+# ────────────────────────────────────────────────────────────────
+RECORD_PATH = os.environ.get("TRADEFORGE_RECORD_PATH")  # record every live message if set
+_recorder = None
+
+def start_recording(path: str) -> None:
+    """Append every raw message received from now on to `path`."""
+    global _recorder
+    stop_recording()
+    _recorder = MessageRecorder(path)
+    logger.info(f"⏺ Recording WebSocket messages to {path}")
+
+def stop_recording() -> None:
+    global _recorder
+    if _recorder is not None:
+        recorder, _recorder = _recorder, None
+        recorder.close()
+        logger.info(f"⏹ Recorded {recorder.count} message(s) to {recorder.path}")
+
+def replay_recording(path: str, speed: float = None, limit: int = None, dry_run: bool = True) -> dict:
+    """
+    Run a recording through on_message offline (no network).
+
+    The trade-cooldown clock follows the recorded receive times and, with
+    `dry_run`, no orders are placed. The shared-memory feed is not written,
+    so a replay never clobbers a live streamer's feed. Every replay starts
+    from empty candle buffers, RSI state, cooldowns and entry rings (the
+    live ones are put back afterwards) and is not recorded, so repeated
+    replays in one process do the same work. Queued SQL writes are
+    flushed before returning, so the stats cover the whole pipeline.
+
+    Returns:
+        dict: replay stats (messages, errors, elapsed_s, msgs_per_sec) plus
+        the SQL write-behind metrics under "sql".
+    """
+    global clock, DRY_RUN, SHARED_FEED_ENABLED, _rsi_indicators, _last_trade_times, _entry_store, _recorder
+    saved = clock, DRY_RUN, SHARED_FEED_ENABLED, _rsi_indicators, _last_trade_times, _entry_store, _recorder
+    clock, DRY_RUN, SHARED_FEED_ENABLED = ReplayClock(), dry_run, False
+    _rsi_indicators, _last_trade_times, _entry_store, _recorder = {}, {}, EntryStore(MAX_ENTRIES), None
+    saved_buffers = swap_buffers()
+    try:
+        stats = replay(path, lambda message: on_message(None, message), speed=speed,
+                       clock=clock, limit=limit)
+        sql_writer = get_sql_writer()
+        flush_start = time.perf_counter()
+        sql_writer.flush(timeout=60)
+        stats["sql_flush_s"] = time.perf_counter() - flush_start
+        stats["sql"] = sql_writer.metrics()
+    finally:
+        clock, DRY_RUN, SHARED_FEED_ENABLED, _rsi_indicators, _last_trade_times, _entry_store, _recorder = saved
+        swap_buffers(saved_buffers)
+    return stats
 
 # ────────────────────────────────────────────────────────────────
 # Start / Stop WebSocket Stream (singleton)
 # ────────────────────────────────────────────────────────────────
 _ws_thread = None
 _ws_running = False
-_ws_app = None
+_ws_client = None
 
 def start_stream():
-    global _ws_thread, _ws_running, _ws_app
+    global _ws_thread, _ws_running, _ws_client
     if _ws_running:
         logger.info("⚠️ WebSocket stream already running. Skipping duplicate start.")
         return
 
     _ws_running = True  # set immediately to prevent race conditions
 
+    if RECORD_PATH:
+        start_recording(RECORD_PATH)
+
+    # Config changes are picked up by background watchers, not per message
+    auto_trading_config().start_watcher()
+    strategy_config().start_watcher()
+    warm_start_buffer()
+
+    # Reconnects with jittered backoff; every (re)connect first backfills the gap
+    _ws_client = ReconnectingWebSocket(STREAM_URL, on_message, on_connect=backfill_missed_candles)
+
     def run():
-        global _ws_app, _ws_running
-        _ws_app = websocket.WebSocketApp(
-            STREAM_URL,
-            on_message=on_message,
-            on_error=on_error,
-            on_close=on_close,
-            on_open=on_open
-        )
+        global _ws_running
         try:
-            _ws_app.run_forever()
+            _ws_client.run()
         finally:
             _ws_running = False
-            _ws_app = None
 
     _ws_thread = threading.Thread(target=run, daemon=True)
     _ws_thread.start()
     logger.info("🚀 WebSocket stream started.")
 
 def stop_stream():
-    global _ws_app, _ws_running
+    global _ws_running
     if not _ws_running:
         logger.info("ℹ️ No active WebSocket stream to stop.")
         return
-    if _ws_app:
+    if _ws_client:
         logger.info("🛑 Closing WebSocket stream...")
-        _ws_app.close()
+        _ws_client.stop()
     _ws_running = False
+    close_shared_feeds()
+    stop_recording()
+
+    # Write out candles/predictions still waiting in the write-behind queue
+    sql_writer = get_sql_writer()
+    if not sql_writer.flush():
+        logger.warning("SQL write-behind flush timed out.")
+    logger.info(f"SQL write-behind: {sql_writer.metrics()}")
 
 # ────────────────────────────────────────────────────────────────
 # Entry Point
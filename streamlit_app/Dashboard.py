@@ -3,10 +3,12 @@
 TradeForge Streamlit Dashboard
 ------------------------------
 Main landing page for the TradeForge dashboard.
-Displays real-time OHLCV data from SQL or falls back to CSV if unavailable.
+Displays real-time OHLCV data from SQL, falling back to the Parquet store
+and then to CSV if unavailable.
 """
 
 import os
+import sys
 import streamlit as st
 import pandas as pd
 from datetime import datetime
@@ -16,6 +18,11 @@ import importlib.util
 # Paths & Root (fixed to streamlit_app level)
 # -------------------------------
 ROOT_DIR = os.path.abspath(os.path.dirname(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(ROOT_DIR, ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from storage import parquet_store
 
 # -------------------------------
 # Import SQL Query Handler
@@ -51,24 +58,34 @@ INTERVAL = st.sidebar.selectbox("Interval", ["1m", "5m", "15m"])
 show_sma = st.sidebar.checkbox("Show SMA", value=True)
 show_ema = st.sidebar.checkbox("Show EMA", value=True)
 show_rsi = st.sidebar.checkbox("Show RSI", value=True)
+NUM_CANDLES = st.sidebar.number_input("Candles to Load", min_value=50, max_value=100_000, value=100, step=50)
 
 # -------------------------------
 # Load Chart Data (with Debug Info + auto CSV fallback)
 # -------------------------------
 @st.cache_data(ttl=10)
-def load_chart_data(symbol, interval):
+def load_chart_data(symbol, interval, limit=100):
     df = pd.DataFrame()
     source = "None"
 
     # Try database
     try:
-        df = fetch_ohlcv_data(symbol, interval)
+        df = fetch_ohlcv_data(symbol, interval, limit=limit)
         if df is not None and not df.empty:
             source = "Database"
     except Exception as e:
         st.sidebar.error(f"DB Error: {e}")
 
-    # If DB empty, fallback to CSV (auto-detect)
+    # If DB empty, try the Parquet store (typed, only the newest partitions are read)
+    if df is None or df.empty:
+        try:
+            df = parquet_store.read_latest(symbol, interval, limit)
+            if not df.empty:
+                source = "Parquet"
+        except Exception as e:
+            st.sidebar.error(f"Parquet Error: {e}")
+
+    # Still empty: fallback to CSV (auto-detect)
     if df is None or df.empty:
         data_dir = os.path.join(ROOT_DIR, "..", "data")
         expected_file = f"{symbol}_{interval}.csv"
@@ -82,6 +99,7 @@ def load_chart_data(symbol, interval):
                 st.sidebar.warning(f"⚠️ Exact file {expected_file} not found, using {candidates[0]} instead.")
 
         if os.path.exists(csv_path):
+            st.sidebar.info("💡 Import CSVs with scripts/import_csv_to_parquet.py for faster loads.")
             try:
                 df = pd.read_csv(csv_path)
                 if not df.empty:
@@ -102,7 +120,7 @@ def load_chart_data(symbol, interval):
 
     return df, source
 
-chart_df, source_used = load_chart_data(SYMBOL, INTERVAL)
+chart_df, source_used = load_chart_data(SYMBOL, INTERVAL, int(NUM_CANDLES))
 
 # -------------------------------
 # KPI Metrics
@@ -9,7 +9,7 @@ import pandas as pd
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
 # Import functions from your script
-from scripts.populate_sql_from_mongo import transfer_data, run_sql_populator, MONGO_DB, MONGO_COLLECTION
+from scripts.populate_sql_from_mongo import run_sql_populator, MONGO_DB, MONGO_COLLECTION
 
 # --- Page Configuration ---
 st.set_page_config(page_title="SQL Seeder", layout="wide")
@@ -17,6 +17,7 @@ st.title("🗄️ SQL Seeder")
 st.write("""
 Sync OHLCV data from MongoDB into your SQLite database.
 Select symbols & intervals, then run the SQL populator. 🚀
+Only candles newer than the last sync are copied; pairs run in parallel.
 """)
 
 # --- Symbol & Interval Selection ---
@@ -34,13 +35,14 @@ intervals = st.multiselect(
 
 # --- Run SQL Populator ---
 if st.button("⚡ Run SQL Populator"):
-    total_tables = 0
-    for symbol in symbols:
-        for interval in intervals:
-            st.info(f"🔄 Processing {symbol} [{interval}]...")
-            transfer_data(symbol, interval)
-            total_tables += 1
-    st.success(f"🏆 SQL Sync Complete: {total_tables} tables processed!")
+    with st.spinner(f"🔄 Syncing {len(symbols) * len(intervals)} pairs..."):
+        results = run_sql_populator(symbols, intervals)
+    st.dataframe(pd.DataFrame(
+        [(s, i, "failed" if n is None else n) for (s, i), n in sorted(results.items())],
+        columns=["Symbol", "Interval", "New Rows"]
+    ))
+    synced = sum(1 for n in results.values() if n is not None)
+    st.success(f"🏆 SQL Sync Complete: {synced}/{len(results)} pairs synced!")
 
 # --- Display MongoDB info ---
 st.write("🗃️ MongoDB Database:", MONGO_DB)
@@ -1,5 +1,8 @@
 ﻿# streamlit_app/pages/05_MongoDB_Explorer.py
 
+import hashlib
+import os
+
 import streamlit as st
 import pandas as pd
 from storage import mongo_handler
@@ -11,6 +14,15 @@ st.set_page_config(page_title="🗄️ MongoDB Explorer", layout="wide")
 st.title("🗄️ MongoDB Explorer")
 st.write("Browse and download OHLCV data directly from your MongoDB instance. 📊")
 
+
+@st.cache_resource
+def ensure_indexes():
+    """Build the unique timestamp indexes once per server process (page reads range over them)."""
+    return mongo_handler.ensure_all_indexes()
+
+
+ensure_indexes()
+
 # -----------------------------
 # Symbol & Interval Selection
 # -----------------------------
@@ -24,20 +36,48 @@ selected_interval = st.selectbox("Select Interval ⏱️", intervals_for_symbol)
 st.write(f"Displaying MongoDB data for **{selected_symbol}** [{selected_interval}]")
 
 # -----------------------------
-# Fetch Data
+# Columns & Date Range
+# -----------------------------
+all_fields = [f for f in mongo_handler.get_fields(selected_symbol, selected_interval) if f != "timestamp"]
+fields = st.multiselect("Columns 🧩", all_fields, default=[f for f in all_fields if f in
+                        ("open", "high", "low", "close", "volume")] or all_fields)
+
+start = end = None
+if st.checkbox("Filter by date 📅"):
+    col1, col2 = st.columns(2)
+    start = pd.Timestamp(col1.date_input("From", value=pd.Timestamp.utcnow().date() - pd.Timedelta(days=7)))
+    end = pd.Timestamp(col2.date_input("To (inclusive)")) + pd.Timedelta(days=1)
+
+page_size = st.select_slider("Rows per page", options=[100, 250, 500, 1000, 5000], value=mongo_handler.PAGE_SIZE)
+
+
+@st.cache_data(ttl=60)
+def cached_count(symbol, interval, start, end):
+    return mongo_handler.count_ohlcv(symbol, interval, start, end)
+
+
+total = cached_count(selected_symbol, selected_interval, start, end)
+
+# -----------------------------
+# Keyset Pagination
 # -----------------------------
-collection_name = f"{selected_symbol}_{selected_interval}"
-data_cursor = mongo_handler.db[collection_name].find()
-df = pd.DataFrame(list(data_cursor))
+# Cursor = (after, before) timestamps; reset whenever the selection changes
+selection = (selected_symbol, selected_interval, tuple(fields), start, end, page_size)
+if st.session_state.get("mongo_explorer_selection") != selection:
+    st.session_state.mongo_explorer_selection = selection
+    st.session_state.mongo_explorer_cursor = (None, None)
+    st.session_state.mongo_explorer_page = 1
 
-# Clean Data
-if "_id" in df.columns:
-    df.drop(columns=["_id"], inplace=True)
+after, before = st.session_state.mongo_explorer_cursor
+docs = mongo_handler.fetch_ohlcv_page(selected_symbol, selected_interval, fields, start, end,
+                                      after=after, before=before, limit=page_size)
+df = pd.DataFrame(docs, columns=["timestamp", *fields])
 
-if "timestamp" in df.columns:
+# Timestamps are epoch ms from the exchange API (or BSON dates)
+if pd.api.types.is_numeric_dtype(df["timestamp"]):
+    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
+else:
     df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
-    df = df.dropna(subset=["timestamp"])
-    df["timestamp"] = df["timestamp"].dt.strftime("%Y-%m-%d %H:%M:%S")
 
 # -----------------------------
 # Display & Visualize Data
@@ -45,21 +85,23 @@ if "timestamp" in df.columns:
 if df.empty:
     st.warning("⚠️ No data available for this selection.")
 else:
-    # Full Data Table
-    st.subheader("📋 Full Data Table")
+    page = st.session_state.mongo_explorer_page
+    pages = max(1, -(-total // page_size))
+    st.subheader(f"📋 Page {page} of {pages} ({total:,} records)")
     st.dataframe(df)
 
-    # Download CSV button
-    csv = df.to_csv(index=False).encode("utf-8")
-    st.download_button(
-        label="⬇️ Download CSV",
-        data=csv,
-        file_name=f"{selected_symbol}_{selected_interval}.csv",
-        mime="text/csv"
-    )
-
-    # Basic Stats
-    st.subheader("📊 Data Summary")
+    nav_prev, nav_next, _ = st.columns([1, 1, 6])
+    if nav_prev.button("⬅️ Previous", disabled=page <= 1):
+        st.session_state.mongo_explorer_cursor = (None, docs[0]["timestamp"])
+        st.session_state.mongo_explorer_page = page - 1
+        st.experimental_rerun()
+    if nav_next.button("Next ➡️", disabled=len(docs) < page_size or page >= pages):
+        st.session_state.mongo_explorer_cursor = (docs[-1]["timestamp"], None)
+        st.session_state.mongo_explorer_page = page + 1
+        st.experimental_rerun()
+
+    # Basic Stats (current page)
+    st.subheader("📊 Data Summary (this page)")
     st.write(df.describe(include="number"))
 
     # Close price chart
@@ -72,9 +114,29 @@ else:
         st.subheader("📈 Volume Chart")
         st.bar_chart(df.set_index("timestamp")["volume"])
 
-    # Last 10 rows
-    st.subheader("🕑 Last 10 Records")
-    st.write(df.tail(10))
+# -----------------------------
+# CSV Export (streamed in chunks)
+# -----------------------------
+st.subheader("⬇️ Export CSV")
+export_dir = os.path.join(os.path.dirname(__file__), "..", "data", "exports")
+# One file per selection (columns + date range), so a download never serves another selection's export
+selection_key = hashlib.sha1(repr((tuple(fields), start, end)).encode()).hexdigest()[:10]
+export_path = os.path.abspath(os.path.join(export_dir, f"{selected_symbol}_{selected_interval}_{selection_key}.csv"))
+
+if st.button(f"📤 Export {total:,} records"):
+    os.makedirs(export_dir, exist_ok=True)
+    with st.spinner("Writing CSV in chunks..."):
+        rows = mongo_handler.export_ohlcv_csv(selected_symbol, selected_interval, export_path, fields, start, end)
+    st.success(f"✅ Exported {rows:,} rows to {export_path}")
+
+    # Offered only right after the export: the file is read into the page once, not on every rerun
+    with open(export_path, "rb") as f:
+        st.download_button(
+            label="⬇️ Download CSV",
+            data=f,
+            file_name=os.path.basename(export_path),
+            mime="text/csv"
+        )
 
 # -----------------------------
 # Footer
@@ -82,7 +144,7 @@ else:
 st.markdown(
     """
     ---
-    Data is fetched live from your local MongoDB instance.
-    All timestamps are UTC and displayed as strings for compatibility.
+    Data is fetched live from your local MongoDB instance, one page at a time.
+    All timestamps are UTC.
     """
 )
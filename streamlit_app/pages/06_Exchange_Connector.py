@@ -7,7 +7,9 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import streamlit as st
 import pandas as pd
 import plotly.graph_objs as go
-from api.exchange_api import get_all_symbols, get_current_price, fetch_ohlcv
+from api.exchange_api import get_all_symbols, get_current_price, get_current_prices, fetch_ohlcv
+from api.http_client import get_client
+from api.cache import invalidate_exchange_cache
 
 # -----------------------------
 # Page Config
@@ -20,7 +22,9 @@ st.write("Explore trading symbols, view current prices, and fetch OHLCV data fro
 # 1. Symbol Explorer
 # -----------------------------
 st.header("1️⃣ Symbol Explorer")
-symbols = get_all_symbols()
+if st.button("🔄 Refresh exchange metadata"):
+    invalidate_exchange_cache()
+symbols = get_all_symbols()  # cached (memory + disk), see api/cache.py
 if symbols:
     default_index = symbols.index("BTCUSDT") if "BTCUSDT" in symbols else 0
     symbol = st.selectbox("Select Trading Symbol 🔹", symbols, index=default_index)
@@ -39,6 +43,17 @@ if st.button("💰 Get Current Price"):
     else:
         st.error("❌ Failed to fetch current price.")
 
+watchlist = st.multiselect(
+    "Watchlist 👀", symbols or [symbol],
+    default=[s for s in ["BTCUSDT", "ETHUSDT", "BNBUSDT"] if s in (symbols or [symbol])]
+)
+if watchlist and st.button("💹 Get Watchlist Prices"):
+    prices = get_current_prices(watchlist)  # one multi-symbol request
+    if prices:
+        st.dataframe(pd.DataFrame(list(prices.items()), columns=["symbol", "price"]))
+    else:
+        st.error("❌ Failed to fetch watchlist prices.")
+
 # -----------------------------
 # 3. OHLCV Candlestick Chart
 # -----------------------------
@@ -47,7 +62,7 @@ interval = st.selectbox("Interval ⏱️", ["1m", "5m", "15m", "1h", "4h", "1d"]
 limit = st.slider("Number of Candles 📊", min_value=10, max_value=500, value=100, step=10)
 
 if st.button("📈 Fetch OHLCV Data"):
-    ohlcv = fetch_ohlcv(symbol, interval, limit)
+    ohlcv = fetch_ohlcv(symbol, interval, limit, use_cache=True)
     if ohlcv:
         df = pd.DataFrame(ohlcv)
         df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
@@ -82,3 +97,15 @@ if st.button("📈 Fetch OHLCV Data"):
         )
     else:
         st.error("❌ Failed to fetch OHLCV data.")
+
+# -----------------------------
+# 4. API Health
+# -----------------------------
+with st.expander("🩺 API Health"):
+    client = get_client()
+    st.metric("Used request weight (1m)", f"{client.used_weight} / {client.weight_limit}")
+    stats = client.latency_stats()
+    if stats:
+        st.dataframe(pd.DataFrame.from_dict(stats, orient="index").round(1))
+    else:
+        st.info("No exchange requests made yet.")
@@ -15,7 +15,7 @@ import pandas as pd
 
 # === Fix Import Path ===
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-from pipelines.run_pipeline import run_data_pipeline
+from pipelines.run_pipeline import run_data_pipeline, OHLCV_COLLECTION
 
 # === Try MongoDB Connection ===
 use_mongo = True
@@ -25,7 +25,7 @@ try:
     client = MongoClient("mongodb://localhost:27017/", serverSelectionTimeoutMS=3000)
     client.server_info()  # test connection
     db = client["tradeforge_db"]
-    collection = db["ohlcv_data"]
+    collection = db[OHLCV_COLLECTION]
 except Exception:
     use_mongo = False
 
@@ -49,7 +49,10 @@ if st.button("⚡ Run Pipeline"):
 
                     latest_data = list(collection.find().sort("timestamp", -1).limit(50))
                     if latest_data:
-                        df = pd.DataFrame(latest_data)
+                        # Flatten the time-series metaField into symbol/interval columns
+                        df = pd.json_normalize(latest_data).rename(
+                            columns={"meta.symbol": "symbol", "meta.interval": "interval"}
+                        )
                         st.subheader("🗂️ Latest Inserted Data (50 rows from MongoDB)")
                         st.dataframe(df)
                     else:
@@ -72,7 +75,7 @@ if st.button("⚡ Run Pipeline"):
 st.sidebar.header("ℹ️ Info")
 st.sidebar.write(
     "This tool runs the TradeForge data pipeline.\n\n"
-    "- If MongoDB is available → results stored in `tradeforge_db.ohlcv_data`.\n"
+    "- If MongoDB is available → results stored in the time-series collection `tradeforge_db.ohlcv_ts` (re-runs skip candles already stored).\n"
     "- If MongoDB is not available → results saved locally as `data/pipeline_output.csv`.\n"
     "- In both cases → a preview of the processed data is shown."
 )
@@ -5,7 +5,6 @@ import plotly.graph_objects as go
 from streamlit_autorefresh import st_autorefresh
 import os
 import sys
-import importlib.util
 
 # ------------------------------------------------------------------------------
 # Ensure we can import from sql/ (project root)
@@ -14,14 +13,11 @@ ROOT_DIR = os.path.abspath(os.path.join(ROOT_DIR, ".."))  # TradeForge (project
 if ROOT_DIR not in sys.path:
     sys.path.insert(0, ROOT_DIR)
 
-# Dynamically import query_handler for DB access
-sql_path = os.path.join(ROOT_DIR, "sql", "query_handler.py")
-spec = importlib.util.spec_from_file_location("query_handler", sql_path)
-query_handler = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(query_handler)
-
-fetch_recent_ohlcv = query_handler.fetch_recent_ohlcv
-fetch_recent_predictions = query_handler.fetch_recent_predictions
+# Session-cached incremental DB reads (only candles newer than the last one seen)
+from visualization.live_frame import append_rows, refresh_live_frame
+# Candles published by a running streamer process via shared memory
+from streaming.shared_feed import read_shared_feed
+from api.backfill import INTERVAL_MS
 
 # ------------------------------------------------------------------------------
 # Streamlit Config
@@ -40,28 +36,34 @@ num_candles = st.sidebar.slider("Candles to Display", 20, 200, 100)
 st.sidebar.markdown("---")
 
 # ------------------------------------------------------------------------------
-# Fetch OHLCV & predictions from DB (fallback CSV if DB empty)
+# Fetch OHLCV & predictions: shared-memory feed first, then DB, then CSV
 # ------------------------------------------------------------------------------
-ohlcv_df = fetch_recent_ohlcv(symbol, interval, limit=num_candles)
-pred_df = fetch_recent_predictions(symbol, interval, limit=num_candles)
-
-if ohlcv_df.empty:
+# A feed that stopped publishing (writer stalled or crashed) is ignored after ~2 candles
+live = read_shared_feed(symbol, interval, num_candles, max_age_s=2 * INTERVAL_MS[interval] / 1000 + 30)
+if live is not None and len(live) >= num_candles:
+    # The streamer has the whole window in memory: no DB round-trip
+    df = live
+    st.sidebar.caption(f"Source: shared-memory feed ({len(live)} candles)")
+else:
+    df, st.session_state["live_frame"] = refresh_live_frame(
+        st.session_state.get("live_frame"), symbol, interval, num_candles
+    )
+    if live is not None and not live.empty:
+        # Fresher candles/predictions from the streamer override the DB rows
+        df = append_rows(df, live, num_candles)
+        st.sidebar.caption(f"Source: DB + shared-memory feed ({len(live)} live candles)")
+
+if df.empty:
     csv_path = os.path.join(ROOT_DIR, "data", "BTCUSDT_15m.csv")
     if os.path.exists(csv_path):
-        ohlcv_df = pd.read_csv(csv_path).tail(num_candles)
-        ohlcv_df['timestamp'] = pd.to_datetime(ohlcv_df['timestamp'])
+        df = pd.read_csv(csv_path).tail(num_candles)
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        df['prediction'] = 0  # placeholder
         st.info("DB empty - using fallback CSV")
     else:
         st.warning("No data found in DB or CSV.")
         st.stop()
 
-# Merge predictions if available
-if not pred_df.empty:
-    df = pd.merge(ohlcv_df, pred_df, on='timestamp', how='left')
-else:
-    df = ohlcv_df.copy()
-    df['prediction'] = 0  # placeholder
-
 # ------------------------------------------------------------------------------
 # Plot Candlestick + RSI + Predictions
 # ------------------------------------------------------------------------------
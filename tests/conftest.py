@@ -0,0 +1,26 @@
+# tests/conftest.py
+import pytest
+
+from sql import db_engine
+from sql.models import Base
+
+
+@pytest.fixture
+def restore_sql_engine():
+    """Put the shared SQL engine back after a test that swaps it with configure_engine()."""
+    previous = db_engine._engine
+    yield
+    with db_engine._engine_lock:
+        current = db_engine._engine
+        db_engine._engine = previous
+        db_engine.Session.configure(bind=previous)
+    if current is not None and current is not previous:
+        current.dispose()
+
+
+@pytest.fixture
+def sql_db(tmp_path, restore_sql_engine):
+    """Point the shared SQL engine at a fresh SQLite file (all tables created) for one test."""
+    engine = db_engine.configure_engine(f"sqlite:///{tmp_path / 'test.db'}", config={})
+    Base.metadata.create_all(engine)
+    return engine
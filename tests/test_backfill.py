@@ -0,0 +1,135 @@
+# tests/test_backfill.py
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import numpy as np
+import pytest
+
+from api import backfill, exchange_api, http_client
+from api.rate_limiter import WeightRateLimiter
+
+START_MS = 1_704_067_200_000  # 2024-01-01
+N_CANDLES = 2_500
+
+
+def recorded_klines(n=N_CANDLES):
+    """Kline rows in the exchange's wire format (prices as strings)."""
+    close = 42000 + np.cumsum(np.random.default_rng(3).normal(0, 5, n))
+    return [
+        [START_MS + i * 60_000, f"{c:.2f}", f"{c + 1:.2f}", f"{c - 1:.2f}", f"{c:.2f}",
+         "1.5", START_MS + i * 60_000 + 59_999, "0", 10, "0", "0", "0"]
+        for i, c in enumerate(close)
+    ]
+
+
+@pytest.fixture
+def stub_server(monkeypatch):
+    """Local HTTP server answering /api/v3/klines from the recorded rows."""
+    rows = recorded_klines()
+    state = {"requests": [], "fail_starts": set()}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            q = {k: v[0] for k, v in parse_qs(url.query).items()}
+            state["requests"].append(q)
+            start = int(q.get("startTime", 0))
+            end = int(q.get("endTime", 2**63 - 1))
+            if start in state["fail_starts"]:
+                self.send_response(500)
+                self.end_headers()
+                return
+            page = [r for r in rows if start <= r[0] <= end][: int(q["limit"])]
+            body = json.dumps(page).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(exchange_api, "BASE_URL", f"http://127.0.0.1:{server.server_port}")
+    monkeypatch.setattr(backfill, "rate_limiter", WeightRateLimiter(max_weight=10_000))
+    monkeypatch.setattr(http_client, "_client", http_client.ExchangeClient(sleep=lambda s: None))
+    state["rows"] = rows
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+def test_plan_windows_cover_range_without_overlap():
+    windows = backfill.plan_windows(0, 2_500 * 60_000, "1m", limit=1000)
+    assert windows == [(0, 59_999_999), (60_000_000, 119_999_999), (120_000_000, 149_999_999)]
+
+
+def test_backfill_writes_columnar_chunks(stub_server, tmp_path):
+    end_ms = START_MS + N_CANDLES * 60_000
+    summary = backfill.backfill_ohlcv("BTCUSDT", "1m", START_MS, end_ms,
+                                      out_dir=tmp_path, max_workers=3)
+    assert summary == {"windows": 3, "skipped": 0, "fetched": 3, "failed": 0, "candles": N_CANDLES}
+
+    df = backfill.load_backfill("BTCUSDT", "1m", out_dir=tmp_path)
+    assert len(df) == N_CANDLES
+    assert df["timestamp"].is_monotonic_increasing
+    assert df["close"].dtype == np.float64
+    expected = np.array([float(r[4]) for r in stub_server["rows"]])
+    np.testing.assert_allclose(df["close"].to_numpy(), expected)
+
+
+def test_backfill_resumes_from_checkpoint(stub_server, tmp_path):
+    end_ms = START_MS + N_CANDLES * 60_000
+    failing = START_MS + 1000 * 60_000
+    stub_server["fail_starts"].add(failing)
+
+    first = backfill.backfill_ohlcv("BTCUSDT", "1m", START_MS, end_ms, out_dir=tmp_path)
+    assert first["fetched"] == 2 and first["failed"] == 1
+    assert len(backfill.load_backfill("BTCUSDT", "1m", out_dir=tmp_path)) == 1500
+
+    stub_server["fail_starts"].clear()
+    stub_server["requests"].clear()
+    second = backfill.backfill_ohlcv("BTCUSDT", "1m", START_MS, end_ms, out_dir=tmp_path)
+    assert second["skipped"] == 2 and second["fetched"] == 1
+    assert [int(q["startTime"]) for q in stub_server["requests"]] == [failing]
+    assert len(backfill.load_backfill("BTCUSDT", "1m", out_dir=tmp_path)) == N_CANDLES
+
+
+def test_fetch_ohlcv_passes_time_window(stub_server):
+    candles = exchange_api.fetch_ohlcv("BTCUSDT", "1m", limit=5, start_time=START_MS + 60_000)
+    assert [c["timestamp"] for c in candles] == [START_MS + i * 60_000 for i in range(1, 6)]
+
+
+def test_later_end_extends_the_last_partial_window(stub_server, tmp_path):
+    first_end = START_MS + 2_200 * 60_000
+    backfill.backfill_ohlcv("BTCUSDT", "1m", START_MS, first_end, out_dir=tmp_path)
+    assert len(backfill.load_backfill("BTCUSDT", "1m", out_dir=tmp_path)) == 2_200
+
+    # The window starting at candle 2000 now spans further: refetched, the full ones are not
+    stub_server["requests"].clear()
+    second = backfill.backfill_ohlcv("BTCUSDT", "1m", START_MS, START_MS + N_CANDLES * 60_000, out_dir=tmp_path)
+    assert second["skipped"] == 2 and second["fetched"] == 1
+    assert [int(q["startTime"]) for q in stub_server["requests"]] == [START_MS + 2_000 * 60_000]
+    assert len(backfill.load_backfill("BTCUSDT", "1m", out_dir=tmp_path)) == N_CANDLES
+
+
+def test_open_candle_is_dropped_and_window_not_checkpointed(stub_server, tmp_path, monkeypatch):
+    # "Now" is 30s into candle 2400: candles 0..2399 are closed
+    monkeypatch.setattr(backfill.time, "time", lambda: (START_MS + 2_400 * 60_000 + 30_000) / 1000)
+    summary = backfill.backfill_ohlcv("BTCUSDT", "1m", START_MS, out_dir=tmp_path)
+    assert summary["candles"] == 2_400
+    series = backfill._series_dir(str(tmp_path), "BTCUSDT", "1m")
+    assert backfill.load_checkpoint(series) == {
+        (START_MS, START_MS + 60_000_000 - 1), (START_MS + 60_000_000, START_MS + 120_000_000 - 1),
+    }
+
+    stub_server["requests"].clear()
+    monkeypatch.setattr(backfill.time, "time", lambda: (START_MS + N_CANDLES * 60_000) / 1000)
+    again = backfill.backfill_ohlcv("BTCUSDT", "1m", START_MS, out_dir=tmp_path)
+    assert again["skipped"] == 2
+    assert len(backfill.load_backfill("BTCUSDT", "1m", out_dir=tmp_path)) == N_CANDLES
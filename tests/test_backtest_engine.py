@@ -0,0 +1,116 @@
+# tests/test_backtest_engine.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from signal_engine.backtest_engine import generate_signals, simulate_backtest
+
+
+def reference_backtest(df: pd.DataFrame, initial_balance: float = 10000.0):
+    """Original row-by-row implementation, kept as the parity reference."""
+    df = df.copy()
+    balance = initial_balance
+    position = 0
+    portfolio_values = []
+    trades = []
+
+    for i, row in df.iterrows():
+        price = row["close"]
+        signal = row["signal"]
+        if signal == 1 and position == 0:
+            position = balance / price
+            balance = 0
+            trades.append({"type": "BUY", "price": price, "time": i})
+        elif signal == -1 and position > 0:
+            balance = position * price
+            position = 0
+            trades.append({"type": "SELL", "price": price, "time": i})
+        portfolio_values.append(balance + position * price)
+
+    df["portfolio_value"] = portfolio_values
+
+    returns = df["portfolio_value"].pct_change().dropna()
+    total_return = (df["portfolio_value"].iloc[-1] / initial_balance) - 1
+    sharpe_ratio = (returns.mean() / returns.std()) * np.sqrt(252) if returns.std() != 0 else 0
+    rolling_max = df["portfolio_value"].cummax()
+    max_drawdown = ((df["portfolio_value"] - rolling_max) / rolling_max).min()
+    wins = [
+        1 for j in range(1, len(trades))
+        if trades[j]["type"] == "SELL" and trades[j]["price"] > trades[j-1]["price"]
+    ]
+    win_rate = len(wins) / (len(trades) // 2) if len(trades) >= 2 else 0
+
+    return df, {
+        "Final Portfolio Value": df["portfolio_value"].iloc[-1],
+        "Total Return": total_return,
+        "Sharpe Ratio": sharpe_ratio,
+        "Max Drawdown": max_drawdown,
+        "Win Rate": win_rate,
+        "Number of Trades": len(trades)
+    }
+
+
+def make_signal_frame(n, seed):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    signal = rng.choice([-1, 0, 0, 0, 1], size=n)
+    return pd.DataFrame({"close": close, "signal": signal},
+                        index=pd.date_range("2024-01-01", periods=n, freq="min"))
+
+
+def assert_metrics_equal(got, expected):
+    assert got.keys() == expected.keys()
+    for key, value in expected.items():
+        if pd.isna(value):
+            assert pd.isna(got[key]), key
+        else:
+            assert got[key] == pytest.approx(value, rel=1e-9, abs=1e-12), key
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_vectorized_matches_reference_loop(seed):
+    df = make_signal_frame(3000, seed)
+
+    got_df, got_metrics = simulate_backtest(df, initial_balance=5000.0)
+    exp_df, exp_metrics = reference_backtest(df, initial_balance=5000.0)
+
+    np.testing.assert_allclose(got_df["portfolio_value"], exp_df["portfolio_value"], rtol=1e-12)
+    assert_metrics_equal(got_metrics, exp_metrics)
+
+
+@pytest.mark.parametrize("signals", [
+    [0, 0, 0, 0],            # never trades
+    [-1, -1, 1, 1, 0],       # sells while flat are ignored, repeated buys too
+    [1, 0, 0, 0, 0],         # position left open at the end
+    [1, -1, 1, -1, 1, -1],   # alternating round trips
+    [2, 1, 2, -1, 0],        # unknown values behave like hold
+])
+def test_edge_cases_match_reference_loop(signals):
+    df = pd.DataFrame({
+        "close": np.linspace(10, 20, len(signals)),
+        "signal": signals,
+    })
+    got_df, got_metrics = simulate_backtest(df)
+    exp_df, exp_metrics = reference_backtest(df)
+
+    np.testing.assert_allclose(got_df["portfolio_value"], exp_df["portfolio_value"], rtol=1e-12)
+    assert_metrics_equal(got_metrics, exp_metrics)
+
+
+def test_generate_signals_feeds_backtest():
+    df = make_signal_frame(500, 11).drop(columns="signal")
+    df["SMA_short"] = df["close"].rolling(5).mean()
+    df["SMA_long"] = df["close"].rolling(20).mean()
+    df["RSI"] = 50.0
+
+    signals = generate_signals(df)
+    got_df, got_metrics = simulate_backtest(signals)
+    exp_df, exp_metrics = reference_backtest(signals)
+
+    np.testing.assert_allclose(got_df["portfolio_value"], exp_df["portfolio_value"], rtol=1e-12)
+    assert_metrics_equal(got_metrics, exp_metrics)
+
+
+def test_missing_signal_column_raises():
+    with pytest.raises(ValueError):
+        simulate_backtest(pd.DataFrame({"close": [1.0, 2.0]}))
@@ -0,0 +1,77 @@
+# tests/test_candle_buffer.py
+import numpy as np
+import pandas as pd
+
+from streaming.candle_buffer import CandleBuffer, get_buffer, reset_buffers, swap_buffers
+
+
+def make_candles(n, start_ms=1_700_000_000_000, step_ms=60_000, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    return pd.DataFrame({
+        "timestamp": start_ms + np.arange(n) * step_ms,
+        "open": close + rng.normal(0, 0.1, n),
+        "high": close + 1,
+        "low": close - 1,
+        "close": close,
+        "volume": rng.uniform(1, 10, n),
+    })
+
+
+def test_buffer_wraps_and_keeps_newest_candles():
+    df = make_candles(25)
+    buffer = CandleBuffer(capacity=10)
+    for row in df.itertuples():
+        buffer.append(row.timestamp, row.open, row.high, row.low, row.close, row.volume)
+
+    assert len(buffer) == 10
+    assert buffer.last_timestamp == df["timestamp"].iloc[-1]
+    np.testing.assert_array_equal(buffer.timestamps(), df["timestamp"].tail(10).to_numpy())
+    np.testing.assert_array_equal(buffer.closes(), df["close"].tail(10).to_numpy())
+    assert buffer.latest()["close"] == df["close"].iloc[-1]
+
+
+def test_duplicate_timestamp_replaces_and_stale_is_ignored():
+    buffer = CandleBuffer(capacity=5)
+    assert buffer.append(1000, 1, 1, 1, 1, 1)
+    assert buffer.append(2000, 2, 2, 2, 2, 2)
+    assert not buffer.append(2000, 3, 3, 3, 3, 3)
+    assert not buffer.append(500, 9, 9, 9, 9, 9)
+
+    assert len(buffer) == 2
+    np.testing.assert_array_equal(buffer.closes(), [1.0, 3.0])
+
+
+def test_load_frame_from_datetime_history():
+    df = make_candles(40)
+    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
+
+    buffer = CandleBuffer(capacity=20)
+    assert buffer.load_frame(df.iloc[::-1]) == 20
+
+    restored = buffer.to_frame()
+    pd.testing.assert_series_equal(
+        restored["close"], df["close"].tail(20).reset_index(drop=True)
+    )
+    assert restored["timestamp"].iloc[-1] == df["timestamp"].iloc[-1]
+
+
+def test_registry_returns_same_buffer_per_key():
+    reset_buffers()
+    assert get_buffer("btcusdt", "1m") is get_buffer("BTCUSDT", "1m")
+    assert get_buffer("BTCUSDT", "1m") is not get_buffer("BTCUSDT", "5m")
+    reset_buffers()
+
+
+def test_swapped_registry_is_isolated_and_restored():
+    reset_buffers()
+    live = get_buffer("BTCUSDT", "1m")
+    assert live.append(60_000, 1.0, 1.0, 1.0, 1.0, 1.0)
+
+    saved = swap_buffers()      # e.g. a replay: starts from empty buffers
+    replayed = get_buffer("BTCUSDT", "1m")
+    assert replayed is not live and replayed.append(60_000, 1.0, 1.0, 1.0, 1.0, 1.0)
+
+    swap_buffers(saved)
+    assert get_buffer("BTCUSDT", "1m") is live and len(live) == 1
+    reset_buffers()
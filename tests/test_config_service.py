@@ -0,0 +1,99 @@
+# tests/test_config_service.py
+import json
+import os
+import time
+
+import pytest
+
+from utils.config_service import DEFAULT_STRATEGY_PARAMS, JsonConfig, atomic_write_json
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def write_json(path, data, bump_ns=10_000_000):
+    """Write and move mtime forward so coarse filesystem timestamps still differ."""
+    with open(path, "w") as f:
+        json.dump(data, f)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + bump_ns))
+
+
+@pytest.fixture
+def path(tmp_path):
+    p = tmp_path / "auto_trading_status.json"
+    write_json(p, {"enabled": False})
+    return str(p)
+
+
+def test_get_uses_cache_until_file_changes(path, monkeypatch):
+    clock = FakeClock()
+    config = JsonConfig(path, {"enabled": False, "extra": 1}, check_interval=1.0, clock=clock)
+    assert config.get() == {"enabled": False, "extra": 1}
+
+    opened = []
+    real_open = open
+    monkeypatch.setattr("builtins.open", lambda *a, **kw: opened.append(a[0]) or real_open(*a, **kw))
+
+    for _ in range(100):
+        clock.now += 2
+        config.get()
+    assert opened == []  # unchanged mtime → no re-read
+
+    write_json(path, {"enabled": True})
+    assert config.get()["enabled"] is False  # within check_interval
+    clock.now += 2
+    assert config.get() == {"enabled": True, "extra": 1}
+    assert config.reloads == 2
+
+
+def test_invalid_file_keeps_last_good_values(path):
+    clock = FakeClock()
+    config = JsonConfig(path, {}, clock=clock)
+    with open(path, "w") as f:
+        f.write("{not json")
+    clock.now += 5
+    assert config.get() == {"enabled": False}
+
+
+def test_update_writes_atomically_and_refreshes(path, tmp_path):
+    config = JsonConfig(path, {})
+    config.update({"enabled": True})
+    with open(path) as f:
+        assert json.load(f) == {"enabled": True}
+    assert config.get() == {"enabled": True}
+    assert [p.name for p in tmp_path.iterdir()] == ["auto_trading_status.json"]
+
+
+def test_atomic_write_leaves_old_file_on_failure(path):
+    with pytest.raises(TypeError):
+        atomic_write_json(path, {"bad": object()})
+    with open(path) as f:
+        assert json.load(f) == {"enabled": False}
+    assert len(os.listdir(os.path.dirname(path))) == 1
+
+
+def test_watcher_picks_up_changes_without_get_touching_disk(path):
+    config = JsonConfig(path, {})
+    config.start_watcher(poll_interval=0.01)
+    try:
+        write_json(path, {"enabled": True})
+        for _ in range(200):
+            if config.get()["enabled"]:
+                break
+            time.sleep(0.01)
+        assert config.get()["enabled"] is True
+    finally:
+        config.stop_watcher()
+
+
+def test_rsi_rule_fallback_is_opt_in(tmp_path):
+    p = tmp_path / "strategy_params.json"
+    write_json(p, {"rsi_period": 14, "rsi_buy_threshold": 30, "rsi_sell_threshold": 70})
+    config = JsonConfig(str(p), DEFAULT_STRATEGY_PARAMS)
+    assert config.get()["rsi_rule_fallback"] is False
@@ -0,0 +1,47 @@
+# tests/test_db_engine.py
+from sql import db_engine
+
+
+def pragma(engine, name):
+    with engine.connect() as conn:
+        return conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+def test_sqlite_engine_applies_wal_pragmas(tmp_path):
+    engine = db_engine.build_engine(f"sqlite:///{tmp_path / 'wal.db'}", config={})
+    try:
+        assert pragma(engine, "journal_mode") == "wal"
+        assert pragma(engine, "synchronous") == 1  # NORMAL
+        assert pragma(engine, "foreign_keys") == 1
+        assert pragma(engine, "temp_store") == 2   # MEMORY
+    finally:
+        engine.dispose()
+
+
+def test_config_pragmas_override_defaults(tmp_path):
+    url = f"sqlite:///{tmp_path / 'cfg.db'}"
+    engine = db_engine.build_engine(url, config={"pragmas": {"cache_size": -1024}})
+    try:
+        assert pragma(engine, "cache_size") == -1024
+        assert pragma(engine, "journal_mode") == "wal"
+    finally:
+        engine.dispose()
+
+
+def test_url_resolution_order(monkeypatch):
+    monkeypatch.delenv(db_engine.DB_URL_ENV, raising=False)
+    assert db_engine.resolve_db_url({}) == db_engine.DEFAULT_DB_URL
+    assert db_engine.resolve_db_url({"url": "sqlite:///from_config.db"}) == "sqlite:///from_config.db"
+
+    monkeypatch.setenv(db_engine.DB_URL_ENV, "sqlite:///from_env.db")
+    assert db_engine.resolve_db_url({"url": "sqlite:///from_config.db"}) == "sqlite:///from_env.db"
+
+
+def test_configure_engine_rebinds_shared_session(tmp_path, restore_sql_engine):
+    engine = db_engine.configure_engine(f"sqlite:///{tmp_path / 'shared.db'}", config={})
+    assert db_engine.get_engine() is engine
+    session = db_engine.get_session()
+    try:
+        assert session.get_bind() is engine
+    finally:
+        session.close()
@@ -0,0 +1,70 @@
+# tests/test_entry_ring.py
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from streaming.entry_ring import EntryRing, EntryStore, entries_to_dicts, entries_to_frame
+
+T0 = pd.Timestamp("2024-01-01")
+
+
+def ts(i):
+    return T0 + pd.Timedelta(minutes=i)
+
+
+def test_ring_wraps_and_keeps_newest_oldest_first():
+    ring = EntryRing(capacity=4)
+    for i in range(10):
+        ring.append(ts(i), "BTCUSDT", float(i), 50.0)
+    assert len(ring) == 4 and ring.total == 10
+    assert ring.snapshot()["close"].tolist() == [6.0, 7.0, 8.0, 9.0]
+    assert ring.snapshot(2)["close"].tolist() == [8.0, 9.0]
+    assert ring.snapshot(100)["close"].tolist() == [6.0, 7.0, 8.0, 9.0]
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        EntryRing(capacity=0)
+
+
+def test_store_merges_symbols_by_time():
+    store = EntryStore(capacity=10)
+    store.append("btcusdt", ts(0), 1.0, 40.0, prediction=1)
+    store.append("ETHUSDT", ts(1), 2.0, 60.0, rsi_signal=-1)
+    store.append("BTCUSDT", ts(2), 3.0, None, prediction=0)
+
+    rows = entries_to_dicts(store.latest(limit=10))
+    assert [(r["symbol"], r["close"]) for r in rows] == [("BTCUSDT", 1.0), ("ETHUSDT", 2.0), ("BTCUSDT", 3.0)]
+    assert rows[0]["timestamp"] == ts(0)
+    assert rows[1]["prediction"] is None and rows[1]["rsi_signal"] == -1
+    assert rows[2]["rsi"] is None and rows[2]["prediction"] == 0
+
+    assert [r["close"] for r in entries_to_dicts(store.latest(limit=2))] == [2.0, 3.0]
+    assert entries_to_frame(store.latest(10, symbol="BTCUSDT"))["close"].tolist() == [1.0, 3.0]
+    assert len(store.latest(10, symbol="SOLUSDT")) == 0
+    assert sorted(store.symbols()) == ["BTCUSDT", "ETHUSDT"]
+
+
+def test_snapshots_stay_consistent_under_concurrent_writes():
+    ring = EntryRing(capacity=64)
+    stop = threading.Event()
+
+    def writer():
+        i = 0
+        while not stop.is_set():
+            # close == rsi == i in every slot; a torn read would break that
+            ring.append(ts(i % 1000), "BTCUSDT", float(i), float(i))
+            i += 1
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        for _ in range(2000):
+            snap = ring.snapshot()
+            assert np.array_equal(snap["close"], snap["rsi"])
+            assert np.all(np.diff(snap["close"]) == 1)
+    finally:
+        stop.set()
+        thread.join()
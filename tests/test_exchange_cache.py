@@ -0,0 +1,107 @@
+# tests/test_exchange_cache.py
+import json
+
+import pytest
+
+from api import cache, exchange_api
+from api.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self._payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._payload
+
+
+class FakeClient:
+    """Records requests and answers exchangeInfo / ticker calls from canned data."""
+
+    def __init__(self, prices):
+        self.prices = prices
+        self.calls = []
+
+    def get(self, url, params=None, timeout=None):
+        self.calls.append((url, params))
+        if url.endswith("/exchangeInfo"):
+            return FakeResponse({"symbols": [{"symbol": s} for s in self.prices]})
+        if params and "symbols" in params:
+            wanted = json.loads(params["symbols"])
+            return FakeResponse([{"symbol": s, "price": str(self.prices[s])} for s in wanted])
+        symbol = url.split("symbol=")[-1]
+        return FakeResponse({"symbol": symbol, "price": str(self.prices[symbol])})
+
+
+@pytest.fixture
+def exchange(tmp_path, monkeypatch):
+    clock = FakeClock()
+    client = FakeClient({"BTCUSDT": 60000.0, "ETHUSDT": 3000.0, "BNBUSDT": 500.0})
+    shared = TTLCache(disk_dir=str(tmp_path / "cache"), clock=clock)
+    monkeypatch.setattr(cache, "exchange_cache", shared)
+    monkeypatch.setattr(exchange_api, "exchange_cache", shared)
+    monkeypatch.setattr(exchange_api, "get_client", lambda: client)
+    return client, shared, clock
+
+
+def test_lru_evicts_oldest_and_expires_entries():
+    clock = FakeClock()
+    c = TTLCache(maxsize=2, clock=clock)
+    c.set("a", 1, ttl=10)
+    c.set("b", 2, ttl=10)
+    c.get("a")
+    c.set("c", 3, ttl=10)
+    assert c.get("b") is None and c.get("a") == 1 and c.get("c") == 3
+
+    clock.now += 11
+    assert c.get("a") is None
+
+
+def test_disk_snapshot_survives_new_process(tmp_path):
+    clock = FakeClock()
+    TTLCache(disk_dir=str(tmp_path), clock=clock).set("exchange_info:symbols", ["BTCUSDT"], 60, persist=True)
+
+    fresh = TTLCache(disk_dir=str(tmp_path), clock=clock)
+    assert fresh.get("exchange_info:symbols") == ["BTCUSDT"]
+    clock.now += 61
+    assert TTLCache(disk_dir=str(tmp_path), clock=clock).get("exchange_info:symbols") is None
+
+
+def test_symbols_are_downloaded_once_until_invalidated(exchange):
+    client, shared, _ = exchange
+    assert exchange_api.get_all_symbols() == ["BTCUSDT", "ETHUSDT", "BNBUSDT"]
+    assert exchange_api.get_all_symbols() == ["BTCUSDT", "ETHUSDT", "BNBUSDT"]
+    assert len(client.calls) == 1
+
+    cache.invalidate_exchange_cache("exchange_info")
+    exchange_api.get_all_symbols()
+    assert len(client.calls) == 2
+
+
+def test_batch_prices_use_one_request_and_fill_cache(exchange):
+    client, _, clock = exchange
+    assert exchange_api.get_current_price("BTCUSDT") == 60000.0
+
+    prices = exchange_api.get_current_prices(["BTCUSDT", "ETHUSDT", "BNBUSDT", "ETHUSDT"])
+    assert prices == {"BTCUSDT": 60000.0, "ETHUSDT": 3000.0, "BNBUSDT": 500.0}
+    # BTC came from the cache, the other two from a single multi-symbol request
+    assert len(client.calls) == 2
+    assert json.loads(client.calls[-1][1]["symbols"]) == ["ETHUSDT", "BNBUSDT"]
+
+    assert exchange_api.get_current_price("ETHUSDT") == 3000.0
+    assert len(client.calls) == 2
+
+    clock.now += cache.CACHE_TTLS["ticker_price"] + 1
+    exchange_api.get_current_prices(["ETHUSDT"])
+    assert len(client.calls) == 3
@@ -0,0 +1,97 @@
+# tests/test_http_client.py
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from api.http_client import ExchangeClient
+
+
+@pytest.fixture
+def server():
+    """Stub exchange that replays a scripted list of (status, headers, body)."""
+    state = {"script": [], "hits": 0, "ports": set()}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            state["hits"] += 1
+            state["ports"].add(self.client_address[1])
+            status, headers, body = state["script"].pop(0) if state["script"] else (200, {}, {"ok": True})
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    state["url"] = f"http://127.0.0.1:{httpd.server_port}"
+    yield state
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def make_client(**kwargs):
+    sleeps = []
+    client = ExchangeClient(sleep=sleeps.append, **kwargs)
+    return client, sleeps
+
+
+def test_retries_429_honouring_retry_after(server):
+    server["script"] = [(429, {"Retry-After": "3"}, {}), (503, {}, {}), (200, {}, {"price": "1"})]
+    client, sleeps = make_client(backoff_base=0.5)
+
+    assert client.get_json(server["url"] + "/api/v3/ticker/price") == {"price": "1"}
+    assert server["hits"] == 3
+    assert sleeps[0] == 3.0
+    assert 0.25 <= sleeps[1] <= 1.0  # jittered exponential backoff, attempt 1
+
+
+def test_gives_up_after_max_retries(server):
+    server["script"] = [(500, {}, {})] * 3
+    client, sleeps = make_client(max_retries=2)
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.get(server["url"] + "/api/v3/klines")
+    assert server["hits"] == 3 and len(sleeps) == 2
+
+
+def test_client_errors_are_not_retried(server):
+    server["script"] = [(400, {}, {"msg": "bad symbol"})]
+    client, sleeps = make_client()
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.get(server["url"] + "/api/v3/klines")
+    assert server["hits"] == 1 and sleeps == []
+
+
+def test_used_weight_header_throttles_next_request(server):
+    now = [120.0 + 15]  # 15s into a minute
+    server["script"] = [(200, {"X-MBX-USED-WEIGHT-1M": "1150"}, {})]
+    client, sleeps = make_client(weight_limit=1200, throttle_ratio=0.9)
+    client._clock = lambda: now[0]
+
+    client.get(server["url"] + "/api/v3/klines")
+    assert client.used_weight == 1150
+    client.get(server["url"] + "/api/v3/klines")
+    assert sleeps == [45.0]  # waited for the minute to roll over
+
+
+def test_latency_is_tracked_per_endpoint_over_pooled_connections(server):
+    client, _ = make_client()
+    for _ in range(3):
+        client.get(server["url"] + "/api/v3/klines", params={"symbol": "BTCUSDT"})
+    client.get(server["url"] + "/api/v3/exchangeInfo")
+
+    stats = client.latency_stats()
+    assert stats["/api/v3/klines"]["count"] == 3
+    assert stats["/api/v3/exchangeInfo"]["count"] == 1
+    assert stats["/api/v3/klines"]["max_ms"] >= stats["/api/v3/klines"]["mean_ms"] > 0
+    assert len(server["ports"]) == 1  # one keep-alive connection reused
@@ -0,0 +1,106 @@
+# tests/test_live_frame.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from sql import sql_handler
+from visualization import live_frame
+from visualization.live_frame import refresh_live_frame, append_rows
+
+
+def make_rows(start, n):
+    ts = pd.date_range("2024-01-01", periods=start + n, freq="min")[start:]
+    close = 100 + np.arange(start, start + n, dtype=float)
+    return pd.DataFrame({
+        "timestamp": ts.as_unit("ms").asi8,
+        "open": close, "high": close + 1, "low": close - 1, "close": close,
+        "volume": 1.0, "sma": close, "ema": close, "rsi": 50.0,
+        "prediction": np.resize([1, -1, 0], n),
+    })
+
+
+def write(df, predictions=True):
+    sql_handler.bulk_insert_ohlcv_sql("BTCUSDT", "1m", df)
+    sql_handler.bulk_insert_indicators_sql("BTCUSDT", "1m", df)
+    if predictions:
+        sql_handler.bulk_insert_predictions_sql("BTCUSDT", "1m", df)
+
+
+@pytest.fixture(autouse=True)
+def tmp_db(sql_db):
+    return sql_db
+
+
+def test_refresh_appends_only_newer_rows_and_trims(monkeypatch):
+    write(make_rows(0, 50))
+    df, state = refresh_live_frame(None, "BTCUSDT", "1m", 20)
+    assert len(df) == 20
+    assert df["close"].iloc[-1] == 149.0
+
+    seen = []
+    original = live_frame.fetch_ohlcv_since
+    monkeypatch.setattr(live_frame, "fetch_ohlcv_since",
+                        lambda *a, **kw: seen.append(kw["since"]) or original(*a, **kw))
+
+    write(make_rows(50, 5))
+    df, state = refresh_live_frame(state, "BTCUSDT", "1m", 20)
+    assert seen == [pd.Timestamp("2024-01-01 00:49")]
+    assert len(df) == 20
+    assert df["close"].tolist() == list(np.arange(135, 155, dtype=float))
+    assert df["timestamp"].is_unique
+
+
+def test_late_predictions_are_filled_in_place():
+    rows = make_rows(0, 30)
+    write(rows, predictions=False)
+    df, state = refresh_live_frame(None, "BTCUSDT", "1m", 30)
+    assert df["prediction"].isna().all()
+
+    sql_handler.bulk_insert_predictions_sql("BTCUSDT", "1m", rows.tail(10))
+    df, state = refresh_live_frame(state, "BTCUSDT", "1m", 30)
+    assert df["prediction"].isna().sum() == 20
+    assert df["prediction"].tail(10).tolist() == rows["prediction"].tail(10).astype(float).tolist()
+
+
+def test_missing_predictions_are_not_requeried_from_the_oldest_candle(monkeypatch):
+    write(make_rows(0, 30), predictions=False)
+    df, state = refresh_live_frame(None, "BTCUSDT", "1m", 30)
+
+    since = []
+    original = live_frame.fetch_predictions_since
+    monkeypatch.setattr(live_frame, "fetch_predictions_since",
+                        lambda s, i, start: since.append(start) or original(s, i, start))
+    for start in (30, 32, 34):
+        write(make_rows(start, 2), predictions=False)
+        df, state = refresh_live_frame(state, "BTCUSDT", "1m", 30)
+
+    minute = pd.Timedelta(minutes=1)
+    t0 = pd.Timestamp("2024-01-01")
+    # First refresh checks the whole window once; later ones only the last refresh's rows onwards
+    assert since == [t0 + 2 * minute, t0 + 30 * minute, t0 + 32 * minute]
+    assert df["prediction"].isna().all()
+
+
+def test_symbol_change_or_wider_window_reloads():
+    write(make_rows(0, 40))
+    df, state = refresh_live_frame(None, "BTCUSDT", "1m", 10)
+    df, state = refresh_live_frame(state, "BTCUSDT", "1m", 25)
+    assert len(df) == 25
+    df, state = refresh_live_frame(state, "BTCUSDT", "5m", 25)
+    assert df.empty and state["key"] == ("BTCUSDT", "5m")
+
+
+def test_append_rows_keeps_latest_duplicate():
+    cached = pd.DataFrame({"timestamp": [1, 2, 3], "close": [1.0, 2.0, 3.0]})
+    new = pd.DataFrame({"timestamp": [3, 4], "close": [30.0, 4.0]})
+    out = append_rows(cached, new, window=3)
+    assert out["timestamp"].tolist() == [2, 3, 4]
+    assert out["close"].tolist() == [2.0, 30.0, 4.0]
+
+
+def test_append_rows_sorts_when_cached_rows_are_newer():
+    cached = pd.DataFrame({"timestamp": [5, 6, 7], "close": [5.0, 6.0, 7.0]})   # DB ahead of the feed
+    live = pd.DataFrame({"timestamp": [3, 4, 5], "close": [3.0, 4.0, 50.0]})
+    out = append_rows(cached, live, window=4)
+    assert out["timestamp"].tolist() == [4, 5, 6, 7]
+    assert out["close"].tolist() == [4.0, 50.0, 6.0, 7.0]
@@ -0,0 +1,94 @@
+# tests/test_migrate_ohlcv.py
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine, inspect
+
+from scripts.migrate_ohlcv_composite_key import migrate
+
+LEGACY_SCHEMA = """
+CREATE TABLE ohlcv_data (
+    id INTEGER NOT NULL, symbol VARCHAR NOT NULL, interval VARCHAR NOT NULL,
+    timestamp DATETIME NOT NULL, open FLOAT NOT NULL, high FLOAT NOT NULL,
+    low FLOAT NOT NULL, close FLOAT NOT NULL, volume FLOAT NOT NULL, PRIMARY KEY (id)
+);
+CREATE INDEX ix_ohlcv_data_symbol ON ohlcv_data (symbol);
+CREATE UNIQUE INDEX ix_ohlcv_data_timestamp ON ohlcv_data (timestamp);
+CREATE TABLE indicators (
+    id INTEGER NOT NULL, ohlcv_id INTEGER NOT NULL, sma FLOAT, ema FLOAT, rsi FLOAT,
+    PRIMARY KEY (id), FOREIGN KEY(ohlcv_id) REFERENCES ohlcv_data (id)
+);
+CREATE TABLE ml_predictions (
+    id INTEGER NOT NULL, ohlcv_id INTEGER NOT NULL, prediction INTEGER NOT NULL,
+    PRIMARY KEY (id), FOREIGN KEY(ohlcv_id) REFERENCES ohlcv_data (id)
+);
+"""
+
+
+@pytest.fixture
+def legacy_db(tmp_path):
+    path = tmp_path / "escalade.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(LEGACY_SCHEMA)
+    conn.executemany(
+        "INSERT INTO ohlcv_data VALUES (?, 'BTCUSDT', '1m', ?, 1, 1, 1, 1, 1)",
+        [(1, "2024-01-01 00:00:00.000000"), (2, "2024-01-01 00:01:00.000000")],
+    )
+    conn.executemany("INSERT INTO indicators VALUES (?, ?, 1, 1, 50)", [(1, 1), (2, 1), (3, 99)])
+    conn.execute("INSERT INTO ml_predictions VALUES (1, 2, 1)")
+    conn.commit()
+    conn.close()
+    return str(path)
+
+
+def test_migration_enables_multi_symbol_candles(legacy_db):
+    summary = migrate(legacy_db)
+
+    assert set(summary["dropped_indexes"]) == {"ix_ohlcv_data_timestamp", "ix_ohlcv_data_symbol"}
+    assert "ux_ohlcv_symbol_interval_timestamp" in summary["created_indexes"]
+    assert summary["removed_rows"]["indicators"] == 2   # duplicate + orphan
+
+    conn = sqlite3.connect(legacy_db)
+    # Same minute, different symbol: rejected before, accepted now
+    conn.execute(
+        "INSERT INTO ohlcv_data (symbol, interval, timestamp, open, high, low, close, volume) "
+        "VALUES ('ETHUSDT', '1m', '2024-01-01 00:00:00.000000', 1, 1, 1, 1, 1)"
+    )
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute(
+            "INSERT INTO ohlcv_data (symbol, interval, timestamp, open, high, low, close, volume) "
+            "VALUES ('ETHUSDT', '1m', '2024-01-01 00:00:00.000000', 2, 2, 2, 2, 2)"
+        )
+    plan = conn.execute(
+        "EXPLAIN QUERY PLAN SELECT id, timestamp, open, high, low, close, volume FROM ohlcv_data "
+        "WHERE symbol = 'BTCUSDT' AND interval = '1m' ORDER BY timestamp DESC LIMIT 100"
+    ).fetchall()
+    conn.close()
+    plan = " ".join(row[-1] for row in plan)
+    # Index seek on (symbol, interval) with ordering taken from the index, no sort step
+    assert "SEARCH ohlcv_data USING" in plan and "TEMP B-TREE" not in plan
+
+
+def test_migration_is_idempotent(legacy_db):
+    migrate(legacy_db)
+    again = migrate(legacy_db)
+    assert again["dropped_indexes"] == [] and again["created_indexes"] == []
+
+    names = {idx["name"] for idx in inspect(create_engine(f"sqlite:///{legacy_db}")).get_indexes("indicators")}
+    assert "ix_indicators_ohlcv_id" in names
+
+
+def test_migration_drops_redundant_covering_index(legacy_db):
+    migrate(legacy_db)
+    conn = sqlite3.connect(legacy_db)
+    conn.execute(
+        "CREATE INDEX ix_ohlcv_symbol_interval_timestamp_covering "
+        "ON ohlcv_data (symbol, interval, timestamp, open, high, low, close, volume)"
+    )
+    conn.commit()
+    conn.close()
+
+    summary = migrate(legacy_db)
+    assert summary["dropped_indexes"] == ["ix_ohlcv_symbol_interval_timestamp_covering"]
+    names = {idx["name"] for idx in inspect(create_engine(f"sqlite:///{legacy_db}")).get_indexes("ohlcv_data")}
+    assert names == {"ux_ohlcv_symbol_interval_timestamp"}
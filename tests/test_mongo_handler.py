@@ -0,0 +1,123 @@
+# tests/test_mongo_handler.py
+import mongomock
+import pandas as pd
+import pytest
+
+from storage import mongo_handler
+
+
+def candles(start, n):
+    return [
+        {"timestamp": 1_700_000_000_000 + i * 60_000, "open": 1.0, "high": 2.0,
+         "low": 0.5, "close": float(i), "volume": 3.0}
+        for i in range(start, start + n)
+    ]
+
+
+@pytest.fixture
+def db(monkeypatch):
+    database = mongomock.MongoClient()["tradeforge_data"]
+    monkeypatch.setattr(mongo_handler, "db", database)
+    monkeypatch.setattr(mongo_handler, "_indexed_collections", set())
+    monkeypatch.setattr(mongo_handler, "_failed_index_collections", {})
+    return database
+
+
+def test_insert_is_idempotent_without_scanning_the_collection(db, monkeypatch):
+    assert mongo_handler.insert_ohlcv("BTCUSDT", "1m", candles(0, 100)) == 100
+
+    def no_scan(*args, **kwargs):
+        raise AssertionError("insert_ohlcv must not read the collection")
+    monkeypatch.setattr(mongomock.collection.Collection, "find", no_scan)
+
+    # 50 already stored + 50 new; stored candles are not overwritten
+    changed = candles(50, 100)
+    for doc in changed:
+        doc["close"] = -1.0
+    assert mongo_handler.insert_ohlcv("BTCUSDT", "1m", changed) == 50
+    assert mongo_handler.insert_ohlcv("BTCUSDT", "1m", candles(0, 10)) == 0
+    monkeypatch.undo()
+
+    coll = db["BTCUSDT_1m"]
+    assert coll.count_documents({}) == 150
+    assert coll.find_one({"timestamp": 1_700_000_000_000 + 60 * 60_000})["close"] == 60.0
+    assert coll.find_one({"timestamp": 1_700_000_000_000 + 120 * 60_000})["close"] == -1.0
+
+
+def test_unique_index_is_created_once(db, monkeypatch):
+    calls = []
+    real = mongomock.collection.Collection.create_index
+    monkeypatch.setattr(mongomock.collection.Collection, "create_index",
+                        lambda self, *a, **kw: calls.append(self.name) or real(self, *a, **kw))
+    for start in range(0, 30, 10):
+        mongo_handler.insert_ohlcv("ETHUSDT", "5m", candles(start, 10))
+    assert calls == ["ETHUSDT_5m"]
+    index = db["ETHUSDT_5m"].index_information()["timestamp_unique"]
+    assert index["unique"] and index["key"] == [("timestamp", 1)]
+
+
+def test_existing_duplicates_block_index_but_not_inserts(db):
+    db["SOLUSDT_1m"].insert_many(candles(0, 2) + candles(0, 1))
+    assert mongo_handler.ensure_ohlcv_index(db["SOLUSDT_1m"]) is False
+    assert mongo_handler.insert_ohlcv("SOLUSDT", "1m", candles(1, 3)) == 2
+    assert db["SOLUSDT_1m"].count_documents({}) == 5
+
+
+def test_failed_index_build_is_not_retried_on_every_insert(db, monkeypatch):
+    db["SOLUSDT_1m"].insert_many(candles(0, 2) + candles(0, 1))
+    calls = []
+    real = mongomock.collection.Collection.create_index
+    monkeypatch.setattr(mongomock.collection.Collection, "create_index",
+                        lambda self, *a, **kw: calls.append(self.name) or real(self, *a, **kw))
+    for start in range(3, 9, 2):
+        mongo_handler.insert_ohlcv("SOLUSDT", "1m", candles(start, 2))
+    assert calls == ["SOLUSDT_1m"]
+
+    # Once the duplicates are gone, the startup pass retries and succeeds
+    db["SOLUSDT_1m"].delete_one({"timestamp": candles(0, 1)[0]["timestamp"]})
+    assert mongo_handler.ensure_all_indexes() == 1
+    assert calls == ["SOLUSDT_1m", "SOLUSDT_1m"]
+    assert "timestamp_unique" in db["SOLUSDT_1m"].index_information()
+
+
+def test_ensure_all_indexes_covers_existing_collections(db):
+    db["BTCUSDT_1m"].insert_many(candles(0, 3))
+    db["ETHUSDT_15m"].insert_many(candles(0, 3))
+    assert mongo_handler.ensure_all_indexes() == 2
+    assert "timestamp_unique" in db["ETHUSDT_15m"].index_information()
+
+
+def test_keyset_pages_projection_and_date_range(db):
+    mongo_handler.insert_ohlcv("BTCUSDT", "1m", candles(0, 25))
+    assert mongo_handler.count_ohlcv("BTCUSDT", "1m") == 25
+    assert mongo_handler.get_fields("BTCUSDT", "1m") == ["timestamp", "open", "high", "low", "close", "volume"]
+
+    first = mongo_handler.fetch_ohlcv_page("BTCUSDT", "1m", ["close"], limit=10)
+    assert [d["close"] for d in first] == [float(i) for i in range(10)]
+    assert set(first[0]) == {"timestamp", "close"}
+
+    second = mongo_handler.fetch_ohlcv_page("BTCUSDT", "1m", ["close"], after=first[-1]["timestamp"], limit=10)
+    assert [d["close"] for d in second] == [float(i) for i in range(10, 20)]
+    back = mongo_handler.fetch_ohlcv_page("BTCUSDT", "1m", ["close"], before=second[0]["timestamp"], limit=10)
+    assert back == first
+
+    # Datetime bounds are converted to the stored epoch-ms representation, [start, end)
+    start = pd.Timestamp(1_700_000_000_000 + 5 * 60_000, unit="ms")
+    end = start + pd.Timedelta(minutes=10)
+    assert mongo_handler.count_ohlcv("BTCUSDT", "1m", start, end) == 10
+    page = mongo_handler.fetch_ohlcv_page("BTCUSDT", "1m", None, start, end, after=1_700_000_000_000 + 9 * 60_000)
+    assert [d["close"] for d in page] == [float(i) for i in range(10, 15)]
+
+
+def test_csv_export_streams_in_chunks(db, tmp_path):
+    mongo_handler.insert_ohlcv("BTCUSDT", "1m", candles(0, 25))
+    path = tmp_path / "out.csv"
+    assert mongo_handler.export_ohlcv_csv("BTCUSDT", "1m", str(path), ["close", "volume"], chunk_size=7) == 25
+    lines = path.read_text().splitlines()
+    assert lines[0] == "timestamp,close,volume" and len(lines) == 26
+    assert lines[-1] == f"{1_700_000_000_000 + 24 * 60_000},24.0,3.0"
+
+    assert mongo_handler.export_ohlcv_csv("BTCUSDT", "1m", str(path), chunk_size=10) == 25
+    assert path.read_text().splitlines()[0] == "timestamp,open,high,low,close,volume"
+    assert mongo_handler.export_ohlcv_csv("ETHUSDT", "1m", str(path), ["close"]) == 0
+    assert path.read_text().splitlines() == ["timestamp,close"]
@@ -0,0 +1,82 @@
+# tests/test_mongo_timeseries.py
+from datetime import datetime, timedelta
+
+import mongomock
+import pytest
+
+from scripts import compact_mongo_ohlcv
+from storage import mongo_timeseries
+
+T0 = datetime(2024, 1, 1)
+
+
+def candles(start, n, **extra):
+    return [{"timestamp": T0 + timedelta(minutes=i), "close": float(i), **extra} for i in range(start, start + n)]
+
+
+@pytest.fixture
+def db():
+    database = mongomock.MongoClient()["tradeforge_db"]
+    database.create_collection("ohlcv_ts")   # mongomock: regular-collection fallback
+    return database
+
+
+def test_insert_new_candles_skips_stored_and_repeated_timestamps(db):
+    coll = mongo_timeseries.ensure_timeseries_collection(db, "ohlcv_ts")
+    assert mongo_timeseries.insert_new_candles(coll, "BTCUSDT", "1m", candles(0, 10)) == 10
+    assert mongo_timeseries.insert_new_candles(coll, "BTCUSDT", "1m", candles(5, 10) + candles(14, 1)) == 5
+    # Same timestamps for another pair are separate candles
+    assert mongo_timeseries.insert_new_candles(coll, "ETHUSDT", "1m", candles(0, 3)) == 3
+
+    doc = coll.find_one({"meta.symbol": "BTCUSDT", "timestamp": T0})
+    assert doc["meta"] == {"symbol": "BTCUSDT", "interval": "1m"} and "symbol" not in doc
+    assert coll.count_documents({}) == 18
+
+
+def test_fallback_collection_gets_unique_compound_index(db):
+    coll = mongo_timeseries.ensure_timeseries_collection(db, "ohlcv_ts")
+    index = coll.index_information()["pair_timestamp"]
+    assert index["key"] == [("meta.symbol", 1), ("meta.interval", 1), ("timestamp", 1)]
+    assert index["unique"]
+
+
+def test_compaction_migrates_legacy_and_removes_duplicates(db):
+    legacy = db["ohlcv_data"]
+    rows = candles(0, 5, symbol="BTCUSDT", interval="1m")
+    legacy.insert_many([dict(r) for r in rows] + [dict(r) for r in rows[:3]])   # a re-run's overlap
+    legacy.insert_many([dict(r) for r in candles(0, 2, symbol="ETHUSDT", interval="5m")])
+
+    # Duplicates already in the time-series collection (written before dedup existed)
+    ts = db["ohlcv_ts"]
+    ts.insert_many(mongo_timeseries.to_documents("SOLUSDT", "1m", candles(0, 2) + candles(0, 2)))
+
+    summary = compact_mongo_ohlcv.compact(db, migrate=True, drop_legacy=True)
+
+    assert summary["copied"] == {("BTCUSDT", "1m"): 5, ("ETHUSDT", "5m"): 2}
+    assert summary["removed"] == 2 and summary["dropped_legacy"]
+    assert "ohlcv_data" not in db.list_collection_names()
+    assert ts.count_documents({}) == 5 + 2 + 2
+    assert compact_mongo_ohlcv.compact(db)["removed"] == 0
+
+
+def test_pre_7_timeseries_compaction_rewrites_pairs_without_id_deletes(db, monkeypatch):
+    ts = db["ohlcv_ts"]   # stands in for a server-side time-series collection (no unique index)
+    ts.insert_many(mongo_timeseries.to_documents("SOLUSDT", "1m", candles(0, 5) + candles(1, 2, close=-1.0)))
+    ts.insert_many(mongo_timeseries.to_documents("BTCUSDT", "1m", candles(0, 3)))
+
+    monkeypatch.setattr(mongo_timeseries, "is_timeseries", lambda collection: True)
+    monkeypatch.setattr(mongo_timeseries, "server_version", lambda db: (6, 0))
+    real_delete = mongomock.collection.Collection.delete_many
+
+    def meta_only_delete(self, filter, *args, **kwargs):
+        if any(not key.startswith("meta.") for key in filter):
+            raise AssertionError("time-series collections < 7.0 only accept metaField deletes")
+        return real_delete(self, filter, *args, **kwargs)
+    monkeypatch.setattr(mongomock.collection.Collection, "delete_many", meta_only_delete)
+
+    assert mongo_timeseries.compact_duplicates(ts, batch_size=2) == 2
+    sol = list(ts.find({"meta.symbol": "SOLUSDT"}).sort("timestamp", 1))
+    assert [d["close"] for d in sol] == [0.0, 1.0, 2.0, 3.0, 4.0]   # first stored kept
+    assert ts.count_documents({"meta.symbol": "BTCUSDT"}) == 3
+    assert "ohlcv_ts_compact_staging" not in db.list_collection_names()
+    assert mongo_timeseries.compact_duplicates(ts) == 0
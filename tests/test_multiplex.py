@@ -0,0 +1,138 @@
+# tests/test_multiplex.py
+import asyncio
+import json
+import threading
+from http import HTTPStatus
+from urllib.parse import urlparse, parse_qs
+
+from websockets.asyncio.server import serve
+
+from streaming import multiplex
+from streaming.multiplex import MultiplexStreamer, shard_streams, stream_name
+
+
+def kline_message(stream, t, close, closed=True):
+    symbol = stream.split("@")[0].upper()
+    return json.dumps({
+        "stream": stream,
+        "data": {"e": "kline", "s": symbol, "k": {
+            "t": t, "s": symbol, "i": "1m", "o": "1", "h": "1", "l": "1",
+            "c": str(close), "v": "1", "x": closed,
+        }},
+    })
+
+
+async def run_against_stub(pairs, handler, candles_per_stream=5, **kwargs):
+    """Serve `candles_per_stream` klines on every requested stream, then close."""
+    requested = []
+
+    async def feed(ws):
+        streams = parse_qs(urlparse(ws.request.path).query)["streams"][0].split("/")
+        requested.append(streams)
+        for i in range(candles_per_stream):
+            for stream in streams:
+                await ws.send(kline_message(stream, 60_000 * i, 100 + i, closed=True))
+                await ws.send(kline_message(stream, 60_000 * i, 100 + i, closed=False))
+        await ws.send("not json")
+        await ws.wait_closed()
+
+    async with serve(feed, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        streamer = MultiplexStreamer(pairs, handler, base_url=f"ws://127.0.0.1:{port}/stream", **kwargs)
+        task = asyncio.create_task(streamer.run())
+
+        expected = len(pairs) * candles_per_stream
+        for _ in range(500):
+            if streamer.stats["routed"] + streamer.stats["dropped"] >= expected:
+                break
+            await asyncio.sleep(0.01)
+        await streamer.stop()
+        await asyncio.wait_for(task, 10)
+    return streamer, requested
+
+
+def test_shard_streams_groups_by_connection_size():
+    streams = [stream_name(f"S{i}USDT", "1m") for i in range(250)]
+    assert [len(g) for g in shard_streams(streams, 100)] == [100, 100, 50]
+
+
+def test_many_pairs_are_sharded_and_routed_per_symbol():
+    pairs = [(f"SYM{i}USDT", "1m") for i in range(25)]
+    seen = {}
+
+    async def handler(symbol, interval, kline):
+        seen.setdefault((symbol, interval), []).append(float(kline["c"]))
+
+    streamer, requested = asyncio.run(
+        run_against_stub(pairs, handler, streams_per_connection=10)
+    )
+
+    assert sorted(len(group) for group in requested) == [5, 10, 10]
+    assert set(seen) == set(pairs)
+    assert all(closes == [100.0, 101.0, 102.0, 103.0, 104.0] for closes in seen.values())
+    assert streamer.stats["errors"] == len(requested)  # one bad frame per connection
+    assert streamer.stats["dropped"] == 0
+
+
+def test_slow_symbol_does_not_block_others():
+    pairs = [("SLOWUSDT", "1m"), ("FASTUSDT", "1m"), ("QUICKUSDT", "1m")]
+    done = {}
+    release = threading.Event()
+    slow_done_when_others_finished = []
+
+    def handler(symbol, interval, kline):  # sync handlers run in worker threads
+        if symbol == "SLOWUSDT":
+            release.wait(5)
+        done.setdefault(symbol, []).append(kline["t"])
+        if symbol != "SLOWUSDT" and all(len(done.get(s, [])) == 3 for s in ("FASTUSDT", "QUICKUSDT")):
+            slow_done_when_others_finished.append(len(done.get("SLOWUSDT", [])))
+            release.set()
+
+    asyncio.run(run_against_stub(pairs, handler, candles_per_stream=3))
+
+    # The other symbols finished while SLOWUSDT was still blocked on its first candle
+    assert slow_done_when_others_finished and set(slow_done_when_others_finished) == {0}
+    assert done["SLOWUSDT"] == [0, 60_000, 120_000]
+
+
+def test_bounded_queue_drops_instead_of_blocking():
+    async def stuck(symbol, interval, kline):
+        await asyncio.sleep(0.5)
+
+    streamer, _ = asyncio.run(
+        run_against_stub([("BTCUSDT", "1m")], stuck, candles_per_stream=10, queue_size=2)
+    )
+    assert streamer.stats["dropped"] > 0
+
+
+def test_rejected_handshake_backs_off_and_reconnects(monkeypatch):
+    monkeypatch.setattr(multiplex, "RECONNECT_BASE_S", 0.01)
+    attempts = []
+    seen = []
+
+    def reject_first(connection, request):
+        attempts.append(request.path)
+        if len(attempts) <= 2:
+            return connection.respond(HTTPStatus.TOO_MANY_REQUESTS, "slow down\n")
+
+    async def feed(ws):
+        await ws.send(kline_message("btcusdt@kline_1m", 0, 100))
+        await ws.wait_closed()
+
+    async def main():
+        async with serve(feed, "127.0.0.1", 0, process_request=reject_first) as server:
+            port = server.sockets[0].getsockname()[1]
+            streamer = MultiplexStreamer([("BTCUSDT", "1m")], lambda s, i, k: seen.append(k["c"]),
+                                         base_url=f"ws://127.0.0.1:{port}/stream")
+            task = asyncio.create_task(streamer.run())
+            for _ in range(500):
+                if seen:
+                    break
+                await asyncio.sleep(0.01)
+            await streamer.stop()
+            await asyncio.wait_for(task, 10)
+            return streamer
+
+    streamer = asyncio.run(main())
+    assert len(attempts) == 3 and streamer.stats["reconnects"] == 2
+    assert seen == ["100"]
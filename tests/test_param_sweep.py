@@ -0,0 +1,46 @@
+# tests/test_param_sweep.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from signal_engine.backtest_engine import generate_signals, simulate_backtest
+from signal_engine.indicators_core import calculate_rsi, calculate_sma
+from signal_engine.param_sweep import build_param_grid, run_parameter_sweep
+
+
+@pytest.fixture
+def ohlcv():
+    rng = np.random.default_rng(3)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 1500)))
+    return pd.DataFrame({"close": close})
+
+
+def test_grid_drops_inverted_sma_windows():
+    params = build_param_grid({"rsi_buy": [30], "rsi_sell": [70],
+                               "sma_short": [10, 50], "sma_long": [20, 50]})
+    assert [(p["sma_short"], p["sma_long"]) for p in params] == [(10, 20), (10, 50)]
+
+
+def test_random_search_samples_subset():
+    params = build_param_grid(n_random=5, seed=1)
+    assert len(params) == 5
+    assert params == build_param_grid(n_random=5, seed=1)
+
+
+def test_sweep_matches_single_backtests(ohlcv):
+    grid = {"rsi_buy": [25, 30], "rsi_sell": [70], "sma_short": [5, 10], "sma_long": [30]}
+    table = run_parameter_sweep(ohlcv, grid, max_workers=2, batch_size=1)
+
+    assert len(table) == 4
+    assert table["Sharpe Ratio"].is_monotonic_decreasing
+
+    for row in table.to_dict("records"):
+        df = ohlcv.copy()
+        df["SMA_short"] = calculate_sma(df, row["sma_short"])
+        df["SMA_long"] = calculate_sma(df, row["sma_long"])
+        df["RSI"] = calculate_rsi(df, 14)
+        _, metrics = simulate_backtest(
+            generate_signals(df, rsi_buy=row["rsi_buy"], rsi_sell=row["rsi_sell"])
+        )
+        assert row["Final Portfolio Value"] == pytest.approx(metrics["Final Portfolio Value"])
+        assert row["Number of Trades"] == metrics["Number of Trades"]
@@ -0,0 +1,169 @@
+# tests/test_parquet_store.py
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from scripts.import_csv_to_parquet import import_csv, parse_filename
+from storage import parquet_store as store
+
+START_MS = 1_704_067_200_000   # 2024-01-01 00:00 UTC
+
+
+def candles(start, n, step_ms=3_600_000):
+    ts = START_MS + np.arange(start, start + n) * step_ms
+    return pd.DataFrame({
+        "timestamp": ts, "symbol": "BTCUSDT", "open": np.arange(start, start + n, dtype=float),
+        "high": 2.0, "low": 0.5, "close": np.arange(start, start + n, dtype=float), "volume": "3.5",
+    })
+
+
+def test_append_only_writes_partitioned_typed_files(tmp_path):
+    root = str(tmp_path)
+    assert store.write_candles("BTCUSDT", "1h", candles(0, 50), root=root) == 50
+
+    pair = store.pair_dir("BTCUSDT", "1h", root=root)
+    assert sorted(os.listdir(pair)) == ["date=2024-01-01", "date=2024-01-02", "date=2024-01-03"]
+    files_before = {os.path.join(d, f) for d, _, fs in os.walk(pair) for f in fs}
+
+    # Overlapping batch: only the 10 newer candles are appended, as new files
+    assert store.write_candles("BTCUSDT", "1h", candles(40, 20), root=root) == 10
+    assert store.write_candles("BTCUSDT", "1h", candles(0, 60), root=root) == 0
+    files_after = {os.path.join(d, f) for d, _, fs in os.walk(pair) for f in fs}
+    assert files_before < files_after
+
+    df = store.read_candles("BTCUSDT", "1h", root=root)
+    assert len(df) == 60 and df["timestamp"].is_monotonic_increasing
+    assert df["close"].tolist() == list(map(float, range(60)))
+    assert str(df["timestamp"].dtype) == "datetime64[ms]"
+    assert df["volume"].dtype == np.float64 and "symbol" not in df.columns
+    assert store.last_timestamp("BTCUSDT", "1h", root=root) == pd.Timestamp("2024-01-03 11:00")
+    assert store.list_pairs(root=root) == [("BTCUSDT", "1h")]
+
+
+def test_range_and_column_pushdown_prune_partitions(tmp_path, monkeypatch):
+    root = str(tmp_path)
+    store.write_candles("BTCUSDT", "1h", candles(0, 72), root=root)
+
+    opened = []
+    real = store._dataset
+    monkeypatch.setattr(store, "_dataset", lambda path, files: opened.extend(files) or real(path, files))
+    df = store.read_candles("BTCUSDT", "1h", start="2024-01-02 06:00", end="2024-01-02 12:00",
+                            columns=["close", "missing"], root=root)
+    assert list(df.columns) == ["timestamp", "close"]
+    assert df["close"].tolist() == [30.0, 31.0, 32.0, 33.0, 34.0, 35.0]
+    assert {os.path.basename(os.path.dirname(f)) for f in opened} == {"date=2024-01-02"}
+
+    opened.clear()
+    latest = store.read_latest("BTCUSDT", "1h", 5, root=root)
+    assert latest["close"].tolist() == [67.0, 68.0, 69.0, 70.0, 71.0]
+    assert {os.path.basename(os.path.dirname(f)) for f in opened} == {"date=2024-01-03"}
+
+    empty = store.read_candles("ETHUSDT", "1h", columns=["close"], root=root)
+    assert empty.empty and list(empty.columns) == ["timestamp", "close"]
+
+
+def test_feature_columns_added_later_are_unified(tmp_path):
+    root = str(tmp_path)
+    store.write_candles("BTCUSDT", "1h", candles(0, 24), dataset="labeled", root=root)
+    later = candles(24, 24).assign(rsi=55.0, label=np.ones(24, dtype=int))
+    store.write_candles("BTCUSDT", "1h", later, dataset="labeled", root=root)
+
+    df = store.read_candles("BTCUSDT", "1h", dataset="labeled", root=root)
+    assert df["rsi"].isna().sum() == 24 and (df["rsi"].iloc[24:] == 55.0).all()
+    assert df["label"].iloc[-1] == 1
+    assert not store.has_candles("BTCUSDT", "1h", root=root)   # "ohlcv" dataset untouched
+
+
+def test_column_dtypes_do_not_drift_between_writes(tmp_path):
+    root = str(tmp_path)
+    # An integer-valued feature (and label) in one write, floats (NaN labels) in the next
+    first = candles(0, 24).assign(volume=np.arange(24), label=np.zeros(24, dtype=int))
+    store.write_candles("BTCUSDT", "1h", first, dataset="labeled", root=root)
+    second = candles(24, 24).assign(volume=0.5, label=[1.0] * 23 + [np.nan])
+    assert store.write_candles("BTCUSDT", "1h", second, dataset="labeled", root=root) == 23
+
+    df = store.read_candles("BTCUSDT", "1h", dataset="labeled", root=root)
+    assert len(df) == 47
+    assert df["volume"].dtype == "float64" and df["volume"].iloc[-1] == 0.5
+    assert df["label"].dtype == "int64" and df["label"].iloc[-1] == 1
+
+
+def test_legacy_int_and_float_files_still_read(tmp_path):
+    root = str(tmp_path)
+    path = store.pair_dir("BTCUSDT", "1h", "labeled", root)
+    for day, values in (("2024-01-01", pa.array([1, 2], pa.int64())), ("2024-01-02", pa.array([0.5, 1.5]))):
+        os.makedirs(os.path.join(path, f"date={day}"))
+        timestamps = pa.array(pd.to_datetime([f"{day} 00:00", f"{day} 01:00"]).astype("datetime64[ms]"))
+        pq.write_table(pa.table({"timestamp": timestamps, "x": values}),
+                       os.path.join(path, f"date={day}", "part-0.parquet"))
+
+    df = store.read_candles("BTCUSDT", "1h", dataset="labeled", root=root)
+    assert df["x"].tolist() == [1.0, 2.0, 0.5, 1.5]
+
+
+def test_csv_import_and_loader_fallback(tmp_path):
+    root = str(tmp_path / "parquet")
+    csv = tmp_path / "BTCUSDT_1h_labeled.csv"
+    frame = candles(0, 30).assign(timestamp=lambda d: pd.to_datetime(d["timestamp"], unit="ms").astype(str))
+    frame.to_csv(csv, index=False)
+
+    assert parse_filename(str(csv)) == ("BTCUSDT", "1h", "labeled")
+    assert parse_filename("data/BTCUSDT_15m.csv") == ("BTCUSDT", "15m", "ohlcv")
+    assert parse_filename("data/trade_log.csv") is None
+
+    # Before the import the loader parses the CSV; afterwards it reads the store
+    from_csv = store.load_candles("BTCUSDT", "1h", str(csv), dataset="labeled", root=root)
+    assert from_csv["timestamp"].iloc[0] == pd.Timestamp("2024-01-01")
+
+    assert import_csv(str(csv), "BTCUSDT", "1h", "labeled", root=root, chunk_size=7) == 30
+    assert import_csv(str(csv), "BTCUSDT", "1h", "labeled", root=root, replace=False) == 0
+    # Derived datasets are replaced on re-import (no stale or doubled rows)
+    assert import_csv(str(csv), "BTCUSDT", "1h", "labeled", root=root) == 30
+    os.remove(csv)
+    from_store = store.load_candles("BTCUSDT", "1h", str(csv), dataset="labeled", root=root)
+    pd.testing.assert_series_equal(from_store["close"], from_csv["close"])
+
+    with pytest.raises(FileNotFoundError):
+        store.load_candles("ETHUSDT", "1h", str(csv), root=root)
+
+
+def test_relabeling_replaces_the_stored_labels(tmp_path, monkeypatch):
+    from ml import label_only
+
+    monkeypatch.setattr(store, "DEFAULT_ROOT", str(tmp_path / "parquet"))
+    source = tmp_path / "BTCUSDT_1h.csv"
+    output = tmp_path / "out" / "BTCUSDT_1h_labeled.csv"
+
+    rising = candles(0, 30).assign(close=np.linspace(100, 130, 30))
+    rising.to_csv(source, index=False)
+    label_only.save_labeled_dataset(str(source), str(output), "BTCUSDT", "1h")
+    assert (store.read_candles("BTCUSDT", "1h", dataset="labeled")["label"].iloc[:25] == 1).all()
+
+    # Same timestamps, recomputed labels: appending would have kept the old ones
+    rising.assign(close=np.linspace(130, 100, 30)).to_csv(source, index=False)
+    label_only.save_labeled_dataset(str(source), str(output), "BTCUSDT", "1h")
+    labeled = store.read_candles("BTCUSDT", "1h", dataset="labeled")
+    assert len(labeled) == 30 and (labeled["label"].iloc[:25] == -1).all()
+
+
+def test_loader_takes_the_newer_source_unless_told_otherwise(tmp_path):
+    root = str(tmp_path / "parquet")
+    store.write_candles("BTCUSDT", "1h", candles(0, 10), root=root)
+    csv = tmp_path / "BTCUSDT_1h.csv"
+    candles(0, 12).to_csv(csv, index=False)     # regenerated after the import
+
+    stored = max(os.path.getmtime(os.path.join(dirpath, f))
+                 for dirpath, _, files in os.walk(root) for f in files)
+    os.utime(csv, (stored + 60, stored + 60))
+    assert len(store.load_candles("BTCUSDT", "1h", str(csv), root=root)) == 12
+    assert len(store.load_candles("BTCUSDT", "1h", str(csv), root=root, prefer="parquet")) == 10
+
+    os.utime(csv, (stored - 60, stored - 60))
+    assert len(store.load_candles("BTCUSDT", "1h", str(csv), root=root)) == 10
+    assert len(store.load_candles("BTCUSDT", "1h", str(csv), root=root, prefer="csv")) == 12
+    with pytest.raises(ValueError):
+        store.load_candles("BTCUSDT", "1h", str(csv), root=root, prefer="mongo")
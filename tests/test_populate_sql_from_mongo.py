@@ -0,0 +1,130 @@
+# tests/test_populate_sql_from_mongo.py
+from datetime import datetime, timedelta, timezone
+
+import mongomock
+import pytest
+
+from scripts import populate_sql_from_mongo as sync
+from sql.db_engine import get_session
+from sql.models import OHLCV, Indicator
+from storage.mongo_timeseries import insert_new_candles
+
+T0 = datetime(2024, 1, 1)
+
+
+def candles(start, n):
+    return [
+        {"timestamp": T0 + timedelta(minutes=i), "open": 1.0, "high": 2.0, "low": 0.5,
+         "close": float(i), "volume": 3.0, "sma_14": None if i < 13 else float(i),
+         "ema_14": float(i), "rsi_14": 50.0, "macd": 0.1}
+        for i in range(start, start + n)
+    ]
+
+
+@pytest.fixture
+def collection():
+    coll = mongomock.MongoClient()["tradeforge_db"]["ohlcv_ts"]
+    insert_new_candles(coll, "BTCUSDT", "1m", candles(0, 25))
+    insert_new_candles(coll, "ETHUSDT", "1m", candles(0, 10))
+    return coll
+
+
+@pytest.fixture(autouse=True)
+def tmp_db(sql_db):
+    return sql_db
+
+
+def count(model, **filters):
+    session = get_session()
+    try:
+        query = session.query(model)
+        if filters:
+            query = query.join(OHLCV).filter_by(**filters) if model is Indicator else query.filter_by(**filters)
+        return query.count()
+    finally:
+        session.close()
+
+
+def test_parallel_batched_sync_then_incremental(collection, monkeypatch):
+    results = sync.run_sql_populator(["BTCUSDT", "ETHUSDT", "SOLUSDT"], ["1m"],
+                                     max_workers=3, collection=collection, batch_size=7)
+    assert results == {("BTCUSDT", "1m"): 25, ("ETHUSDT", "1m"): 10, ("SOLUSDT", "1m"): 0}
+    assert count(OHLCV) == 35 and count(Indicator) == 35
+    assert sync.get_watermark("BTCUSDT", "1m") == T0 + timedelta(minutes=24)
+
+    session = get_session()
+    ind = session.query(Indicator).join(OHLCV).filter(OHLCV.symbol == "BTCUSDT").order_by(OHLCV.timestamp).all()
+    assert ind[0].sma is None and ind[13].sma == 13.0 and ind[24].rsi == 50.0
+    session.close()
+
+    # Only candles past the watermark are read on the next run
+    insert_new_candles(collection, "BTCUSDT", "1m", candles(20, 10))
+    queries = []
+    real_find = type(collection).find
+    monkeypatch.setattr(type(collection), "find",
+                        lambda self, query=None, *a, **kw: queries.append(query) or real_find(self, query, *a, **kw))
+    assert sync.transfer_data("BTCUSDT", "1m", collection, batch_size=100) == 5
+    assert queries[-1]["timestamp"] == {"$gt": T0 + timedelta(minutes=24)}
+    assert count(OHLCV, symbol="BTCUSDT") == 30
+    assert sync.transfer_data("BTCUSDT", "1m", collection) == 0
+
+
+def test_full_sync_picks_up_candles_older_than_the_watermark(collection):
+    collection.delete_many({"meta.symbol": "BTCUSDT", "timestamp": T0 + timedelta(minutes=5)})
+    assert sync.transfer_data("BTCUSDT", "1m", collection) == 24
+
+    # The gap is filled in Mongo after the sync: behind the watermark
+    insert_new_candles(collection, "BTCUSDT", "1m", candles(5, 1))
+    assert sync.transfer_data("BTCUSDT", "1m", collection) == 0
+
+    results = sync.run_sql_populator(["BTCUSDT"], ["1m"], collection=collection, full=True)
+    assert results == {("BTCUSDT", "1m"): 1}
+    assert count(OHLCV, symbol="BTCUSDT") == 25 and count(Indicator) == 25
+    assert sync.get_watermark("BTCUSDT", "1m") == T0 + timedelta(minutes=24)
+
+
+def test_failed_batch_keeps_previous_watermark(collection, monkeypatch):
+    calls = {"n": 0}
+    real = sync.bulk_insert_indicators_sql
+
+    def flaky(symbol, interval, df, conn=None, **kwargs):
+        calls["n"] += 1
+        if calls["n"] == 3:
+            raise RuntimeError("disk full")
+        return real(symbol, interval, df, conn=conn, **kwargs)
+
+    monkeypatch.setattr(sync, "bulk_insert_indicators_sql", flaky)
+    with pytest.raises(RuntimeError):
+        sync.transfer_data("BTCUSDT", "1m", collection, batch_size=10)
+
+    # Batches 1-2 committed with their watermark; batch 3 rolled back entirely
+    assert count(OHLCV) == 20
+    assert sync.get_watermark("BTCUSDT", "1m") == T0 + timedelta(minutes=19)
+    monkeypatch.undo()
+    assert sync.transfer_data("BTCUSDT", "1m", collection, batch_size=10) == 5
+
+
+def test_corrected_candles_are_updated_and_open_candles_not_watermarked(collection, monkeypatch):
+    # Candle 24 is still open at the first sync
+    monkeypatch.setattr(sync.time, "time", lambda: (T0 + timedelta(minutes=24, seconds=30)).replace(tzinfo=timezone.utc).timestamp())
+    assert sync.transfer_data("BTCUSDT", "1m", collection) == 25
+    assert sync.get_watermark("BTCUSDT", "1m") == T0 + timedelta(minutes=23)
+
+    # It closes at another price (and its indicators change); an earlier candle is corrected too
+    collection.update_one({"meta.symbol": "BTCUSDT", "timestamp": T0 + timedelta(minutes=24)},
+                          {"$set": {"close": 999.0, "rsi_14": 70.0}})
+    collection.update_one({"meta.symbol": "BTCUSDT", "timestamp": T0 + timedelta(minutes=3)},
+                          {"$set": {"close": -3.0}})
+    monkeypatch.setattr(sync.time, "time", lambda: (T0 + timedelta(minutes=30)).replace(tzinfo=timezone.utc).timestamp())
+    assert sync.transfer_data("BTCUSDT", "1m", collection) == 1   # re-read from the open candle
+    assert sync.get_watermark("BTCUSDT", "1m") == T0 + timedelta(minutes=24)
+    assert sync.transfer_data("BTCUSDT", "1m", collection, full=True) == 1
+    assert sync.transfer_data("BTCUSDT", "1m", collection, full=True) == 0
+
+    session = get_session()
+    try:
+        rows = session.query(OHLCV).filter_by(symbol="BTCUSDT").order_by(OHLCV.timestamp).all()
+        assert len(rows) == 25 and rows[24].close == 999.0 and rows[3].close == -3.0
+        assert rows[24].indicator.rsi == 70.0
+    finally:
+        session.close()
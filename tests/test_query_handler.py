@@ -0,0 +1,83 @@
+# tests/test_query_handler.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from sql import sql_handler, query_handler
+
+
+@pytest.fixture(autouse=True)
+def seeded_db(sql_db):
+    """Fresh SQLite file with 300 1m candles, indicators and predictions."""
+
+    rng = np.random.default_rng(1)
+    close = 100 + np.cumsum(rng.normal(0, 1, 300))
+    ts = pd.date_range("2024-01-01", periods=300, freq="min")
+    df = pd.DataFrame({
+        "timestamp": ts.as_unit("ms").asi8,
+        "open": close, "high": close + 1, "low": close - 1,
+        "close": close, "volume": rng.uniform(1, 5, 300),
+    })
+    df["sma"] = df["close"].rolling(14).mean()
+    df["ema"] = df["close"].ewm(span=14).mean()
+    df["rsi"] = 50.0
+    df["prediction"] = np.resize([1, 0, -1], len(df))
+
+    sql_handler.bulk_insert_ohlcv_sql("BTCUSDT", "1m", df)
+    sql_handler.bulk_insert_indicators_sql("BTCUSDT", "1m", df)
+    sql_handler.bulk_insert_predictions_sql("BTCUSDT", "1m", df)
+    return df.assign(timestamp=ts)
+
+
+def test_range_fetch_returns_typed_columns(seeded_db):
+    df = query_handler.fetch_ohlcv_range(
+        "BTCUSDT", "1m", start="2024-01-01 01:00", end="2024-01-01 02:00"
+    )
+    assert len(df) == 61
+    assert df["timestamp"].dtype.kind == "M"
+    for col in query_handler.OHLCV_COLUMNS:
+        assert df[col].dtype == np.float64
+    assert df["timestamp"].is_monotonic_increasing
+
+    expected = seeded_db.iloc[60:121].reset_index(drop=True)
+    np.testing.assert_allclose(df["close"], expected["close"])
+    assert (df["timestamp"].to_numpy() == expected["timestamp"].to_numpy()).all()
+
+
+def test_range_fetch_accepts_epoch_ms_bounds_and_limit(seeded_db):
+    start_ms = int(seeded_db["timestamp"].iloc[100].value // 1_000_000)
+    df = query_handler.fetch_ohlcv_range("BTCUSDT", "1m", start=start_ms, limit=10)
+    assert len(df) == 10
+    assert df["timestamp"].iloc[-1] == seeded_db["timestamp"].iloc[-1]
+
+
+def test_chunked_iteration_covers_range_in_order(seeded_db):
+    chunks = list(query_handler.iter_ohlcv_range(
+        "BTCUSDT", "1m", chunksize=64, with_indicators=True
+    ))
+    assert [len(c) for c in chunks] == [64, 64, 64, 64, 44]
+
+    df = pd.concat(chunks, ignore_index=True)
+    assert df["timestamp"].is_monotonic_increasing
+    assert df["sma"].isna().sum() == 13  # NULL → NaN in a float64 column
+    np.testing.assert_allclose(df["ema"], seeded_db["ema"])
+
+
+def test_recent_fetches_keep_dashboard_contract(seeded_db):
+    ohlcv = query_handler.fetch_recent_ohlcv("BTCUSDT", "1m", limit=50)
+    assert list(ohlcv.columns) == [
+        "timestamp", "open", "high", "low", "close", "volume", "sma", "ema", "rsi", "signal"
+    ]
+    assert len(ohlcv) == 50
+    assert ohlcv["timestamp"].iloc[-1] == seeded_db["timestamp"].iloc[-1]
+
+    preds = query_handler.fetch_recent_predictions("BTCUSDT", "1m", limit=50)
+    merged = ohlcv.merge(preds, on="timestamp", how="left")
+    assert merged["prediction"].notna().all()
+    assert merged["prediction"].tolist() == seeded_db["prediction"].tail(50).tolist()
+
+
+def test_unknown_symbol_returns_empty_frames():
+    assert query_handler.fetch_recent_ohlcv("DOGEUSDT", "1m").empty
+    assert query_handler.fetch_recent_predictions("DOGEUSDT", "1m").empty
+    assert query_handler.fetch_ohlcv_history("DOGEUSDT", "1m").empty
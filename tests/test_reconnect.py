@@ -0,0 +1,160 @@
+# tests/test_reconnect.py
+import asyncio
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+from websockets.asyncio.server import serve
+
+from api import exchange_api, http_client
+from signal_engine.streaming_indicators import StreamingRSI
+from streaming.candle_buffer import CandleBuffer
+from streaming.reconnect import ReconnectingWebSocket, backfill_gap, backoff_delay
+
+START_MS = 1_704_067_200_000
+N = 40
+CLOSES = [100 + 3 * ((i * 7) % 5) - i * 0.5 for i in range(N)]
+
+
+def ts(i):
+    return START_MS + i * 60_000
+
+
+@pytest.fixture
+def rest_stub(monkeypatch):
+    """/api/v3/klines over CLOSES; records each request's startTime."""
+    requests_seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            q = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+            requests_seen.append(int(q["startTime"]))
+            if q.get("symbol") == "FAILUSDT":
+                self.send_response(500)
+                self.end_headers()
+                return
+            rows = [
+                [ts(i), str(c), str(c), str(c), str(c), "1", ts(i) + 59_999]
+                for i, c in enumerate(CLOSES)
+                if int(q["startTime"]) <= ts(i) <= int(q["endTime"])
+            ][: int(q["limit"])]
+            body = json.dumps(rows).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(exchange_api, "BASE_URL", f"http://127.0.0.1:{server.server_port}")
+    monkeypatch.setattr(http_client, "_client", http_client.ExchangeClient(max_retries=0, sleep=lambda s: None))
+    yield requests_seen
+    server.shutdown()
+    server.server_close()
+
+
+def kline_message(i):
+    c = str(CLOSES[i])
+    return json.dumps({"e": "kline", "k": {"t": ts(i), "o": c, "h": c, "l": c, "c": c, "v": "1", "x": True}})
+
+
+class WsStub:
+    """Serves candles 0-14 then drops the connection; the next connection resumes at 25."""
+
+    def __init__(self):
+        self.connections = 0
+        self.loop = asyncio.new_event_loop()
+        self.ready = threading.Event()
+        self.thread = threading.Thread(target=self.loop.run_until_complete, args=(self._main(),), daemon=True)
+        self.thread.start()
+        self.ready.wait(5)
+
+    async def _feed(self, ws):
+        self.connections += 1
+        candles = range(0, 15) if self.connections == 1 else range(25, N)
+        for i in candles:
+            await ws.send(kline_message(i))
+        if self.connections == 1:
+            return          # drop: closes the connection
+        await ws.wait_closed()
+
+    async def _main(self):
+        self.stop_event = asyncio.Event()
+        async with serve(self._feed, "127.0.0.1", 0, close_timeout=0.1) as server:
+            self.port = server.sockets[0].getsockname()[1]
+            self.ready.set()
+            await self.stop_event.wait()
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.stop_event.set)
+        self.thread.join(5)
+
+
+def test_backoff_delay_is_jittered_and_capped():
+    rng = random.Random(1)
+    delays = [backoff_delay(a, base=1.0, cap=8.0, rng=rng) for a in range(6)]
+    assert 0.5 <= delays[0] <= 1.0 and 1.0 <= delays[1] <= 2.0
+    assert all(4.0 <= d <= 8.0 for d in delays[3:])
+
+
+def test_reconnect_backfills_gap_and_indicators_stay_exact(rest_stub):
+    buffer = CandleBuffer(100)
+    rsi = StreamingRSI(14)
+    seen, live_rsi = [], {}
+
+    def handle(kline):                      # what process_kline does with a candle
+        if buffer.append(kline["t"], 0, 0, 0, float(kline["c"]), 0):
+            seen.append(kline["t"])
+            live_rsi[kline["t"]] = rsi.update(float(kline["c"]))
+
+    def on_connect():
+        # The outage "ended" while candle 25 was open, so 15-24 have closed since
+        backfill_gap("BTCUSDT", "1m", buffer.last_timestamp, handle, now_ms=ts(25) + 1, limit=4)
+
+    stub = WsStub()
+    client = ReconnectingWebSocket(f"ws://127.0.0.1:{stub.port}", lambda ws, m: handle(json.loads(m)["k"]),
+                                   on_connect=on_connect, base_delay=0.01, max_delay=0.05)
+    thread = threading.Thread(target=client.run, daemon=True)
+    thread.start()
+    try:
+        for _ in range(500):
+            if len(seen) >= N:
+                break
+            time.sleep(0.01)
+    finally:
+        client.stop()
+        thread.join(5)
+        stub.close()
+
+    assert seen == [ts(i) for i in range(N)]  # no gap, no duplicates, in order
+    assert client.stats["reconnects"] >= 1 and client.stats["connects"] >= 2
+    assert rest_stub == [ts(15), ts(19), ts(23)]  # paged backfill of 15-24
+
+    reference = StreamingRSI(14)
+    expected = {ts(i): reference.update(c) for i, c in enumerate(CLOSES)}
+    assert live_rsi == pytest.approx(expected)
+
+
+def test_no_gap_means_no_rest_call(rest_stub):
+    assert backfill_gap("BTCUSDT", "1m", ts(5), lambda k: None, now_ms=ts(7) - 1) == 0
+    assert rest_stub == []
+
+
+def test_failed_rest_page_stops_backfill(rest_stub):
+    handled = []
+    assert backfill_gap("FAILUSDT", "1m", ts(0), handled.append, now_ms=ts(10)) == 0
+    assert handled == [] and len(rest_stub) == 1
+
+
+def test_long_gap_is_capped_to_the_newest_candles(rest_stub):
+    handled = []
+    assert backfill_gap("BTCUSDT", "1m", ts(0), handled.append, now_ms=ts(30) + 1, max_candles=5) == 5
+    assert [k["t"] for k in handled] == [ts(i) for i in range(25, 30)]
+    assert rest_stub == [ts(25)]
@@ -0,0 +1,137 @@
+# tests/test_run_pipeline.py
+import threading
+
+import mongomock
+import numpy as np
+import pytest
+
+from api.rate_limiter import WeightRateLimiter, klines_request_weight
+from pipelines import run_pipeline
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def fake_candles(n=60):
+    close = 100 + np.cumsum(np.ones(n))
+    return [
+        {"timestamp": 1_700_000_000_000 + i * 60_000, "open": c, "high": c + 1,
+         "low": c - 1, "close": c, "volume": 1.0}
+        for i, c in enumerate(close)
+    ]
+
+
+@pytest.fixture
+def mongo(monkeypatch):
+    db = mongomock.MongoClient()["tradeforge_db"]
+    collection = db[run_pipeline.OHLCV_COLLECTION]
+    # mongomock has no time-series collections; a pre-existing non-unique index makes
+    # the unique one fail like it does on a real time-series collection
+    collection.create_index([("meta.symbol", 1), ("meta.interval", 1), ("timestamp", 1)],
+                            name="pair_timestamp")
+    monkeypatch.setattr(run_pipeline, "collection", collection)
+    monkeypatch.setattr(run_pipeline, "rate_limiter", WeightRateLimiter(max_weight=10_000))
+    return collection
+
+
+def test_limiter_blocks_until_window_frees_weight():
+    clock = FakeClock()
+    limiter = WeightRateLimiter(max_weight=10, window=60, clock=clock.time, sleep=clock.sleep)
+
+    assert limiter.acquire(6) == 0
+    clock.now = 10
+    assert limiter.acquire(4) == 0
+    assert limiter.used_weight == 10
+
+    # The first 6 expire at t=60, so this waits 50s
+    assert limiter.acquire(5) == pytest.approx(50)
+    assert limiter.used_weight == 9
+
+
+def test_klines_weight_tiers():
+    assert [klines_request_weight(n) for n in (50, 100, 500, 1000, 1500)] == [1, 2, 5, 5, 10]
+
+
+def test_pipeline_fetches_concurrently_and_keeps_pair_order(mongo, monkeypatch):
+    active, peak = 0, 0
+    lock = threading.Lock()
+    # Fetches only return once 4 of them are in flight at the same time
+    # (a sequential pipeline would break the barrier and fail those pairs)
+    overlap = threading.Barrier(4, timeout=5)
+
+    def slow_fetch(symbol, interval, limit):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        try:
+            overlap.wait()
+        finally:
+            with lock:
+                active -= 1
+        return fake_candles()
+
+    monkeypatch.setattr(run_pipeline, "fetch_ohlcv", slow_fetch)
+    symbols, intervals = ["AAAUSDT", "BBBUSDT", "CCCUSDT", "DDDUSDT"], ["1m", "5m"]
+
+    combined = run_pipeline.run_data_pipeline(symbols, intervals, max_workers=8)
+
+    assert peak >= 4
+    assert mongo.count_documents({}) == 8 * 60
+    pairs = combined[["symbol", "interval"]].drop_duplicates().apply(tuple, axis=1).tolist()
+    assert pairs == [(s, i) for s in symbols for i in intervals]
+    assert "rsi_14" in combined.columns
+
+
+def test_pipeline_counts_failed_fetches(mongo, monkeypatch):
+    def flaky_fetch(symbol, interval, limit):
+        if symbol == "BADUSDT":
+            raise RuntimeError("boom")
+        return [] if interval == "5m" else fake_candles()
+
+    monkeypatch.setattr(run_pipeline, "fetch_ohlcv", flaky_fetch)
+    combined = run_pipeline.run_data_pipeline(["BADUSDT", "BTCUSDT"], ["1m", "5m"])
+
+    assert set(combined["symbol"]) == {"BTCUSDT"}
+    assert mongo.count_documents({}) == 60
+
+
+def test_rerun_over_overlapping_candles_stores_no_duplicates(mongo, monkeypatch):
+    candles = fake_candles(100)
+    batches = iter([candles[:60], candles[40:]])
+    monkeypatch.setattr(run_pipeline, "fetch_ohlcv", lambda symbol, interval, limit: next(batches))
+
+    run_pipeline.run_data_pipeline(["BTCUSDT"], ["1m"])
+    combined = run_pipeline.run_data_pipeline(["BTCUSDT"], ["1m"])
+
+    assert len(combined) == 60  # the second run still returns its processed frame
+    assert mongo.count_documents({}) == 100
+    assert mongo.count_documents({"meta.symbol": "BTCUSDT", "meta.interval": "1m"}) == 100
+    assert "pair_timestamp" in mongo.index_information()
+    assert not mongo.index_information()["pair_timestamp"].get("unique")
+
+
+def test_open_candle_is_stored_only_once_closed(mongo, monkeypatch):
+    candles = fake_candles(10)
+    open_ms = candles[-1]["timestamp"]
+    monkeypatch.setattr(run_pipeline, "clock", lambda: (open_ms + 30_000) / 1000)   # last kline half done
+    monkeypatch.setattr(run_pipeline, "fetch_ohlcv", lambda symbol, interval, limit: [dict(c) for c in candles])
+    run_pipeline.run_data_pipeline(["BTCUSDT"], ["1m"])
+    assert mongo.count_documents({}) == 9
+
+    # Next run: the candle has closed at a different price
+    candles[-1]["close"] = 999.0
+    monkeypatch.setattr(run_pipeline, "clock", lambda: (open_ms + 90_000) / 1000)
+    run_pipeline.run_data_pipeline(["BTCUSDT"], ["1m"])
+    assert mongo.count_documents({}) == 10
+    assert mongo.find_one(sort=[("timestamp", -1)])["close"] == 999.0
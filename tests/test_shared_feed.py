@@ -0,0 +1,121 @@
+# tests/test_shared_feed.py
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from streaming.shared_feed import SharedFeedReader, SharedFeedWriter, feed_name, read_shared_feed
+
+ROOT = __file__.rsplit("/tests/", 1)[0]
+T0 = pd.Timestamp("2024-01-01")
+
+
+@pytest.fixture
+def writer():
+    w = SharedFeedWriter(f"T{uuid.uuid4().hex[:8]}", "1m", capacity=5)
+    yield w
+    w.close()
+
+
+def publish(w, i, prediction=None):
+    w.publish(T0 + pd.Timedelta(minutes=i), 1.0, 2.0, 0.5, float(i), 10.0, rsi=50.0, prediction=prediction)
+
+
+def test_reader_sees_newest_candles_in_order(writer):
+    for i in range(8):
+        publish(writer, i, prediction=1 if i % 2 else None)
+
+    with SharedFeedReader(writer.symbol, "1m") as reader:
+        assert reader.count == 8 and reader.capacity == 5
+        df = reader.frame()
+        assert df["close"].tolist() == [3.0, 4.0, 5.0, 6.0, 7.0]
+        assert df["timestamp"].iloc[-1] == T0 + pd.Timedelta(minutes=7)
+        assert df["prediction"].tolist() == [1, pd.NA, 1, pd.NA, 1]
+        assert reader.frame(2)["close"].tolist() == [6.0, 7.0]
+        with pytest.raises(ValueError):
+            reader.records["close"][0] = 1.0   # mapped read-only
+
+
+def test_missing_feed_returns_none():
+    assert read_shared_feed(f"NOPE{uuid.uuid4().hex[:6]}", "1m") is None
+
+
+def test_foreign_segment_is_rejected():
+    name = f"X{uuid.uuid4().hex[:8]}"
+    shm = shared_memory.SharedMemory(name=feed_name(name, "1m"), create=True, size=4096)
+    try:
+        with pytest.raises(ValueError):
+            SharedFeedReader(name, "1m")
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def test_stale_segment_is_replaced(writer):
+    publish(writer, 0)
+    replacement = SharedFeedWriter(writer.symbol, "1m", capacity=3)
+    try:
+        with SharedFeedReader(writer.symbol, "1m") as reader:
+            assert reader.count == 0 and reader.capacity == 3
+    finally:
+        writer._shm = None          # its segment was already unlinked by the replacement
+        replacement.close()
+
+
+def test_other_process_reads_without_unlinking(writer):
+    for i in range(3):
+        publish(writer, i, prediction=-1)
+    code = (
+        "from streaming.shared_feed import read_shared_feed;"
+        f"df = read_shared_feed('{writer.symbol}', '1m');"
+        "print(df['close'].tolist(), df['prediction'].tolist())"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[0.0, 1.0, 2.0] [-1, -1, -1]"
+    # The reader process exiting must not have removed the writer's segment
+    assert read_shared_feed(writer.symbol, "1m")["close"].tolist() == [0.0, 1.0, 2.0]
+
+
+def test_snapshots_stay_consistent_under_concurrent_writes(writer):
+    stop = threading.Event()
+
+    def write():
+        i = 0
+        while not stop.is_set():
+            writer.publish(i, i, i, i, float(i), i, rsi=float(i))
+            i += 1
+
+    thread = threading.Thread(target=write)
+    thread.start()
+    try:
+        with SharedFeedReader(writer.symbol, "1m") as reader:
+            for _ in range(2000):
+                rows = reader.snapshot()
+                assert np.array_equal(rows["close"], rows["rsi"])
+                assert np.all(np.diff(rows["timestamp"]) == 1)
+    finally:
+        stop.set()
+        thread.join()
+
+
+def test_closed_or_stalled_feed_is_ignored(writer, monkeypatch):
+    publish(writer, 0)
+    assert len(read_shared_feed(writer.symbol, "1m", max_age_s=60)) == 1
+
+    later = time.time_ns() + 120 * 1_000_000_000
+    monkeypatch.setattr(time, "time_ns", lambda: later)
+    assert read_shared_feed(writer.symbol, "1m", max_age_s=60) is None
+    assert read_shared_feed(writer.symbol, "1m") is not None   # no freshness check requested
+    monkeypatch.undo()
+
+    writer.close(unlink=False)
+    try:
+        assert read_shared_feed(writer.symbol, "1m") is None
+    finally:
+        shared_memory.SharedMemory(name=feed_name(writer.symbol, "1m")).unlink()
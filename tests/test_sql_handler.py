@@ -0,0 +1,115 @@
+# tests/test_sql_handler.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from sql import sql_handler
+from sql.models import OHLCV, Indicator, MLPrediction
+
+
+@pytest.fixture(autouse=True)
+def tmp_db(sql_db):
+    """Point the shared SQL engine at a fresh SQLite file for each test."""
+    return sql_db
+
+
+def make_ohlcv(n, start="2024-01-01"):
+    rng = np.random.default_rng(0)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    ts = pd.date_range(start, periods=n, freq="min")
+    return pd.DataFrame({
+        # epoch ms, as fetched from the exchange (independent of the index's resolution)
+        "timestamp": ((ts - pd.Timestamp(0)) // pd.Timedelta(milliseconds=1)).to_numpy(),
+        "open": close, "high": close + 1, "low": close - 1,
+        "close": close, "volume": rng.uniform(1, 5, n),
+    })
+
+
+def count(model):
+    session = sql_handler.get_sql_session()
+    try:
+        return session.query(model).count()
+    finally:
+        session.close()
+
+
+def test_bulk_ohlcv_insert_skips_duplicates():
+    df = make_ohlcv(500)
+    assert sql_handler.bulk_insert_ohlcv_sql("BTCUSDT", "1m", df) == 500
+    assert sql_handler.bulk_insert_ohlcv_sql("BTCUSDT", "1m", make_ohlcv(600)) == 100
+    assert count(OHLCV) == 600
+
+
+def test_bulk_insert_matches_row_by_row_path():
+    df = make_ohlcv(50)
+    sql_handler.bulk_insert_ohlcv_sql("BTCUSDT", "1m", df.iloc[:25])
+    # The ORM path should see the bulk rows as existing and add only the rest
+    assert sql_handler.insert_ohlcv_sql("BTCUSDT", "1m", df) == 25
+    assert count(OHLCV) == 50
+
+
+def test_bulk_indicators_and_predictions_resolve_ohlcv_ids():
+    df = make_ohlcv(200)
+    sql_handler.bulk_insert_ohlcv_sql("BTCUSDT", "1m", df)
+
+    df["sma"] = df["close"].rolling(14).mean()   # leading NaNs become NULL
+    df["ema"] = df["close"].ewm(span=14).mean()
+    df["rsi"] = 50.0
+    df["prediction"] = np.resize([1, 0, -1], len(df))
+
+    assert sql_handler.bulk_insert_indicators_sql("BTCUSDT", "1m", df) == 200
+    assert sql_handler.bulk_insert_indicators_sql("BTCUSDT", "1m", df) == 0
+    assert sql_handler.bulk_insert_predictions_sql("BTCUSDT", "1m", df.iloc[:120]) == 120
+    assert sql_handler.bulk_insert_predictions_sql("BTCUSDT", "1m", df) == 80
+
+    session = sql_handler.get_sql_session()
+    try:
+        last = (
+            session.query(OHLCV).order_by(OHLCV.timestamp.desc()).first()
+        )
+        assert last.indicator.sma == pytest.approx(df["sma"].iloc[-1])
+        assert last.prediction.prediction == df["prediction"].iloc[-1]
+        first = session.query(OHLCV).order_by(OHLCV.timestamp).first()
+        assert first.indicator.sma is None
+    finally:
+        session.close()
+
+    assert count(Indicator) == 200
+    assert count(MLPrediction) == 200
+
+
+def test_bulk_children_ignore_unknown_candles():
+    df = make_ohlcv(10)
+    df["prediction"] = 1
+    assert sql_handler.bulk_insert_predictions_sql("BTCUSDT", "1m", df) == 0
+
+
+def test_rows_without_a_prediction_are_skipped_not_fatal():
+    df = make_ohlcv(20)
+    sql_handler.bulk_insert_ohlcv_sql("BTCUSDT", "1m", df)
+    df["prediction"] = [None if i % 2 else 1 for i in range(20)]
+    assert sql_handler.bulk_insert_predictions_sql("BTCUSDT", "1m", df) == 10
+    df["prediction"] = None
+    assert sql_handler.bulk_insert_predictions_sql("BTCUSDT", "1m", df) == 0
+    assert count(MLPrediction) == 10
+
+
+def test_same_timestamp_for_different_symbols_is_kept():
+    df = make_ohlcv(30)
+    assert sql_handler.bulk_insert_ohlcv_sql("BTCUSDT", "1m", df) == 30
+    assert sql_handler.bulk_insert_ohlcv_sql("ETHUSDT", "1m", df) == 30
+    assert sql_handler.insert_ohlcv_sql("SOLUSDT", "1m", df.head(5)) == 5
+    assert count(OHLCV) == 65
+
+
+def test_bulk_insert_statement_follows_the_dialect():
+    from types import SimpleNamespace
+    from sqlalchemy.dialects import postgresql
+
+    pg = SimpleNamespace(dialect=postgresql.dialect())
+    sql = str(sql_handler._insert_statement(pg, OHLCV.__table__).compile(dialect=pg.dialect))
+    assert sql.startswith("INSERT INTO ohlcv_data") and sql.endswith("ON CONFLICT DO NOTHING")
+    assert "%(symbol)s" in sql
+
+    with pytest.raises(NotImplementedError):
+        sql_handler._insert_statement(SimpleNamespace(dialect=SimpleNamespace(name="mysql")), OHLCV.__table__)
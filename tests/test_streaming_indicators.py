@@ -0,0 +1,88 @@
+# tests/test_streaming_indicators.py
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from signal_engine.indicators_core import (
+    calculate_sma, calculate_ema, calculate_rsi,
+    calculate_macd, calculate_bollinger_bands
+)
+from signal_engine.streaming_indicators import (
+    StreamingSMA, StreamingEMA, StreamingRSI,
+    StreamingMACD, StreamingBollinger, restore_indicator
+)
+
+
+@pytest.fixture
+def prices():
+    """Random walk at BTC-like price levels to stress float accuracy."""
+    rng = np.random.default_rng(42)
+    close = 60000 + np.cumsum(rng.normal(0, 25, 2000))
+    return pd.DataFrame({"close": close})
+
+
+def run_stream(indicator, closes):
+    return [indicator.update(price) for price in closes]
+
+
+def assert_matches(streamed, expected, rel=1e-9, abs_=1e-6):
+    for got, want in zip(streamed, expected):
+        if pd.isna(want):
+            assert got is None
+        else:
+            assert got == pytest.approx(want, rel=rel, abs=abs_)
+
+
+def test_sma_matches_batch(prices):
+    streamed = run_stream(StreamingSMA(20), prices["close"])
+    assert_matches(streamed, calculate_sma(prices, 20))
+
+
+def test_ema_matches_batch(prices):
+    streamed = run_stream(StreamingEMA(14), prices["close"])
+    assert_matches(streamed, calculate_ema(prices, 14))
+
+
+def test_rsi_matches_batch(prices):
+    streamed = run_stream(StreamingRSI(14), prices["close"])
+    assert_matches(streamed, calculate_rsi(prices, 14), abs_=1e-7)
+
+
+def test_macd_matches_batch(prices):
+    streamed = run_stream(StreamingMACD(), prices["close"])
+    expected = calculate_macd(prices)
+    for col, idx in (("MACD", 0), ("Signal_Line", 1), ("Histogram", 2)):
+        assert_matches([row[idx] for row in streamed], expected[col])
+
+
+def test_bollinger_matches_batch(prices):
+    streamed = run_stream(StreamingBollinger(20, 2.0), prices["close"])
+    expected = calculate_bollinger_bands(prices, 20, 2.0)
+    for col, idx in (("BB_Upper", 0), ("BB_Middle", 1), ("BB_Lower", 2)):
+        assert_matches([None if row is None else row[idx] for row in streamed], expected[col])
+
+
+@pytest.mark.parametrize("factory", [
+    lambda: StreamingSMA(20),
+    lambda: StreamingEMA(14),
+    lambda: StreamingRSI(14),
+    lambda: StreamingMACD(),
+    lambda: StreamingBollinger(20, 2.0),
+])
+def test_snapshot_restore_continues_identically(prices, factory):
+    closes = prices["close"].tolist()
+    original = factory()
+    run_stream(original, closes[:500])
+
+    # Snapshots must survive a JSON round trip
+    restored = restore_indicator(json.loads(json.dumps(original.snapshot())))
+
+    assert run_stream(restored, closes[500:]) == run_stream(original, closes[500:])
+
+
+def test_indicators_use_slots():
+    for indicator in (StreamingSMA(), StreamingEMA(), StreamingRSI(),
+                      StreamingMACD(), StreamingBollinger()):
+        assert not hasattr(indicator, "__dict__")
@@ -0,0 +1,150 @@
+# tests/test_write_behind.py
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from sql import write_behind
+from sql.db_engine import get_session
+from sql.models import OHLCV, MLPrediction
+from sql.write_behind import WriteBehindQueue
+
+
+@pytest.fixture(autouse=True)
+def tmp_db(sql_db):
+    return sql_db
+
+
+def candle(i, prediction=None):
+    row = {
+        "timestamp": pd.Timestamp("2024-01-01") + pd.Timedelta(minutes=i),
+        "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5 + i, "volume": 3.0,
+    }
+    if prediction is not None:
+        row["prediction"] = prediction
+    return pd.DataFrame([row])
+
+
+def count(model):
+    session = get_session()
+    try:
+        return session.query(model).count()
+    finally:
+        session.close()
+
+
+def test_candles_and_predictions_are_batched_into_few_transactions():
+    writer = WriteBehindQueue(batch_rows=50, flush_interval_ms=1000)
+    writer.start()
+    try:
+        for i in range(120):
+            writer.submit_ohlcv("BTCUSDT", "1m", candle(i))
+            writer.submit_predictions("BTCUSDT", "1m", candle(i, prediction=1))
+        assert writer.flush()
+    finally:
+        writer.stop()
+
+    assert count(OHLCV) == 120
+    assert count(MLPrediction) == 120
+    m = writer.metrics()
+    assert m["written_rows"] == 240 and m["errors"] == 0 and m["dropped"] == 0
+    assert m["batches"] <= 6
+    assert m["queue_depth"] == 0 and m["max_flush_ms"] >= m["avg_flush_ms"] > 0
+
+
+def test_time_based_flush_without_reaching_batch_size():
+    writer = WriteBehindQueue(batch_rows=1000, flush_interval_ms=50)
+    writer.start()
+    try:
+        writer.submit_ohlcv("BTCUSDT", "1m", candle(0))
+        for _ in range(100):
+            if count(OHLCV):
+                break
+            time.sleep(0.01)
+        assert count(OHLCV) == 1
+    finally:
+        writer.stop()
+
+
+def test_overdue_batch_is_written_while_rows_keep_arriving():
+    writer = WriteBehindQueue(batch_rows=1000, flush_interval_ms=0)
+    for i in range(5):  # a backlog: the writer never sees an empty queue
+        writer.submit_ohlcv("BTCUSDT", "1m", candle(i))
+    writer.start()
+    try:
+        assert writer.flush()
+    finally:
+        writer.stop()
+    assert count(OHLCV) == 5
+    assert writer.metrics()["batches"] == 5
+
+
+def test_stop_with_a_saturated_queue_does_not_raise(monkeypatch):
+    release = threading.Event()
+    real_write = WriteBehindQueue._write_batch
+    monkeypatch.setattr(WriteBehindQueue, "_write_batch",
+                        lambda self, batch: release.wait(5) and real_write(self, batch))
+    writer = WriteBehindQueue(max_queue=2, batch_rows=1)
+    writer.start()
+    for i in range(4):
+        writer.submit_ohlcv("BTCUSDT", "1m", candle(i))
+
+    writer.stop(timeout=0.05)   # _STOP cannot be queued: logged, not raised
+    assert writer.running
+    release.set()
+    writer.stop()
+    assert not writer.running and count(OHLCV) == 4 - writer.metrics()["dropped"]
+
+
+def test_full_queue_drops_instead_of_blocking():
+    writer = WriteBehindQueue(max_queue=3)  # not started: nothing drains the queue
+    accepted = [writer.submit_ohlcv("BTCUSDT", "1m", candle(i)) for i in range(5)]
+    assert accepted == [True, True, True, False, False]
+    assert writer.metrics()["dropped"] == 2
+    assert writer.metrics()["queue_depth"] == 3
+
+    writer.start()
+    writer.stop()
+    assert count(OHLCV) == 3
+
+
+def test_failed_batch_is_counted_and_writer_keeps_going(monkeypatch):
+    writer = WriteBehindQueue(batch_rows=1)
+    bad = candle(0).drop(columns=["close"])
+    writer.start()
+    try:
+        writer.submit_ohlcv("BTCUSDT", "1m", bad)
+        writer.submit_ohlcv("BTCUSDT", "1m", candle(1))
+        assert writer.flush()
+    finally:
+        writer.stop()
+    m = writer.metrics()
+    assert m["errors"] == 1 and m["failed_rows"] == 1 and m["written_rows"] == 1
+    assert count(OHLCV) == 1
+
+
+def test_shared_writer_is_started_once(monkeypatch):
+    monkeypatch.setattr(write_behind, "_writer", None)
+    first = write_behind.get_sql_writer()
+    try:
+        assert first is write_behind.get_sql_writer() and first.running
+    finally:
+        first.stop()
+
+
+def test_bad_group_does_not_discard_other_rows(monkeypatch):
+    writer = WriteBehindQueue(batch_rows=1000, flush_interval_ms=1000)
+    writer.start()
+    try:
+        writer.submit_ohlcv("BTCUSDT", "1m", candle(0))
+        writer.submit_ohlcv("ETHUSDT", "1m", candle(0).drop(columns=["close"]))
+        writer.submit_predictions("BTCUSDT", "1m", candle(0, prediction=1))
+        # No model loaded: rows without a prediction never reach SQL
+        writer.submit_predictions("BTCUSDT", "1m", candle(1).assign(prediction=None))
+        assert writer.flush()
+    finally:
+        writer.stop()
+    m = writer.metrics()
+    assert m["batches"] == 1 and m["errors"] == 1 and m["failed_rows"] == 1 and m["written_rows"] == 2
+    assert count(OHLCV) == 1 and count(MLPrediction) == 1
@@ -0,0 +1,179 @@
+# utils/config_service.py
+"""
+TradeForge Config Service
+-------------------------
+In-memory JSON config with cheap change detection, shared by the
+streamer (readers) and the Settings page (writer).
+
+- `JsonConfig.get()` returns the cached dict; the file is re-read only
+  when its mtime/size changes, and the stat itself is throttled to one
+  per `check_interval` seconds.
+- `JsonConfig.start_watcher()` moves change detection to a background
+  thread, so `get()` does no file I/O at all.
+- `atomic_write_json()` writes via a temp file + rename, so readers
+  never see a half-written file.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+
+from utils.tradeforge_logger import setup_logger
+
+logger = setup_logger(__name__)
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+CONFIG_DIR = os.path.join(ROOT_DIR, "config")
+AUTO_TRADING_PATH = os.path.join(CONFIG_DIR, "auto_trading_status.json")
+STRATEGY_PARAMS_PATH = os.path.join(CONFIG_DIR, "strategy_params.json")
+
+DEFAULT_AUTO_TRADING = {"enabled": False}
+DEFAULT_STRATEGY_PARAMS = {
+    "rsi_period": 14,
+    "rsi_buy_threshold": 30,
+    "rsi_sell_threshold": 70,
+    "ml_model": "RandomForest",
+    "rsi_rule_fallback": False,   # trade on the RSI rule when no model is loaded
+}
+
+DEFAULT_CHECK_INTERVAL_S = 1.0
+
+
+def atomic_write_json(path: str, data: dict, indent: int = 4) -> None:
+    """Write JSON to `path` atomically (temp file in the same dir + os.replace)."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+class JsonConfig:
+    """Cached view of one JSON config file, merged over defaults."""
+
+    def __init__(self, path: str, default: dict = None,
+                 check_interval: float = DEFAULT_CHECK_INTERVAL_S, clock=time.monotonic):
+        self.path = path
+        self.default = dict(default or {})
+        self.check_interval = check_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._data = dict(self.default)
+        self._signature = None        # (mtime_ns, size) of the loaded file
+        self._next_check = 0.0
+        self._watcher = None
+        self._watch_stop = threading.Event()
+        self.reloads = 0
+        self._load()
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+            return st.st_mtime_ns, st.st_size
+        except FileNotFoundError:
+            return None
+
+    def _load(self) -> None:
+        signature = self._stat()
+        if signature == self._signature and self.reloads:
+            return
+        if signature is None:
+            data = dict(self.default)
+            if self._signature is not None or not self.reloads:
+                logger.warning(f"Config not found: {self.path}. Using defaults.")
+        else:
+            try:
+                with open(self.path, "r") as f:
+                    data = {**self.default, **json.load(f)}
+            except (OSError, ValueError) as e:
+                # Keep the last good values on a bad/partial file
+                logger.error(f"Could not read {self.path}: {e}")
+                return
+        with self._lock:
+            self._data = data
+            self._signature = signature
+            self.reloads += 1
+
+    def get(self) -> dict:
+        """Current config (a copy). Stats the file at most once per `check_interval`."""
+        if self._watcher is None:
+            now = self._clock()
+            if now >= self._next_check:
+                self._next_check = now + self.check_interval
+                self._load()
+        with self._lock:
+            return dict(self._data)
+
+    def reload(self) -> dict:
+        """Force a re-read (e.g. after an external change)."""
+        self._signature = None
+        self._load()
+        return self.get()
+
+    def update(self, values: dict) -> dict:
+        """Merge `values`, write the file atomically and refresh the cache."""
+        with self._lock:
+            data = {**self._data, **values}
+        atomic_write_json(self.path, data)
+        with self._lock:
+            self._data = data
+            self._signature = self._stat()
+        return dict(data)
+
+    # ── Background watcher ──────────────────────────────────────
+    def start_watcher(self, poll_interval: float = DEFAULT_CHECK_INTERVAL_S) -> None:
+        """Poll the file's mtime in a daemon thread; `get()` then never touches disk."""
+        if self._watcher is not None:
+            return
+        self._watch_stop.clear()
+
+        def watch():
+            while not self._watch_stop.wait(poll_interval):
+                self._load()
+
+        self._watcher = threading.Thread(target=watch, name=f"config-watch:{os.path.basename(self.path)}",
+                                         daemon=True)
+        self._watcher.start()
+
+    def stop_watcher(self) -> None:
+        if self._watcher is None:
+            return
+        self._watch_stop.set()
+        self._watcher.join()
+        self._watcher = None
+
+
+# ────────────────────────────────────────────────────────────────
+# Shared configs
+# ────────────────────────────────────────────────────────────────
+_configs = {}
+_configs_lock = threading.Lock()
+
+
+def get_config(path: str, default: dict = None) -> JsonConfig:
+    """Return the shared JsonConfig for `path` (created on first use)."""
+    key = os.path.abspath(path)
+    with _configs_lock:
+        config = _configs.get(key)
+        if config is None:
+            config = JsonConfig(key, default)
+            _configs[key] = config
+        return config
+
+
+def auto_trading_config() -> JsonConfig:
+    return get_config(AUTO_TRADING_PATH, DEFAULT_AUTO_TRADING)
+
+
+def strategy_config() -> JsonConfig:
+    return get_config(STRATEGY_PARAMS_PATH, DEFAULT_STRATEGY_PARAMS)
@@ -0,0 +1,26 @@
+# utils/shm.py
+"""
+TradeForge Shared-Memory Helpers
+--------------------------------
+Attaching to a segment another process owns (the streamer's live feeds,
+the parameter sweep's candle matrix).
+"""
+
+import sys
+from multiprocessing import resource_tracker, shared_memory
+
+
+def attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach to an existing segment without handing it to this process's
+    resource tracker (which would otherwise unlink it when a reader exits,
+    and warn about a leak: bpo-39959).
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+    return shm
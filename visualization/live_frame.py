@@ -0,0 +1,79 @@
+# visualization/live_frame.py
+"""
+Session-cached frame for the Live Chart page.
+
+Instead of re-reading the whole window (and all predictions) on every
+auto-refresh, the page keeps the last frame in `st.session_state` and
+only asks SQL for candles newer than the last timestamp it has seen.
+Predictions that were written after their candle are filled in place;
+a candle is looked up on the refresh it arrives with and the next one,
+after which it counts as checked (so a window without predictions, e.g.
+no model loaded, does not re-query from its oldest candle every time).
+"""
+
+import pandas as pd
+
+from sql.query_handler import fetch_ohlcv_since, fetch_predictions_since
+
+
+def append_rows(cached: pd.DataFrame, new_rows: pd.DataFrame, window: int) -> pd.DataFrame:
+    """Merge rows (later ones win on equal timestamps), sort by timestamp and keep the last `window` rows."""
+    if new_rows is None or new_rows.empty:
+        return cached.tail(window).reset_index(drop=True)
+    if cached is None or cached.empty:
+        merged = new_rows
+    else:
+        merged = pd.concat([cached, new_rows], ignore_index=True)
+        merged = merged.drop_duplicates("timestamp", keep="last")
+    # The DB can be ahead of the live feed (e.g. pipeline writes), so order explicitly
+    merged = merged.sort_values("timestamp", kind="stable")
+    return merged.tail(window).reset_index(drop=True)
+
+
+def apply_predictions(df: pd.DataFrame, preds: pd.DataFrame) -> pd.DataFrame:
+    """Fill the 'prediction' column from (timestamp, prediction) rows, matched by timestamp."""
+    if preds is None or preds.empty or df.empty:
+        return df
+    lookup = preds.drop_duplicates("timestamp", keep="last").set_index("timestamp")["prediction"]
+    filled = df["timestamp"].map(lookup)
+    df["prediction"] = filled.where(filled.notna(), df["prediction"])
+    return df
+
+
+def refresh_live_frame(state: dict, symbol: str, interval: str, window: int):
+    """
+    Bring a cached Live Chart frame up to date.
+
+    Parameters:
+        state (dict): Previous state from st.session_state (or None).
+        window (int): Number of candles to keep.
+
+    Returns:
+        (pd.DataFrame, dict): The current frame and the state to store back.
+    """
+    key = (symbol, interval)
+    cached = state.get("df") if state else None
+
+    # Full reload on first run, symbol/interval change, or a wider window
+    if cached is None or state.get("key") != key or window > state.get("window", 0):
+        df = fetch_ohlcv_since(symbol, interval, since=None, limit=window)
+        return df, {"key": key, "window": window, "df": df}
+
+    checked = None
+    if not cached.empty:
+        previous_last = cached["timestamp"].iloc[-1]
+        new_rows = fetch_ohlcv_since(symbol, interval, since=previous_last, limit=window)
+        df = append_rows(cached, new_rows, window)
+
+        # Candles whose prediction landed after they were first read
+        pending = df.loc[df["prediction"].isna(), "timestamp"]
+        if state.get("checked") is not None:
+            pending = pending[pending > state["checked"]]
+        if not pending.empty:
+            df = apply_predictions(df, fetch_predictions_since(symbol, interval, pending.iloc[0]))
+        # Candles already cached before this refresh have now been looked up twice
+        checked = previous_last
+    else:
+        df = fetch_ohlcv_since(symbol, interval, since=None, limit=window)
+
+    return df, {"key": key, "window": window, "df": df, "checked": checked}
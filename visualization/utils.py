@@ -5,9 +5,11 @@ import joblib
 import streamlit as st
 from pathlib import Path
 
+from storage import parquet_store
+
 def load_ml_predictions(symbol: str, interval: str, model_path: str = "ml/model_rf.pkl") -> pd.DataFrame | None:
     """
-    Loads predictions from CSV and applies ML model.
+    Loads labeled data (Parquet store, else CSV) and applies ML model.
 
     Returns:
         pd.DataFrame: Data with 'prediction' column
@@ -15,7 +17,7 @@ def load_ml_predictions(symbol: str, interval: str, model_path: str = "ml/model_
     csv_path = Path(f"data/{symbol}_{interval}_labeled.csv")
     model_path = Path(model_path)
 
-    if not csv_path.exists():
+    if not parquet_store.has_candles(symbol, interval, "labeled") and not csv_path.exists():
         st.warning(f"Data file not found: {csv_path}")
         return None
     if not model_path.exists():
@@ -23,8 +25,7 @@ def load_ml_predictions(symbol: str, interval: str, model_path: str = "ml/model_
         return None
 
     try:
-        df = pd.read_csv(csv_path)
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
+        df = parquet_store.load_candles(symbol, interval, str(csv_path), dataset="labeled")
         model = joblib.load(model_path)
         df["prediction"] = model.predict(df[["sma", "ema", "rsi"]])
         return df